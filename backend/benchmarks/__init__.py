@@ -0,0 +1 @@
+"""Backend benchmark suite"""
@@ -0,0 +1,80 @@
+"""
+Benchmark Helpers
+Timing, percentiles, memory tracking and JSON result output
+"""
+
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+import json
+import math
+import platform
+import resource
+import sys
+import time
+import tracemalloc
+
+
+def percentiles(samples: List[float], points=(50, 90, 95, 99)) -> Dict[str, float]:
+    """Nearest-rank percentiles of latency samples (seconds in, milliseconds out)"""
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+    result = {}
+    for p in points:
+        index = max(0, math.ceil(p / 100 * len(ordered)) - 1)
+        result[f"p{p}_ms"] = round(ordered[index] * 1000, 3)
+    result["mean_ms"] = round(sum(ordered) / len(ordered) * 1000, 3)
+    result["max_ms"] = round(ordered[-1] * 1000, 3)
+    return result
+
+
+def max_rss_mb() -> float:
+    """Process resident set size high-water mark in MB"""
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS reports bytes
+    return round(rss / (1024 * 1024 if sys.platform == "darwin" else 1024), 2)
+
+
+@contextmanager
+def track_memory(result: Dict[str, Any]) -> Iterator[None]:
+    """Record the Python heap peak (tracemalloc) and RSS high-water mark of a block"""
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    try:
+        yield
+    finally:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        result["heap_peak_mb"] = round(peak / (1024 * 1024), 2)
+        result["max_rss_mb"] = max_rss_mb()
+
+
+@contextmanager
+def timer(result: Dict[str, Any], key: str = "seconds") -> Iterator[None]:
+    """Record wall-clock time of a block"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        result[key] = round(time.perf_counter() - start, 4)
+
+
+def environment_info() -> Dict[str, Any]:
+    """Describe the machine a run was taken on"""
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
+
+def write_results(results: Dict[str, Any], path: Path) -> Path:
+    """Write results as pretty-printed JSON"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    return path
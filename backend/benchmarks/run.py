@@ -0,0 +1,103 @@
+"""
+Benchmark Runner
+Runs backend benchmark scenarios against stubbed Qdrant/Groq and writes JSON results
+
+Usage (from backend/):
+    python -m benchmarks.run                          # all scenarios, stub embeddings
+    python -m benchmarks.run --real-embeddings        # use all-MiniLM-L6-v2
+    python -m benchmarks.run -s chat --concurrency 32 --requests 1000
+    python -m benchmarks.run --output results/run.json
+
+Ingest always runs first since retrieval and chat need an indexed collection.
+"""
+
+from pathlib import Path
+from typing import Any, Dict
+import argparse
+import logging
+import sys
+
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.common import environment_info, max_rss_mb, write_results  # noqa: E402
+from benchmarks.scenarios import SCENARIOS  # noqa: E402
+from benchmarks.stubs import install_stubs  # noqa: E402
+from src.models.config import settings  # noqa: E402
+
+logger = logging.getLogger("benchmarks")
+
+DEFAULT_OUTPUT = Path(__file__).parent / "results" / "latest.json"
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """Run the selected scenarios and collect results"""
+    embedding_service = install_stubs(
+        stub_embeddings=not args.real_embeddings,
+        llm_latency_ms=args.llm_latency_ms,
+        llm_jitter_ms=args.llm_jitter_ms
+    )
+
+    selected = args.scenarios or list(SCENARIOS)
+    if "ingest" not in selected and {"retrieval", "chat", "extractive"} & set(selected):
+        selected = ["ingest"] + selected
+
+    results: Dict[str, Any] = {
+        "environment": environment_info(),
+        "config": {
+            "embeddings": "real" if args.real_embeddings else "stub",
+            "llm_latency_ms": args.llm_latency_ms,
+            "llm_jitter_ms": args.llm_jitter_ms,
+            "iterations": args.iterations,
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+        },
+        "scenarios": {}
+    }
+
+    for name in selected:
+        logger.info(f"Running scenario: {name}")
+        results["scenarios"][name] = SCENARIOS[name](
+            embedding_service=embedding_service,
+            iterations=args.iterations,
+            concurrency=args.concurrency,
+            requests=args.requests
+        )
+        logger.info(f"  {results['scenarios'][name]}")
+
+    results["max_rss_mb"] = max_rss_mb()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run backend benchmarks")
+    parser.add_argument("-s", "--scenarios", nargs="*", choices=list(SCENARIOS), help="Scenarios to run (default: all)")
+    parser.add_argument("--real-embeddings", action="store_true", help="Use the sentence-transformers model instead of stub embeddings")
+    parser.add_argument("--iterations", type=int, default=50, help="Iterations for embedding/retrieval scenarios")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent clients for the chat scenario")
+    parser.add_argument("--requests", type=int, default=200, help="Total requests for the chat scenario")
+    parser.add_argument("--llm-latency-ms", type=float, default=200.0, help="Fake LLM base latency")
+    parser.add_argument("--llm-jitter-ms", type=float, default=50.0, help="Fake LLM max extra latency")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT, help="JSON results path")
+    args = parser.parse_args()
+
+    # ingest_book configures the root logger at INFO on import, and the API
+    # reconfigures it from settings.log_level when the chat scenario loads it
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger().setLevel(logging.WARNING)
+    settings.log_level = "WARNING"
+    logger.setLevel(logging.INFO)
+
+    results = run(args)
+    path = write_results(results, args.output)
+    logger.info(f"Results written to {path}")
+
+    # Scenarios with pass/fail checks report "ok"; any failure fails the run
+    failed = [name for name, result in results["scenarios"].items() if result.get("ok") is False]
+    if failed:
+        logger.error(f"Scenario checks failed: {', '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
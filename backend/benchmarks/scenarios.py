@@ -0,0 +1,753 @@
+"""
+Benchmark Scenarios
+Ingest, embedding, retrieval, rerank, /api/chat load, extractive answers,
+logging, circuit breaker fault-injection, translation and near-duplicate
+scenarios
+"""
+
+from pathlib import Path
+from typing import Any, Dict, List
+import asyncio
+import sys
+import time
+
+from .common import percentiles, timer, track_memory
+
+EVAL_SET_PATH = Path(__file__).parent / "eval_set.json"
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from ingest_book import DOCS_PATH, process_chapter  # noqa: E402
+
+from src.services.retrieval import get_retrieval_service  # noqa: E402
+
+SAMPLE_QUERIES = [
+    "What is Physical AI?",
+    "How do robots use sensors?",
+    "What is ROS 2?",
+    "How does the Zero Moment Point keep a humanoid balanced?",
+    "What degrees of freedom does a humanoid arm have?",
+    "How are vision-language-action models trained?",
+    "What is sim-to-real transfer?",
+    "How do actuators differ from motors?",
+]
+
+
+def load_chunks() -> List[Dict]:
+    """Parse and chunk all chapter files"""
+    chunks = []
+    for chapter_file in sorted(DOCS_PATH.glob("chapter-*.md")):
+        chunks.extend(process_chapter(chapter_file))
+    return chunks
+
+
+def bench_ingest(**_) -> Dict[str, Any]:
+    """Parse/chunk time and index time for frontend/docs/chapter-*.md"""
+    result: Dict[str, Any] = {}
+    retrieval_service = get_retrieval_service()
+
+    with track_memory(result):
+        with timer(result, "parse_seconds"):
+            chunks = load_chunks()
+
+        with timer(result, "index_seconds"):
+            indexed = sum(
+                retrieval_service.index_chunk(
+                    chunk_id=chunk["chunk_id"],
+                    content=chunk["content"],
+                    chapter=chunk["chapter"],
+                    section=chunk["section"]
+                )
+                for chunk in chunks
+            )
+
+    result["chunks"] = len(chunks)
+    result["indexed"] = indexed
+    result["chunks_per_second"] = round(indexed / result["index_seconds"], 2) if result["index_seconds"] else None
+    return result
+
+
+def bench_embedding(embedding_service, iterations: int = 50, batch_size: int = 32, **_) -> Dict[str, Any]:
+    """Single-text and batch embedding throughput"""
+    result: Dict[str, Any] = {"batch_size": batch_size}
+    texts = [chunk["content"] for chunk in load_chunks()]
+    embedding_service.embed_text(texts[0])  # Warm up (model load)
+
+    with track_memory(result):
+        samples = []
+        for i in range(iterations):
+            start = time.perf_counter()
+            embedding_service.embed_text(texts[i % len(texts)])
+            samples.append(time.perf_counter() - start)
+        result["single"] = percentiles(samples)
+        result["single"]["texts_per_second"] = round(len(samples) / sum(samples), 2)
+
+        batch = (texts * (batch_size // len(texts) + 1))[:batch_size]
+        batch_samples = []
+        for _ in range(max(1, iterations // 10)):
+            start = time.perf_counter()
+            embedding_service.embed_batch(batch)
+            batch_samples.append(time.perf_counter() - start)
+        result["batch"] = percentiles(batch_samples)
+        result["batch"]["texts_per_second"] = round(
+            batch_size * len(batch_samples) / sum(batch_samples), 2
+        )
+
+    return result
+
+
+def bench_retrieval(iterations: int = 50, **_) -> Dict[str, Any]:
+    """Retrieval latency percentiles with a cold and a warm result cache"""
+    result: Dict[str, Any] = {}
+    retrieval_service = get_retrieval_service()
+
+    with track_memory(result):
+        cold, warm = [], []
+        for i in range(iterations):
+            query = SAMPLE_QUERIES[i % len(SAMPLE_QUERIES)]
+
+            retrieval_service._cache.clear()
+            start = time.perf_counter()
+            retrieval_service.retrieve(query, top_k=3)
+            cold.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            retrieval_service.retrieve(query, top_k=3)
+            warm.append(time.perf_counter() - start)
+
+    result["cold"] = percentiles(cold)
+    result["warm"] = percentiles(warm)
+    return result
+
+
+def bench_rerank(**_) -> Dict[str, Any]:
+    """Rerank latency distribution and top-3 section hit rate on the fixed eval set"""
+    import json
+    from src.models.config import settings
+    from src.services.rerank import get_rerank_service
+
+    with open(EVAL_SET_PATH, "r", encoding="utf-8") as f:
+        eval_set = json.load(f)
+
+    rerank_service = get_rerank_service()
+    rerank_service.warm_up()
+    deadline = time.time() + 300
+    while rerank_service._loading and time.time() < deadline:
+        time.sleep(0.1)
+    if not rerank_service.is_ready:
+        return {"skipped": f"rerank model {settings.rerank_model} could not be loaded"}
+
+    retrieval_service = get_retrieval_service()
+    saved = settings.rerank_enabled, settings.rerank_budget_ms
+    result: Dict[str, Any] = {"questions": len(eval_set), "model": settings.rerank_model}
+
+    def hit_rate() -> Dict[str, Any]:
+        hits, samples = 0, []
+        for item in eval_set:
+            retrieval_service._cache.clear()
+            start = time.perf_counter()
+            chunks = retrieval_service.retrieve(item["question"], top_k=3, score_threshold=0.0)
+            samples.append(time.perf_counter() - start)
+            hits += any(
+                c["chapter"] == item["chapter"] and c["section"] == item["section"]
+                for c in chunks
+            )
+        return {"hit_at_3": round(hits / len(eval_set), 3), "retrieve_latency": percentiles(samples)}
+
+    try:
+        settings.rerank_enabled = False
+        result["vector"] = hit_rate()
+
+        # No budget while measuring quality, so every query is actually reranked
+        settings.rerank_enabled, settings.rerank_budget_ms = True, 60_000
+        rerank_service._pair_scores.clear()
+        rerank_service._latencies.clear()
+        result["reranked"] = hit_rate()
+        result["rerank_latency"] = rerank_service.stats()["latency"]
+    finally:
+        settings.rerank_enabled, settings.rerank_budget_ms = saved
+
+    return result
+
+
+def bench_chat(concurrency: int = 8, requests: int = 200, **_) -> Dict[str, Any]:
+    """/api/chat requests per second under N concurrent clients (ASGI transport)"""
+    import httpx
+    from src.api.main import app
+
+    result: Dict[str, Any] = {"concurrency": concurrency, "requests": requests}
+    samples: List[float] = []
+    statuses: Dict[int, int] = {}
+
+    async def client_worker(client: "httpx.AsyncClient", queue: "asyncio.Queue[int]"):
+        while True:
+            try:
+                i = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            start = time.perf_counter()
+            response = await client.post(
+                "/api/chat",
+                json={"query": SAMPLE_QUERIES[i % len(SAMPLE_QUERIES)]}
+            )
+            samples.append(time.perf_counter() - start)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    async def run_load():
+        queue: "asyncio.Queue[int]" = asyncio.Queue()
+        for i in range(requests):
+            queue.put_nowait(i)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+            await asyncio.gather(*(client_worker(client, queue) for _ in range(concurrency)))
+
+    with track_memory(result):
+        with timer(result, "seconds"):
+            asyncio.run(run_load())
+
+    result["requests_per_second"] = round(len(samples) / result["seconds"], 2) if result["seconds"] else None
+    result["latency"] = percentiles(samples)
+    result["status_codes"] = {str(code): count for code, count in sorted(statuses.items())}
+    return result
+
+
+def bench_extractive(embedding_service, iterations: int = 50, **_) -> Dict[str, Any]:
+    """
+    Extractive answer latency over the top-3 retrieved chunks: sentences
+    embedded on demand, served from the LRU, and from the ingest-time index
+    """
+    import tempfile
+    from src.models.config import settings
+    from src.services.extractive import (
+        build_sentence_index, get_extractive_service, write_sentence_index
+    )
+
+    result: Dict[str, Any] = {}
+    service = get_extractive_service()
+    service._embedding_service = embedding_service
+    retrieval_service = get_retrieval_service()
+    retrieved = [
+        retrieval_service.retrieve(query, top_k=3, score_threshold=0.0)
+        for query in SAMPLE_QUERIES
+    ]
+
+    original_path = settings.sentence_index_path
+    with tempfile.TemporaryDirectory() as tmp:
+        settings.sentence_index_path = str(Path(tmp) / "missing.npz")
+        try:
+            with track_memory(result):
+                on_demand, cached, indexed = [], [], []
+                for i in range(iterations):
+                    query, chunks = SAMPLE_QUERIES[i % len(SAMPLE_QUERIES)], retrieved[i % len(SAMPLE_QUERIES)]
+                    service._cache.clear()
+                    start = time.perf_counter()
+                    service.answer(query, chunks)
+                    on_demand.append(time.perf_counter() - start)
+
+                    start = time.perf_counter()
+                    service.answer(query, chunks)
+                    cached.append(time.perf_counter() - start)
+
+                with timer(result, "index_build_seconds"):
+                    index = build_sentence_index(load_chunks(), embedding_service)
+                    settings.sentence_index_path = str(write_sentence_index(index, Path(tmp) / "sentences.npz"))
+                service._cache.clear()
+
+                for i in range(iterations):
+                    query, chunks = SAMPLE_QUERIES[i % len(SAMPLE_QUERIES)], retrieved[i % len(SAMPLE_QUERIES)]
+                    start = time.perf_counter()
+                    service.answer(query, chunks)
+                    indexed.append(time.perf_counter() - start)
+        finally:
+            settings.sentence_index_path = original_path
+
+    result["indexed_sentences"] = len(index["sentences"])
+    result["on_demand"] = percentiles(on_demand)
+    result["lru_cached"] = percentiles(cached)
+    result["ingest_index"] = percentiles(indexed)
+    result["lru_entries_with_index"] = len(service._cache)
+    result["sample_answer"] = service.answer(SAMPLE_QUERIES[0], retrieved[0])
+    return result
+
+
+def bench_hierarchical(
+    embedding_service,
+    iterations: int = 50,
+    copies: int = 10,
+    chunk_words: int = 30,
+    **_
+) -> Dict[str, Any]:
+    """
+    Flat vs hierarchical (summaries, then chunks) retrieval on the book plus
+    `copies` synthetic distractor books: latency, points scored per query,
+    eval-set section hit@3 and recall@3 against the flat top 3.
+
+    The book's ingest chunks are about one per section, which makes the
+    hierarchy degenerate, so they are re-split into `chunk_words`-word
+    pieces (0 keeps them) to give sections several chunks each.
+
+    Local-mode Qdrant searches exactly and evaluates filters in Python, so
+    its latencies penalize the extra filtered stages; points scored is the
+    engine-independent cost.
+    """
+    import json
+    import random
+    from qdrant_client import QdrantClient
+    from src.models.config import settings
+    from src.services.hierarchy import LEVEL_CHAPTER, LEVEL_SECTION, build_summaries, section_id
+
+    with open(EVAL_SET_PATH, "r", encoding="utf-8") as f:
+        eval_set = json.load(f)
+
+    chunks = load_chunks()
+    if chunk_words:
+        pieces = []
+        for chunk in chunks:
+            words = chunk["content"].split()
+            for k, start in enumerate(range(0, len(words), chunk_words)):
+                pieces.append({**chunk, "chunk_id": f"{chunk['chunk_id']}_{k}", "content": " ".join(words[start:start + chunk_words])})
+        chunks = pieces
+
+    # Distractor books: same chapter/section layout, words drawn from the book's vocabulary
+    vocabulary = sorted({word for chunk in chunks for word in chunk["content"].split()})
+    rng = random.Random(45)
+    corpus = list(chunks)
+    for copy in range(copies):
+        for chunk in chunks:
+            chapter = f"synthetic-{copy:02d}-{chunk['chapter']}"
+            corpus.append({
+                **chunk,
+                "chunk_id": f"{chapter}_{chunk['chunk_id']}",
+                "chapter": chapter,
+                "chapter_name": " ".join(rng.sample(vocabulary, 4)),
+                "section": f"{chunk['section']} {copy}",
+                "content": " ".join(rng.choices(vocabulary, k=len(chunk["content"].split())))
+            })
+
+    retrieval_service = get_retrieval_service()
+    saved = retrieval_service._client, settings.qdrant_collection_name, settings.retrieval_mode
+    sections = {section_id(chunk["chapter"], chunk["anchor"]) for chunk in chunks}
+    result: Dict[str, Any] = {
+        "copies": copies,
+        "chunks": len(corpus),
+        "chunks_per_section": round(len(chunks) / len(sections), 2)
+    }
+    try:
+        retrieval_service._client = QdrantClient(":memory:")
+        settings.qdrant_collection_name = "benchmark-hierarchical"
+        retrieval_service._ensure_collection()
+
+        with timer(result, "index_seconds"):
+            vectors = embedding_service.embed_batch([chunk["content"] for chunk in corpus])
+            for chunk, vector in zip(corpus, vectors):
+                retrieval_service.index_chunk(
+                    chunk_id=chunk["chunk_id"],
+                    content=chunk["content"],
+                    chapter=chunk["chapter"],
+                    section=chunk["section"],
+                    anchor=chunk["anchor"],
+                    vector=vector
+                )
+            summaries = build_summaries(corpus, vectors, embedding_service)
+            retrieval_service.index_summaries(summaries)
+        result["summaries"] = len(summaries)
+
+        # Points each search stage has to score, derived from its filter
+        chunks_per_section: Dict[str, int] = {}
+        sections_per_chapter: Dict[str, int] = {}
+        for chunk in corpus:
+            sid = section_id(chunk["chapter"], chunk["anchor"])
+            if sid not in chunks_per_section:
+                sections_per_chapter[chunk["chapter"]] = sections_per_chapter.get(chunk["chapter"], 0) + 1
+            chunks_per_section[sid] = chunks_per_section.get(sid, 0) + 1
+        scored = []
+        query_points = retrieval_service._query_points
+
+        def counting_query_points(*args, level=None, chapters=None, section_ids=None, **kwargs):
+            if level == LEVEL_CHAPTER:
+                scored.append(len(sections_per_chapter))
+            elif level == LEVEL_SECTION:
+                scored.append(sum(sections_per_chapter[c] for c in chapters or sections_per_chapter))
+            else:
+                scored.append(sum(chunks_per_section[s] for s in section_ids) if section_ids else len(corpus))
+            if level:
+                kwargs["level"] = level
+            return query_points(*args, chapters=chapters, section_ids=section_ids, **kwargs)
+
+        queries = [item["question"] for item in eval_set] + SAMPLE_QUERIES
+
+        def run_mode(mode: str) -> Dict[str, Any]:
+            settings.retrieval_mode = mode
+            samples, hits, top3 = [], 0, {}
+            for i in range(max(iterations, len(queries))):
+                query = queries[i % len(queries)]
+                retrieval_service._cache.clear()
+                start = time.perf_counter()
+                retrieval_service.retrieve(query, top_k=3, score_threshold=0.0)
+                samples.append(time.perf_counter() - start)
+
+            scored.clear()
+            retrieval_service._query_points = counting_query_points
+            try:
+                for query in queries:
+                    retrieval_service._cache.clear()
+                    top3[query] = [c["chunk_id"] for c in retrieval_service.retrieve(query, top_k=3, score_threshold=0.0)]
+            finally:
+                del retrieval_service._query_points
+
+            for item in eval_set:
+                retrieval_service._cache.clear()
+                hits += any(
+                    c["chapter"] == item["chapter"] and c["section"] == item["section"]
+                    for c in retrieval_service.retrieve(item["question"], top_k=3, score_threshold=0.0)
+                )
+            return {
+                "latency": percentiles(samples),
+                "points_scored_per_query": round(sum(scored) / len(queries), 1),
+                "hit_at_3": round(hits / len(eval_set), 3),
+                "top3": top3
+            }
+
+        with track_memory(result):
+            flat = run_mode("flat")
+            hierarchical = run_mode("hierarchical")
+    finally:
+        retrieval_service._client, settings.qdrant_collection_name, settings.retrieval_mode = saved
+        retrieval_service._cache.clear()
+
+    recall = [
+        len(set(hierarchical["top3"][query]) & set(ids)) / len(ids)
+        for query, ids in flat.pop("top3").items() if ids
+    ]
+    hierarchical.pop("top3")
+    hierarchical["recall_at_3_vs_flat"] = round(sum(recall) / len(recall), 3) if recall else None
+    result["flat"] = flat
+    result["hierarchical"] = hierarchical
+    result["top_chapters"] = settings.hierarchical_top_chapters
+    result["top_sections"] = settings.hierarchical_top_sections
+    return result
+
+
+def bench_logging(iterations: int = 50, **_) -> Dict[str, Any]:
+    """Records per second and caller-side latency: direct JSON handler vs queue pipeline"""
+    import io
+    import logging
+    import logging.handlers
+    import queue
+    from src.utils.logger import FastQueueHandler, JSONFormatter, RequestContextFilter
+
+    records = iterations * 200
+    result: Dict[str, Any] = {"records": records}
+    root = logging.getLogger()
+    saved_handlers, saved_level = root.handlers[:], root.level
+    bench_logger = logging.getLogger("benchmarks.logging")
+
+    def emit_all() -> List[float]:
+        samples = []
+        for i in range(records):
+            start = time.perf_counter()
+            bench_logger.info("chat request %d served", i, extra={"duration_ms": 12.5})
+            samples.append(time.perf_counter() - start)
+        return samples
+
+    try:
+        # Direct: format + write on the calling thread
+        direct = logging.StreamHandler(io.StringIO())
+        direct.setFormatter(JSONFormatter())
+        root.handlers = [direct]
+        root.setLevel(logging.INFO)
+        with timer(result, "direct_seconds"):
+            direct_samples = emit_all()
+
+        # Queue: enqueue on the calling thread, format + write in the listener
+        log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        queue_handler = FastQueueHandler(log_queue)
+        queue_handler.addFilter(RequestContextFilter())
+        root.handlers = [queue_handler]
+        listener = logging.handlers.QueueListener(log_queue, direct)
+        listener.start()
+        with timer(result, "queue_seconds"):
+            queue_samples = emit_all()
+            listener.stop()  # Drain the queue
+    finally:
+        root.handlers, root.level = saved_handlers, saved_level
+
+    result["direct"] = percentiles(direct_samples)
+    result["direct"]["records_per_second"] = round(records / result["direct_seconds"], 2)
+    result["queue"] = percentiles(queue_samples)
+    result["queue"]["records_per_second"] = round(records / result["queue_seconds"], 2)
+    result["queue"]["caller_records_per_second"] = round(records / sum(queue_samples), 2)
+    return result
+
+
+def bench_breakers(iterations: int = 20, **_) -> Dict[str, Any]:
+    """
+    Drive the Qdrant and LLM circuit breakers through outage and recovery
+    with injected faults: call latency per phase (fail-fast once open) and
+    the breaker state after each phase.
+    """
+    from src.models.config import settings
+    from src.services.llm import get_llm_service
+    from src.utils.circuit_breaker import get_circuit_breaker
+    from .stubs import FaultInjector
+
+    retrieval_service = get_retrieval_service()
+    llm_service = get_llm_service()
+    qdrant_breaker = get_circuit_breaker("qdrant")
+    llm_breaker = get_circuit_breaker("llm")
+
+    provider = llm_service._provider
+    saved = (settings.breaker_open_seconds, llm_breaker.slow_call_seconds, provider.latency_ms, provider.jitter_ms)
+    settings.breaker_open_seconds = 0.5
+    llm_breaker.slow_call_seconds = 0.05
+    provider.jitter_ms = 0.0
+
+    qdrant = retrieval_service._client
+    faulty = FaultInjector(qdrant, {"query_points"})
+    retrieval_service._client = faulty
+
+    def run_phase(name: str, call, breaker, calls: int) -> Dict[str, Any]:
+        samples = []
+        rejected = breaker.stats()["rejected"]
+        for i in range(calls):
+            start = time.perf_counter()
+            call(f"{name} query {i}")
+            samples.append(time.perf_counter() - start)
+        return {
+            "calls": calls,
+            "latency": percentiles(samples),
+            "rejected": breaker.stats()["rejected"] - rejected,
+            "state": breaker.state
+        }
+
+    def query_qdrant(query: str):
+        retrieval_service.retrieve(query, top_k=3)
+
+    def query_llm(query: str):
+        llm_service.complete("CONTEXT:\nfault injection", query)
+
+    # Enough calls per phase to push a window full of healthy calls past
+    # the failure rate and then see rejections
+    iterations = max(iterations, settings.breaker_window_size)
+    result: Dict[str, Any] = {"open_seconds": settings.breaker_open_seconds}
+    try:
+        qdrant_phases = {}
+        faulty.error_rate = 0.0
+        qdrant_phases["healthy"] = run_phase("healthy", query_qdrant, qdrant_breaker, iterations)
+        faulty.error_rate, faulty.latency_ms = 1.0, 20.0
+        qdrant_phases["outage"] = run_phase("outage", query_qdrant, qdrant_breaker, iterations)
+        faulty.error_rate, faulty.latency_ms = 0.0, 0.0
+        time.sleep(settings.breaker_open_seconds)
+        qdrant_phases["recovered"] = run_phase("recovered", query_qdrant, qdrant_breaker, iterations)
+        result["qdrant"] = qdrant_phases
+
+        llm_phases = {}
+        provider.latency_ms = 5.0
+        llm_phases["healthy"] = run_phase("healthy", query_llm, llm_breaker, iterations)
+        provider.latency_ms = 100.0
+        llm_phases["slow"] = run_phase("slow", query_llm, llm_breaker, iterations)
+        provider.latency_ms = 5.0
+        time.sleep(settings.breaker_open_seconds)
+        llm_phases["recovered"] = run_phase("recovered", query_llm, llm_breaker, iterations)
+        result["llm"] = llm_phases
+
+        result["ok"] = all(
+            phases["healthy"]["state"] == "closed"
+            and phases[outage]["state"] in ("open", "half_open")
+            and phases[outage]["rejected"] > 0
+            and phases["recovered"]["state"] == "closed"
+            for phases, outage in ((qdrant_phases, "outage"), (llm_phases, "slow"))
+        )
+    finally:
+        retrieval_service._client = qdrant
+        settings.breaker_open_seconds, llm_breaker.slow_call_seconds, provider.latency_ms, provider.jitter_ms = saved
+
+    return result
+
+
+def bench_translation(content_chars: int = 4000, ms_per_token: float = 5.0, **_) -> Dict[str, Any]:
+    """
+    Whole-content translation in one LLM call vs segmented translation:
+    time to first streamed piece, total time, and the LLM calls needed to
+    re-translate after one paragraph is edited (per-segment cache).
+    Fake completion time grows with output length, as a real model's does.
+    """
+    from src.models.config import settings
+    from src.services.llm import get_llm_service
+    from src.services.translation import get_translation_service, split_segments
+
+    chapter_file = sorted(DOCS_PATH.glob("chapter-*.md"))[0]
+    content = chapter_file.read_text(encoding="utf-8")[:content_chars]
+    content = content[:content.rfind("\n\n")]
+
+    llm_service = get_llm_service()
+    service = get_translation_service()
+    provider = llm_service._provider
+    saved = (provider.ms_per_token, provider.jitter_ms)
+    provider.ms_per_token, provider.jitter_ms = ms_per_token, 0.0
+
+    async def stream(text: str) -> Dict[str, Any]:
+        before = dict(service.stats())
+        start = time.perf_counter()
+        first = None
+        pieces = []
+        async for piece in service.translate_stream(text, "pashto"):
+            first = first or time.perf_counter() - start
+            pieces.append(piece)
+        after = service.stats()
+        return {
+            "first_piece_seconds": round(first, 4),
+            "seconds": round(time.perf_counter() - start, 4),
+            "llm_calls": after["translated"] - before["translated"],
+            "cache_hits": after["cache_hits"] - before["cache_hits"]
+        }
+
+    segments = split_segments(content)
+    result: Dict[str, Any] = {
+        "content_chars": len(content),
+        "segments": len(segments),
+        "translated_segments": sum(segment["translate"] for segment in segments),
+        "concurrency": settings.translation_concurrency,
+        "rate_limit_per_min": settings.groq_rate_limit_per_min
+    }
+    try:
+        start = time.perf_counter()
+        llm_service.translate_content(content=content, target_language="pashto")
+        elapsed = round(time.perf_counter() - start, 4)
+        result["single_call"] = {"first_piece_seconds": elapsed, "seconds": elapsed, "llm_calls": 1}
+
+        service._cache.clear()
+        result["segmented"] = asyncio.run(stream(content))
+
+        paragraphs = content.split("\n\n")
+        edited = max(range(len(paragraphs)), key=lambda i: len(paragraphs[i]))
+        paragraphs[edited] += " This sentence was added in an edit."
+        result["after_one_edit"] = asyncio.run(stream("\n\n".join(paragraphs)))
+    finally:
+        provider.ms_per_token, provider.jitter_ms = saved
+
+    return result
+
+
+def bench_dedup(embedding_service, copies: int = 3, edit_rate: float = 0.01, **_) -> Dict[str, Any]:
+    """
+    MinHash/LSH near-duplicate detection on the book, then on the book plus
+    `copies` lightly edited copies of every chunk filed under other chapters
+    (repeated definitions): clusters found, planted-duplicate recall, false
+    merges, detection time at 1x and 4x corpus size, indexed points per
+    mode, and distinct clusters in the top 3 with and without collapsing.
+    Planted copies whose exact shingle Jaccard falls below the threshold
+    are not near-duplicates by definition; recall is also given without them.
+    """
+    import random
+    from qdrant_client import QdrantClient
+    from src.models.config import settings
+    from src.services.dedup import cluster_chunks
+
+    chunks = load_chunks()
+    result: Dict[str, Any] = {"threshold": settings.dedup_threshold, "book": cluster_chunks([dict(c) for c in chunks], mode="tag")["report"]}
+
+    rng = random.Random(49)
+    vocabulary = sorted({word for chunk in chunks for word in chunk["content"].split()})
+
+    def corpus_with_copies(n: int) -> List[Dict]:
+        corpus = [dict(chunk, source=chunk["chunk_id"]) for chunk in chunks]
+        for copy in range(n):
+            for chunk in chunks:
+                words = [rng.choice(vocabulary) if rng.random() < edit_rate else word for word in chunk["content"].split()]
+                chapter = f"repeat-{copy:02d}-{chunk['chapter']}"
+                corpus.append({
+                    **chunk,
+                    "chunk_id": f"{chapter}_{chunk['chunk_id']}",
+                    "chapter": chapter,
+                    "content": " ".join(words),
+                    "source": chunk["chunk_id"]
+                })
+        return corpus
+
+    corpus = corpus_with_copies(copies)
+    start = time.perf_counter()
+    tagged = cluster_chunks(corpus, mode="tag")
+    result["detect_seconds"] = round(time.perf_counter() - start, 4)
+    result["with_copies"] = tagged["report"]
+
+    by_cluster: Dict[str, set] = {}
+    for chunk in corpus:
+        by_cluster.setdefault(chunk["cluster_id"], set()).add(chunk["source"])
+    cluster_of = {chunk["chunk_id"]: chunk["cluster_id"] for chunk in corpus}
+    planted = [chunk for chunk in corpus if chunk["chunk_id"] != chunk["source"]]
+    result["planted_recall"] = round(
+        sum(cluster_of[chunk["source"]] == chunk["cluster_id"] for chunk in planted) / len(planted), 4
+    )
+    from src.services.provenance import normalize_words, shingle_hashes
+
+    def jaccard(a: str, b: str) -> float:
+        a, b = (set(shingle_hashes(normalize_words(text), settings.dedup_shingle_size)) for text in (a, b))
+        return len(a & b) / len(a | b)
+
+    content = {chunk["chunk_id"]: chunk["content"] for chunk in corpus}
+    similar = [chunk for chunk in planted if jaccard(chunk["content"], content[chunk["source"]]) >= settings.dedup_threshold]
+    result["planted_recall_above_threshold"] = round(
+        sum(cluster_of[chunk["source"]] == chunk["cluster_id"] for chunk in similar) / max(1, len(similar)), 4
+    )
+    result["false_merges"] = sum(len(sources) > 1 for sources in by_cluster.values())
+
+    larger = corpus_with_copies(copies * 4 + 3)
+    start = time.perf_counter()
+    cluster_chunks(larger, mode="tag")
+    result["detect_seconds_4x"] = round(time.perf_counter() - start, 4)
+    result["chunks_4x"] = len(larger)
+
+    merged = cluster_chunks([dict(chunk) for chunk in corpus], mode="merge")["chunks"]
+    dimension = embedding_service.dimension
+    result["index_points"] = {"tag": len(corpus), "merge": len(merged)}
+    result["index_vector_mb"] = {mode: round(points * dimension * 4 / (1024 * 1024), 3) for mode, points in result["index_points"].items()}
+
+    retrieval_service = get_retrieval_service()
+    saved = retrieval_service._client, settings.qdrant_collection_name, settings.dedup_mode
+    try:
+        retrieval_service._client = QdrantClient(":memory:")
+        settings.qdrant_collection_name = "benchmark-dedup"
+        retrieval_service._ensure_collection()
+        vectors = embedding_service.embed_batch([chunk["content"] for chunk in corpus])
+        for chunk, vector in zip(corpus, vectors):
+            retrieval_service.index_chunk(
+                chunk_id=chunk["chunk_id"],
+                content=chunk["content"],
+                chapter=chunk["chapter"],
+                section=chunk["section"],
+                anchor=chunk["anchor"],
+                vector=vector,
+                cluster_id=chunk["cluster_id"]
+            )
+
+        distinct = {}
+        for mode in ("off", "tag"):
+            settings.dedup_mode = mode
+            retrieval_service._cache.clear()
+            counts = [
+                len({chunk["cluster_id"] for chunk in retrieval_service.retrieve(query, top_k=3, score_threshold=0.0)})
+                for query in SAMPLE_QUERIES
+            ]
+            distinct[mode] = round(sum(counts) / len(counts), 3)
+        result["distinct_clusters_in_top3"] = distinct
+    finally:
+        retrieval_service._client, settings.qdrant_collection_name, settings.dedup_mode = saved
+        retrieval_service._cache.clear()
+
+    return result
+
+
+SCENARIOS = {
+    "ingest": bench_ingest,
+    "embedding": bench_embedding,
+    "retrieval": bench_retrieval,
+    "rerank": bench_rerank,
+    "chat": bench_chat,
+    "logging": bench_logging,
+    "breakers": bench_breakers,
+    "extractive": bench_extractive,
+    "hierarchical": bench_hierarchical,
+    "translation": bench_translation,
+    "dedup": bench_dedup,
+}
@@ -0,0 +1,124 @@
+"""
+Benchmark Stubs
+Stand-ins for Qdrant, Groq and (optionally) the embedding model
+"""
+
+from typing import Any, Iterable, List
+import hashlib
+import math
+import random
+import struct
+import time
+
+from src.models.config import settings
+from src.services.embedding import get_embedding_service
+from src.services.extractive import get_extractive_service
+from src.services.llm import get_llm_service
+from src.services.llm_providers import FakeProvider
+from src.services.retrieval import get_retrieval_service
+
+BENCH_COLLECTION = "benchmark-textbook"
+
+
+class StubEmbeddingService:
+    """
+    Deterministic hash-based embeddings with the model's dimension.
+
+    Texts sharing words get similar vectors, which is enough for the
+    retrieval and chat scenarios to exercise realistic code paths.
+    """
+
+    dimension = 384
+
+    def embed_text(self, text: str) -> List[float]:
+        vector = [0.0] * self.dimension
+        for word in text.lower().split():
+            digest = hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest()
+            index, sign = struct.unpack("<IxxxB", digest[:8])
+            vector[index % self.dimension] += 1.0 if sign & 1 else -1.0
+        norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+        return [x / norm for x in vector]
+
+    def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        return [self.embed_text(text) for text in texts]
+
+    @property
+    def is_available(self) -> bool:
+        return True
+
+
+class FaultInjector:
+    """
+    Proxy that adds latency and random failures to selected methods of a
+    wrapped client (e.g. QdrantClient.query_points). Adjust `error_rate`
+    and `latency_ms` between phases to simulate outages and recovery.
+    """
+
+    def __init__(
+        self,
+        target: Any,
+        methods: Iterable[str],
+        error_rate: float = 0.0,
+        latency_ms: float = 0.0,
+        seed: int = 0
+    ):
+        self._target = target
+        self._methods = set(methods)
+        self._rng = random.Random(seed)
+        self.error_rate = error_rate
+        self.latency_ms = latency_ms
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._target, name)
+        if name not in self._methods:
+            return attr
+
+        def faulty(*args, **kwargs):
+            if self.latency_ms:
+                time.sleep(self.latency_ms / 1000)
+            if self.error_rate and self._rng.random() < self.error_rate:
+                raise ConnectionError(f"injected fault in {name}")
+            return attr(*args, **kwargs)
+
+        return faulty
+
+
+def install_stubs(
+    stub_embeddings: bool = True,
+    llm_latency_ms: float = 200.0,
+    llm_jitter_ms: float = 0.0
+):
+    """
+    Wire the service singletons to an in-memory Qdrant and a fake LLM.
+
+    Returns the embedding service in use.
+    """
+    from qdrant_client import QdrantClient
+
+    settings.qdrant_collection_name = BENCH_COLLECTION
+    # Fake completions are free; budgets would switch scenarios to extractive answers
+    settings.token_budget_per_minute = 0
+    settings.token_budget_per_day = 0
+    # Repeated sample queries would be served from the answer cache, not the pipeline
+    settings.answer_cache_size = 0
+
+    embedding_service = StubEmbeddingService() if stub_embeddings else get_embedding_service()
+
+    retrieval_service = get_retrieval_service()
+    retrieval_service._embedding_service = embedding_service
+    retrieval_service._client = QdrantClient(":memory:")
+    retrieval_service._initialized = True
+    retrieval_service._ensure_collection()
+    retrieval_service._cache.clear()
+
+    get_extractive_service()._embedding_service = embedding_service
+
+    llm_service = get_llm_service()
+    llm_service._provider = FakeProvider(
+        model="bench",
+        latency_ms=llm_latency_ms,
+        jitter_ms=llm_jitter_ms
+    )
+    llm_service._initialized = True
+
+    return embedding_service
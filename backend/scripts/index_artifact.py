@@ -0,0 +1,190 @@
+"""
+Index Artifact Script
+Exports the live index to a portable artifact and restores it into Qdrant
+without loading the embedding model
+
+Usage:
+    python scripts/index_artifact.py export [--path FILE]
+    python scripts/index_artifact.py verify [--path FILE]
+    python scripts/index_artifact.py restore [--path FILE] [--url URL] [--smoke] [--local DIR] [--skip-current] [--optional]
+    python scripts/index_artifact.py install [--path FILE] [--url URL] [--optional]
+
+`--url` (default: INDEX_ARTIFACT_URL, e.g. the release asset published by
+.github/workflows/index-artifact.yml) downloads the artifact first. At
+deploy time, `restore --skip-current` loads it into Qdrant once per release
+and `install` writes the bundled auxiliary indexes into each instance
+(see railway.json).
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from dotenv import load_dotenv
+load_dotenv()
+
+from qdrant_client import QdrantClient
+
+from src.models.config import settings
+from src.services.metadata import INDEX_VERSION_KEY, get_metadata_service
+from src.services.qdrant_schema import resolve_alias
+from src.services.index_versions import delete_version, prune_versions, switch_alias
+from src.services.index_artifact import (
+    ArtifactError, DEFAULT_ARTIFACT_PATH, artifact_digest, download_artifact, export_artifact,
+    install_auxiliary_indexes, read_artifact, restore_artifact
+)
+
+
+def _client(local: str = None) -> QdrantClient:
+    if local:
+        return QdrantClient(path=local)
+    if not settings.is_qdrant_configured:
+        print("✗ Qdrant not configured (QDRANT_URL / QDRANT_API_KEY)")
+        sys.exit(1)
+    return QdrantClient(url=settings.qdrant_url, api_key=settings.qdrant_api_key)
+
+
+def _fetch(path: str = None, url: str = None, optional: bool = False) -> bool:
+    """Download the artifact when a URL is given; False if there is none and `optional` is set"""
+    url = url or settings.index_artifact_url
+    if url:
+        try:
+            download_artifact(url, path)
+        except ArtifactError as e:
+            print(f"✗ {e}")
+            sys.exit(1)
+        return True
+    if not Path(path or settings.index_artifact_path or DEFAULT_ARTIFACT_PATH).exists() and optional:
+        print("✓ No index artifact configured - skipping")
+        return False
+    return True
+
+
+def do_export(path: str = None):
+    client = _client()
+    alias = settings.qdrant_collection_name
+    collection = resolve_alias(client, alias) or alias
+    start = time.perf_counter()
+    manifest = export_artifact(
+        client, collection, path=path,
+        index_version=get_metadata_service().get_index_version(max_age=0)
+    )
+    size = sum(f["bytes"] for f in manifest["files"].values())
+    print(f"✓ Exported {manifest['points']} points from {collection} "
+          f"({size / 1e6:.1f} MB, {time.perf_counter() - start:.1f}s)")
+
+
+def do_verify(path: str = None):
+    try:
+        manifest, _ = read_artifact(path)
+    except ArtifactError as e:
+        print(f"✗ {e}")
+        sys.exit(1)
+    print(f"✓ Artifact OK: {manifest['points']} points x {manifest['dimension']} "
+          f"({manifest['embedding_model']}), index {manifest['index_version']}, "
+          f"built {manifest['created_at']} from {manifest['collection']}")
+    for name, info in manifest["files"].items():
+        print(f"  {name:<24} {info['bytes']:>12} bytes  sha256 {info['sha256'][:16]}…")
+
+
+def do_restore(
+    path: str = None,
+    smoke: bool = False,
+    local: str = None,
+    url: str = None,
+    skip_current: bool = False,
+    optional: bool = False
+):
+    if not _fetch(path, url, optional):
+        return
+    client = _client(local)
+    alias = settings.qdrant_collection_name
+    start = time.perf_counter()
+    try:
+        if skip_current and not local:
+            # Redeploys of the same release leave the live version alone
+            digest = artifact_digest(read_artifact(path)[0])
+            current = get_metadata_service().get_value(INDEX_VERSION_KEY) or {}
+            live = resolve_alias(client, alias)
+            if current.get("artifact") == digest and live and current.get("collection") == live:
+                print(f"✓ {alias} already serves this artifact ({live})")
+                return
+        restored = restore_artifact(client, alias, path=path)
+    except ArtifactError as e:
+        print(f"✗ {e}")
+        sys.exit(1)
+    build, manifest, chunks = restored["collection"], restored["manifest"], restored["chunks"]
+    print(f"  Loaded {manifest['points']} points into {build} in {time.perf_counter() - start:.2f}s")
+
+    if smoke:
+        # Smoke queries embed text, so this step loads the model
+        from ingest_book import validate_index
+
+        problems = validate_index(build, chunks)
+        if problems:
+            for problem in problems:
+                print(f"✗ Validation failed: {problem}")
+            delete_version(client, build)
+            sys.exit(1)
+
+    previous = switch_alias(client, alias, build)
+    for written in install_auxiliary_indexes(restored["extra_files"]):
+        print(f"  Installed {written}")
+    if not local:
+        version = get_metadata_service().bump_index_version(
+            total_chunks=chunks, collection=build, artifact=artifact_digest(manifest)
+        )
+        print(f"  index_version: {version or 'not recorded (Neon not configured)'}")
+    prune_versions(client, alias)
+    print(f"✓ Restored {alias}: {previous} -> {build} in {time.perf_counter() - start:.2f}s")
+
+
+def do_install(path: str = None, url: str = None, optional: bool = False):
+    if not _fetch(path, url, optional):
+        return
+    try:
+        _, data = read_artifact(path)
+    except ArtifactError as e:
+        print(f"✗ {e}")
+        sys.exit(1)
+    written = install_auxiliary_indexes(data)
+    for target in written:
+        print(f"  Installed {target}")
+    print(f"✓ Installed {len(written)} auxiliary indexes")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Export or restore a portable index artifact")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    for name, help_text in (
+        ("export", "Snapshot the live index"),
+        ("verify", "Check an artifact's checksums"),
+        ("restore", "Load an artifact into a new index version and serve it"),
+        ("install", "Write an artifact's auxiliary indexes (no Qdrant)")
+    ):
+        command_parser = subparsers.add_parser(name, help=help_text)
+        command_parser.add_argument("--path", help="Artifact file (default: settings.index_artifact_path)")
+        if name in ("restore", "install"):
+            command_parser.add_argument("--url", help="Download the artifact first (default: settings.index_artifact_url)")
+            command_parser.add_argument("--optional", action="store_true", help="Succeed when no artifact is configured")
+        if name == "restore":
+            command_parser.add_argument("--smoke", action="store_true", help="Run smoke queries before switching")
+            command_parser.add_argument("--local", metavar="DIR", help="Restore into an on-disk local Qdrant")
+            command_parser.add_argument(
+                "--skip-current", action="store_true", help="Do nothing if the live version was restored from this artifact"
+            )
+    args = parser.parse_args()
+
+    if args.command == "export":
+        do_export(args.path)
+    elif args.command == "verify":
+        do_verify(args.path)
+    elif args.command == "install":
+        do_install(args.path, args.url, args.optional)
+    else:
+        do_restore(args.path, args.smoke, args.local, args.url, args.skip_current, args.optional)
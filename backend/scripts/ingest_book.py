@@ -18,6 +18,15 @@ load_dotenv()
 
 from src.services.embedding import get_embedding_service
 from src.services.retrieval import get_retrieval_service
+from src.services.metadata import get_metadata_service
+from src.services.provenance import build_provenance_index, write_provenance_index
+from src.services.extractive import build_sentence_index, write_sentence_index
+from src.services.anchors import build_anchor_index, heading_anchor, write_anchor_index
+from src.services.hierarchy import build_summaries, summary_collection
+from src.services.dedup import cluster_chunks
+from src.services.index_versions import create_version, delete_version, switch_alias, prune_versions
+from src.services.index_artifact import export_artifact
+from src.models.config import settings
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -26,28 +35,44 @@ logger = logging.getLogger(__name__)
 DOCS_PATH = Path(__file__).parent.parent.parent / "frontend" / "docs"
 CHUNK_SIZE = 500  # Target words per chunk
 CHUNK_OVERLAP = 50  # Words overlap between chunks
+SMOKE_QUERIES = [
+    "What is Physical AI?",
+    "How do robots use sensors?",
+    "What is ROS 2?"
+]
 
 
 def extract_sections(content: str) -> List[Dict[str, str]]:
-    """Extract sections from markdown content"""
+    """
+    Extract sections from markdown content.
+
+    Each section carries the anchor the docs site gives its heading
+    (repeats get -1, -2, ...); text before the first heading has anchor "".
+    """
     sections = []
+    anchor_counts: Dict[str, int] = {}
+
+    # The chapter title (# heading) is stored separately as chapter_name
+    content = re.sub(r'^#\s+.*$', '', content, count=1, flags=re.MULTILINE)
 
     # Split by headers (## or ###)
     pattern = r'^(#{2,3})\s+(.+?)$'
     parts = re.split(pattern, content, flags=re.MULTILINE)
 
     current_section = "Introduction"
+    current_anchor = ""
     current_content = []
 
     i = 0
     while i < len(parts):
         part = parts[i].strip()
 
-        if part.startswith('#'):
+        if re.fullmatch(r'#{2,3}', part):
             # Save previous section
             if current_content:
                 sections.append({
                     "section": current_section,
+                    "anchor": current_anchor,
                     "content": "\n".join(current_content)
                 })
                 current_content = []
@@ -55,6 +80,11 @@ def extract_sections(content: str) -> List[Dict[str, str]]:
             # Get section title
             if i + 1 < len(parts):
                 current_section = parts[i + 1].strip()
+                current_anchor = heading_anchor(current_section)
+                seen = anchor_counts.get(current_anchor, 0)
+                anchor_counts[current_anchor] = seen + 1
+                if seen:
+                    current_anchor = f"{current_anchor}-{seen}"
                 i += 2
             else:
                 i += 1
@@ -67,6 +97,7 @@ def extract_sections(content: str) -> List[Dict[str, str]]:
     if current_content:
         sections.append({
             "section": current_section,
+            "anchor": current_anchor,
             "content": "\n".join(current_content)
         })
 
@@ -114,23 +145,62 @@ def process_chapter(file_path: Path) -> List[Dict]:
     chunks = []
     for section in sections:
         section_chunks = chunk_text(section["content"])
+        anchor = section["anchor"]
+
+        # Character offsets into the section's whitespace-collapsed text
+        section_text = " ".join(section["content"].split())
+        cursor = 0
 
         for i, chunk_text_content in enumerate(section_chunks):
-            chunk_id = f"{chapter_id}_{section['section']}_{i}"
+            char_start = section_text.find(chunk_text_content, cursor)
+            cursor = char_start + 1
             chunks.append({
-                "chunk_id": chunk_id,
+                "chunk_id": f"{chapter_id}_{anchor}_{i}",
                 "content": chunk_text_content,
                 "chapter": chapter_id,
                 "chapter_name": chapter_name,
-                "section": section["section"]
+                "section": section["section"],
+                "anchor": anchor,
+                "char_start": char_start,
+                "char_end": char_start + len(chunk_text_content)
             })
 
     logger.info(f"  - Extracted {len(chunks)} chunks from {len(sections)} sections")
     return chunks
 
 
+def validate_index(collection_name: str, expected_chunks: int) -> List[str]:
+    """Smoke-test a freshly built chunk collection before it goes live; returns problems found"""
+    client = get_retrieval_service()._client
+    embedding_service = get_embedding_service()
+    problems = []
+
+    count = client.count(collection_name, exact=True).count
+    if count != expected_chunks:
+        problems.append(f"expected {expected_chunks} points, found {count}")
+
+    for query in SMOKE_QUERIES:
+        results = client.query_points(
+            collection_name=collection_name,
+            query=embedding_service.embed_text(query),
+            limit=1,
+            score_threshold=settings.index_smoke_min_score
+        ).points
+        if not results:
+            problems.append(f"no result above {settings.index_smoke_min_score} for '{query}'")
+
+    return problems
+
+
 def ingest_all_chapters():
-    """Ingest all chapter files into Qdrant"""
+    """
+    Ingest all chapter files into a new index version and switch to it.
+
+    Chunks are written to the next versioned collection while the alias
+    keeps serving the current one; the alias only moves once the new
+    collection passes validation. The previous version is kept for rollback
+    (scripts/manage_index.py).
+    """
     retrieval_service = get_retrieval_service()
 
     logger.info("=" * 50)
@@ -151,23 +221,97 @@ def ingest_all_chapters():
         chunks = process_chapter(chapter_file)
         all_chunks.extend(chunks)
 
-    logger.info(f"\nTotal chunks to index: {len(all_chunks)}")
+    # Near-duplicate clusters: tagged for one-hit-per-cluster retrieval, or merged
+    dedup = cluster_chunks(all_chunks)
+    index_chunks = dedup["chunks"]
+    report = dedup["report"]
+    if report["mode"] != "off":
+        logger.info(
+            f"Near-duplicates ({report['mode']}): {report['duplicates']} chunks in {report['clusters']} clusters, "
+            f"{report['retrievable_chunks']}/{report['chunks']} distinct ({report['reduction']:.1%} reduction), "
+            f"{report['indexed_chunks']} to index"
+        )
 
-    # Index chunks
-    logger.info("\nIndexing chunks into Qdrant...")
+    logger.info(f"\nTotal chunks to index: {len(index_chunks)}")
+
+    if not retrieval_service.is_available:
+        logger.error("Cannot index - Qdrant not configured or unreachable")
+        return
+
+    # Build the next version next to the live one
+    client = retrieval_service._client
+    alias = settings.qdrant_collection_name
+    build = create_version(client, alias, get_embedding_service().dimension)
+    logger.info(f"\nIndexing chunks into {build}...")
     success_count = 0
 
-    for chunk in all_chunks:
+    # Chunk vectors are reused for the section/chapter summaries
+    vectors = get_embedding_service().embed_batch([chunk["content"] for chunk in index_chunks])
+    for chunk, vector in zip(index_chunks, vectors):
         success = retrieval_service.index_chunk(
             chunk_id=chunk["chunk_id"],
             content=chunk["content"],
             chapter=chunk["chapter"],
-            section=chunk["section"]
+            section=chunk["section"],
+            collection_name=build,
+            anchor=chunk["anchor"],
+            vector=vector,
+            cluster_id=chunk["cluster_id"],
+            duplicate_chunk_ids=chunk.get("duplicate_chunk_ids"),
+            duplicate_chapters=chunk.get("duplicate_chapters")
         )
         if success:
             success_count += 1
 
-    logger.info(f"\nIndexed {success_count}/{len(all_chunks)} chunks successfully")
+    logger.info(f"\nIndexed {success_count}/{len(index_chunks)} chunks successfully")
+
+    # Section and chapter summaries for hierarchical retrieval (sibling collection)
+    summaries = build_summaries(index_chunks, vectors)
+    if not retrieval_service.index_summaries(summaries, collection_name=build):
+        summaries = []
+        if client.collection_exists(summary_collection(build)):
+            client.delete_collection(summary_collection(build))
+    logger.info(f"Indexed {len(summaries)} summary points")
+
+    problems = validate_index(build, len(index_chunks))
+    if problems:
+        for problem in problems:
+            logger.error(f"Validation failed: {problem}")
+        delete_version(client, build)
+        logger.error(f"Discarded {build} - {alias} still serves the previous version")
+        return
+
+    previous = switch_alias(client, alias, build)
+    logger.info(f"Switched {alias}: {previous} -> {build}")
+
+    # Fingerprint index for fast translation provenance checks
+    provenance_index = build_provenance_index(all_chunks)
+    provenance_path = write_provenance_index(provenance_index)
+    logger.info(f"Wrote {len(provenance_index['hashes'])} fingerprints to {provenance_path}")
+
+    # Heading anchors and offsets for embedding-free selection lookup
+    anchor_index = build_anchor_index(all_chunks)
+    anchor_path = write_anchor_index(anchor_index)
+    logger.info(f"Wrote anchors for {anchor_index['chunk_count']} chunks to {anchor_path}")
+
+    # Sentence embeddings for extractive (no-LLM) answers
+    sentence_index = build_sentence_index(all_chunks)
+    sentence_path = write_sentence_index(sentence_index)
+    logger.info(f"Wrote {len(sentence_index['sentences'])} sentence embeddings to {sentence_path}")
+
+    # Bump index version so serving processes drop cached search results
+    version = get_metadata_service().bump_index_version(total_chunks=success_count, collection=build)
+    if version:
+        logger.info(f"Index version: {version}")
+    else:
+        logger.warning("Index version not recorded - Neon not configured or unreachable")
+
+    # Portable snapshot so other environments can restore without re-embedding
+    if settings.index_artifact_on_ingest:
+        manifest = export_artifact(client, build, index_version=version)
+        logger.info(f"Wrote index artifact ({manifest['points']} points, {len(manifest['files'])} files)")
+
+    prune_versions(client, alias)
 
     # Verify
     info = retrieval_service.get_collection_info()
@@ -182,13 +326,7 @@ def test_retrieval():
     logger.info("Testing Retrieval")
     logger.info("=" * 50)
 
-    test_queries = [
-        "What is Physical AI?",
-        "How do robots use sensors?",
-        "What is ROS 2?"
-    ]
-
-    for query in test_queries:
+    for query in SMOKE_QUERIES:
         logger.info(f"\nQuery: {query}")
         results = retrieval_service.retrieve(query, top_k=2)
 
@@ -0,0 +1,125 @@
+"""
+LLM Stub Server
+OpenAI-compatible /v1/chat/completions endpoint with injected latency and
+failures for offline load and resilience testing
+
+Point the API at it with:
+    LLM_PROVIDER=openai LLM_BASE_URL=http://localhost:8080/v1
+
+Faults can be changed while it runs, e.g. to simulate an outage and recovery:
+    curl -X POST localhost:8080/fault -H 'Content-Type: application/json' -d '{"error_rate": 1.0}'
+    curl -X POST localhost:8080/fault -H 'Content-Type: application/json' -d '{"error_rate": 0, "latency_ms": 200}'
+"""
+
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import List, Dict, Optional
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi import FastAPI, HTTPException
+from pydantic import BaseModel
+
+from src.services.llm_providers import FakeProvider
+
+
+class ChatCompletionRequest(BaseModel):
+    """Subset of the OpenAI chat completion request"""
+    model: str = "stub"
+    messages: List[Dict[str, str]]
+    max_tokens: Optional[int] = 500
+    temperature: Optional[float] = None
+
+
+class FaultConfig(BaseModel):
+    """Runtime fault injection settings (omitted fields are unchanged)"""
+    error_rate: Optional[float] = None
+    latency_ms: Optional[float] = None
+    jitter_ms: Optional[float] = None
+
+
+def create_app(
+    latency_ms: float = 200.0,
+    jitter_ms: float = 0.0,
+    seed: int = 0,
+    error_rate: float = 0.0
+) -> FastAPI:
+    """Create the stub server application"""
+    app = FastAPI(title="LLM Stub Server")
+    provider = FakeProvider(
+        model="stub",
+        latency_ms=latency_ms,
+        jitter_ms=jitter_ms,
+        seed=seed,
+        error_rate=error_rate
+    )
+
+    @app.post("/fault")
+    def set_fault(config: FaultConfig):
+        for key, value in config.model_dump(exclude_none=True).items():
+            setattr(provider, key, value)
+        return {
+            "error_rate": provider.error_rate,
+            "latency_ms": provider.latency_ms,
+            "jitter_ms": provider.jitter_ms
+        }
+
+    @app.get("/v1/models")
+    def models():
+        return {"object": "list", "data": [{"id": "stub", "object": "model", "owned_by": "stub"}]}
+
+    @app.post("/v1/chat/completions")
+    def chat_completions(request: ChatCompletionRequest):
+        try:
+            completion = provider.chat(
+                request.messages,
+                max_tokens=request.max_tokens or 500,
+                model=request.model
+            )
+        except RuntimeError as e:
+            raise HTTPException(status_code=503, detail=str(e))
+        content = completion.text
+        prompt_tokens = completion.prompt_tokens
+        completion_tokens = completion.completion_tokens
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop"
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens
+            }
+        }
+
+    return app
+
+
+if __name__ == "__main__":
+    import argparse
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Run an OpenAI-compatible LLM stub server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency-ms", type=float, default=200.0, help="Base response latency")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Max extra latency (deterministic per prompt)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of completions that fail with 503")
+    args = parser.parse_args()
+
+    uvicorn.run(
+        create_app(args.latency_ms, args.jitter_ms, args.seed, args.error_rate),
+        host=args.host,
+        port=args.port,
+        log_level="warning"
+    )
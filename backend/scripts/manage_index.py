@@ -0,0 +1,106 @@
+"""
+Index Management Script
+Lists blue/green index versions and switches or rolls back the serving alias
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from dotenv import load_dotenv
+load_dotenv()
+
+from qdrant_client import QdrantClient
+
+from src.models.config import settings
+from src.services.metadata import get_metadata_service
+from src.services.qdrant_schema import resolve_alias
+from src.services.index_versions import (
+    EmptyVersionError, ensure_not_empty, list_versions, prune_versions, rollback, switch_alias, versioned_name
+)
+
+
+def _client() -> QdrantClient:
+    if not settings.is_qdrant_configured:
+        print("✗ Qdrant not configured (QDRANT_URL / QDRANT_API_KEY)")
+        sys.exit(1)
+    return QdrantClient(url=settings.qdrant_url, api_key=settings.qdrant_api_key)
+
+
+def _record(client: QdrantClient, collection: str):
+    """Bump index_version so serving processes drop caches built on the old version"""
+    count = client.count(collection, exact=True).count
+    version = get_metadata_service().bump_index_version(total_chunks=count, collection=collection)
+    print(f"  index_version: {version or 'not recorded (Neon not configured)'}")
+
+
+def status():
+    client = _client()
+    alias = settings.qdrant_collection_name
+    live = resolve_alias(client, alias)
+    print(f"Alias {alias} -> {live or '(none)'}")
+    for _, name in list_versions(client, alias):
+        count = client.count(name, exact=True).count
+        print(f"  {'*' if name == live else ' '} {name}  {count} points")
+    print(f"index_version: {get_metadata_service().get_index_version(max_age=0)}")
+
+
+def do_rollback():
+    client = _client()
+    try:
+        target = rollback(client, settings.qdrant_collection_name)
+    except EmptyVersionError as e:
+        print(f"✗ Not rolling back: {e}")
+        sys.exit(1)
+    if not target:
+        print("✗ No older version to roll back to")
+        sys.exit(1)
+    print(f"✓ Rolled back {settings.qdrant_collection_name} -> {target}")
+    _record(client, target)
+
+
+def do_switch(number: int):
+    client = _client()
+    alias = settings.qdrant_collection_name
+    target = versioned_name(alias, number)
+    if target not in [name for _, name in list_versions(client, alias)]:
+        print(f"✗ {target} does not exist")
+        sys.exit(1)
+    try:
+        ensure_not_empty(client, target)
+    except EmptyVersionError as e:
+        print(f"✗ Not switching: {e}")
+        sys.exit(1)
+    switch_alias(client, alias, target)
+    print(f"✓ Switched {alias} -> {target}")
+    _record(client, target)
+
+
+def do_prune(keep: int):
+    deleted = prune_versions(_client(), settings.qdrant_collection_name, keep)
+    print(f"✓ Deleted: {deleted or 'nothing'}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Manage blue/green Qdrant index versions")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("status", help="Show versions and the live one")
+    subparsers.add_parser("rollback", help="Serve the previous version")
+    switch_parser = subparsers.add_parser("switch", help="Serve a specific version")
+    switch_parser.add_argument("version", type=int, help="Version number (N in -vN)")
+    prune_parser = subparsers.add_parser("prune", help="Delete old versions")
+    prune_parser.add_argument("--keep", type=int, default=settings.qdrant_keep_versions)
+    args = parser.parse_args()
+
+    if args.command == "status":
+        status()
+    elif args.command == "rollback":
+        do_rollback()
+    elif args.command == "switch":
+        do_switch(args.version)
+    else:
+        do_prune(args.keep)
@@ -32,6 +32,9 @@ def create_schema():
         created_at TIMESTAMP NOT NULL DEFAULT NOW()
     );
 
+    -- Chapter scope of the request (mined by the cache warmer)
+    ALTER TABLE query_logs ADD COLUMN IF NOT EXISTS chapter_filter VARCHAR(100);
+
     -- Indexes for query performance
     CREATE INDEX IF NOT EXISTS idx_query_logs_session_id ON query_logs(session_id);
     CREATE INDEX IF NOT EXISTS idx_query_logs_created_at ON query_logs(created_at DESC);
@@ -0,0 +1,53 @@
+"""
+Qdrant Schema Migration Script
+Applies the collection schema from Settings (payload indexes, HNSW, quantization, on-disk)
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from dotenv import load_dotenv
+load_dotenv()
+
+from qdrant_client import QdrantClient
+
+from src.models.config import settings
+from src.services.qdrant_schema import ensure_collection, resolve_alias, schema_diff
+
+EMBEDDING_DIMENSION = 384  # all-MiniLM-L6-v2
+
+
+def migrate(dry_run: bool = False):
+    """Create or migrate the configured collection"""
+    if not settings.is_qdrant_configured:
+        print("✗ Qdrant not configured (QDRANT_URL / QDRANT_API_KEY)")
+        sys.exit(1)
+
+    client = QdrantClient(url=settings.qdrant_url, api_key=settings.qdrant_api_key)
+    name = settings.qdrant_collection_name
+
+    if dry_run:
+        existing = [c.name for c in client.get_collections().collections]
+        name = resolve_alias(client, name) or name
+        if name not in existing:
+            print(f"Would create collection {name}-v1 behind alias {name}")
+            return
+        diff = schema_diff(client.get_collection(name))
+        print(f"Pending changes for {name}: {diff or 'none'}")
+        return
+
+    changes = ensure_collection(client, name, EMBEDDING_DIMENSION)
+    print(f"✓ {name}: {changes or 'already up to date'}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Apply the Qdrant collection schema from settings")
+    parser.add_argument("--dry-run", action="store_true", help="Only show pending changes")
+    args = parser.parse_args()
+
+    migrate(dry_run=args.dry_run)
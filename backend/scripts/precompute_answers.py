@@ -0,0 +1,181 @@
+"""
+Precompute Answers Script
+Generates anticipated questions from chapter headings and key terms, answers
+them through the RAG pipeline and stores the grounded answers for serving
+"""
+
+import asyncio
+import re
+import sys
+from pathlib import Path
+from typing import List, Dict, Optional
+import logging
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from dotenv import load_dotenv
+load_dotenv()
+
+from src.models.config import settings
+from src.services.embedding import get_embedding_service
+from src.services.retrieval import get_retrieval_service
+from src.services.llm import get_llm_service, REFUSAL_NO_CONTENT
+from src.services.metadata import get_metadata_service
+from src.services.answers import write_precomputed_answers
+from src.utils.rate_limit import AsyncRateLimiter
+from ingest_book import DOCS_PATH, extract_sections
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Configuration
+SKIP_SECTIONS = {"Coming Soon", "Further Reading", "Resources", "Exercises", "Summary"}
+MAX_TERMS_PER_SECTION = 5
+TOP_K = 3  # Same as /api/chat
+
+_NUMBERED_PREFIX = re.compile(r'^(?:Phase|Challenge|Future Trend|Step|Part)\s+\d+:\s*', re.IGNORECASE)
+_PARENTHETICAL = re.compile(r'\s*\(([^)]*)\)')
+_KEY_TERM = re.compile(r'\*\*([^*]{2,60}?)\*\*')
+_CODE_BLOCK = re.compile(r'```.*?```', re.DOTALL)
+
+
+def clean_topic(heading: str) -> str:
+    """Reduce a heading to its topic ("Phase 1: Academic Foundations (2010-2015)" -> "Academic Foundations")"""
+    topic = _NUMBERED_PREFIX.sub("", heading)
+    return _PARENTHETICAL.sub("", topic).strip().rstrip(":")
+
+
+def generate_questions(chapter_name: str, section: Dict[str, str]) -> List[str]:
+    """Candidate questions a reader is likely to ask about a section"""
+    heading = section["section"]
+    if heading in SKIP_SECTIONS or not re.search(r'[A-Za-z]', heading):
+        return []
+
+    if heading == "Introduction":
+        topic = re.sub(r'^Chapter\s+\d+:\s*', "", chapter_name)
+        questions = [f"What is {topic} about?", f"Give me an overview of {topic}."]
+    elif heading.endswith("?"):
+        questions = [heading]
+    else:
+        topic = clean_topic(heading)
+        questions = [f"What is {topic}?", f"Explain {topic}."]
+        # Acronyms and expansions in parentheses, e.g. "Degrees of Freedom (DOF)"
+        for alias in _PARENTHETICAL.findall(heading):
+            if alias and not re.search(r'\d{4}', alias):
+                questions.append(f"What is {alias}?")
+
+    terms = []
+    for term in _KEY_TERM.findall(_CODE_BLOCK.sub("", section["content"])):
+        term = clean_topic(term)
+        # Bold years and labels ("Key Insight") are emphasis, not terms
+        if not re.search(r'[A-Za-z]', term) or term.startswith("Key ") or term in terms:
+            continue
+        terms.append(term)
+    questions.extend(f"What is {term}?" for term in terms[:MAX_TERMS_PER_SECTION])
+
+    return list(dict.fromkeys(questions))
+
+
+def collect_questions() -> List[str]:
+    """Generate questions for every chapter file"""
+    questions = []
+    for file_path in sorted(DOCS_PATH.glob("chapter-*.md")):
+        with open(file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        chapter_name = content.split('\n')[0].replace('#', '').strip()
+
+        for section in extract_sections(content):
+            questions.extend(generate_questions(chapter_name, section))
+
+    return list(dict.fromkeys(questions))
+
+
+async def answer_question(
+    question: str,
+    semaphore: asyncio.Semaphore,
+    limiter: AsyncRateLimiter
+) -> Optional[Dict]:
+    """Run one question through retrieval and grounded generation"""
+    retrieval_service = get_retrieval_service()
+    llm_service = get_llm_service()
+
+    async with semaphore:
+        chunks = await asyncio.to_thread(retrieval_service.retrieve, query=question, top_k=TOP_K)
+        if not chunks:
+            logger.info(f"  - No content for: {question}")
+            return None
+
+        async with limiter:
+            response = await asyncio.to_thread(
+                llm_service.generate_grounded_response,
+                query=question,
+                retrieved_chunks=chunks
+            )
+
+    if response == REFUSAL_NO_CONTENT:
+        logger.info(f"  - Refused: {question}")
+        return None
+
+    return {
+        "question": question,
+        "embedding": [round(x, 6) for x in get_embedding_service().embed_text(question)],
+        "response": response,
+        "sources": sorted(set(chunk["chapter"] for chunk in chunks)),
+        "chunks": [
+            {key: chunk[key] for key in ("chunk_id", "content", "chapter", "section", "score")}
+            for chunk in chunks
+        ]
+    }
+
+
+async def precompute_answers(concurrency: int, rate_per_min: int, limit: Optional[int] = None):
+    """Answer all generated questions and write the answers file"""
+    logger.info("=" * 50)
+    logger.info("Precomputing Answers")
+    logger.info("=" * 50)
+
+    if not get_llm_service().is_available:
+        logger.error("LLM provider not configured - nothing to precompute")
+        return
+
+    questions = collect_questions()[:limit]
+    logger.info(f"Generated {len(questions)} candidate questions")
+
+    semaphore = asyncio.Semaphore(concurrency)
+    limiter = AsyncRateLimiter(rate_per_min)
+    results = await asyncio.gather(
+        *(answer_question(q, semaphore, limiter) for q in questions),
+        return_exceptions=True
+    )
+
+    answers = []
+    for question, result in zip(questions, results):
+        if isinstance(result, Exception):
+            logger.warning(f"  - Failed: {question} ({result})")
+        elif result:
+            answers.append(result)
+
+    index_version = get_metadata_service().get_index_version(max_age=0)
+    path = write_precomputed_answers(answers, index_version)
+    logger.info(f"\nStored {len(answers)}/{len(questions)} grounded answers in {path} (index {index_version})")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Precompute answers for anticipated questions")
+    parser.add_argument("--concurrency", type=int, default=4, help="Questions processed in parallel")
+    parser.add_argument(
+        "--rate", type=int, default=settings.groq_rate_limit_per_min,
+        help="Max LLM calls per minute (default: groq_rate_limit_per_min)"
+    )
+    parser.add_argument("--limit", type=int, default=None, help="Only answer the first N questions")
+    parser.add_argument("--list", action="store_true", help="Print the generated questions and exit")
+    args = parser.parse_args()
+
+    if args.list:
+        for question in collect_questions():
+            print(question)
+    else:
+        asyncio.run(precompute_answers(args.concurrency, args.rate, args.limit))
@@ -0,0 +1,157 @@
+"""
+Cold-Start Profiler
+Reports per-import cost of src.api.main, time to first /api/health and the
+startup stage timeline; fails when the import budget is exceeded
+
+Usage:
+    python scripts/profile_startup.py                 # imports + live server timeline
+    python scripts/profile_startup.py --imports-only --budget-ms 1500   # CI check
+"""
+
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+BACKEND_DIR = Path(__file__).parent.parent
+
+# Must stay out of the `import src.api.main` path (loaded lazily by the services)
+HEAVY_MODULES = ["torch", "sentence_transformers", "transformers", "numpy", "qdrant_client", "groq", "psycopg", "redis"]
+
+DEFAULT_BUDGET_MS = 1500
+
+
+def profile_imports(module: str = "src.api.main") -> Tuple[float, List[Tuple[str, float, float]], List[str]]:
+    """
+    Import a module in a fresh interpreter with -X importtime.
+
+    Returns (wall ms, [(module, self ms, cumulative ms)], heavy modules loaded).
+    """
+    code = (
+        "import sys, time, json; start = time.perf_counter(); "
+        f"import {module}; elapsed = (time.perf_counter() - start) * 1000; "
+        f"print(json.dumps({{'ms': elapsed, 'heavy': [m for m in {HEAVY_MODULES!r} if m in sys.modules]}}))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    )
+
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        imports.append((name.strip(), int(self_us) / 1000, int(cumulative_us) / 1000))
+
+    summary = json.loads(result.stdout.strip().splitlines()[-1])
+    return summary["ms"], imports, summary["heavy"]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def profile_server(timeout: float = 120.0) -> Dict:
+    """
+    Start uvicorn, measure time to the first /api/health response and wait
+    for the embedding warm-up to finish; returns milestones in ms since spawn.
+    """
+    import httpx
+
+    port = _free_port()
+    env = {**os.environ, "STARTUP_PROFILE": "true", "LOG_LEVEL": "WARNING"}
+    spawned = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.api.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    result: Dict = {}
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=2.0) as client:
+            while "first_health_ms" not in result:
+                if time.perf_counter() - spawned > timeout:
+                    raise TimeoutError("server did not answer /api/health")
+                try:
+                    if client.get("/api/health").status_code == 200:
+                        result["first_health_ms"] = round((time.perf_counter() - spawned) * 1000, 1)
+                except httpx.TransportError:
+                    time.sleep(0.02)
+
+            # Health stays responsive while the model loads in the background
+            health_latencies = []
+            while time.perf_counter() - spawned < timeout:
+                start = time.perf_counter()
+                client.get("/api/health")
+                health_latencies.append((time.perf_counter() - start) * 1000)
+                startup = client.get("/api/status").json().get("startup", {})
+                if "warm_up_done" in startup.get("marks", {}):
+                    break
+                time.sleep(0.1)
+
+            result["warm_ms"] = round((time.perf_counter() - spawned) * 1000, 1)
+            result["health_during_warm_up_max_ms"] = round(max(health_latencies), 1)
+            result["timeline"] = startup
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+    return result
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Profile API cold start")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS, help="Max import time of src.api.main")
+    parser.add_argument("--top", type=int, default=15, help="Slowest imports to list")
+    parser.add_argument("--imports-only", action="store_true", help="Skip the live server timeline")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    wall_ms, imports, heavy = profile_imports()
+    report = {
+        "import_ms": round(wall_ms, 1),
+        "budget_ms": args.budget_ms,
+        "heavy_modules_imported": heavy,
+        "slowest_imports": [
+            {"module": name, "self_ms": round(self_ms, 1), "cumulative_ms": round(cumulative_ms, 1)}
+            for name, self_ms, cumulative_ms in sorted(imports, key=lambda item: item[2], reverse=True)[:args.top]
+        ]
+    }
+    if not args.imports_only:
+        report["server"] = profile_server()
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"import src.api.main: {report['import_ms']}ms (budget {args.budget_ms}ms)")
+        for entry in report["slowest_imports"]:
+            print(f"  {entry['cumulative_ms']:>8.1f}ms  {entry['self_ms']:>7.1f}ms self  {entry['module']}")
+        if "server" in report:
+            server = report["server"]
+            print(f"first /api/health: {server['first_health_ms']}ms after spawn")
+            print(f"embedding warm-up finished: {server['warm_ms']}ms after spawn")
+            print(f"max /api/health latency during warm-up: {server['health_during_warm_up_max_ms']}ms")
+            for name, stage in server["timeline"].get("stages", {}).items():
+                print(f"  stage {name}: {stage}")
+            for name, offset in server["timeline"].get("marks", {}).items():
+                print(f"  mark {name}: {offset}ms")
+
+    failures = []
+    if wall_ms > args.budget_ms:
+        failures.append(f"import time {wall_ms:.0f}ms exceeds budget {args.budget_ms:.0f}ms")
+    if heavy:
+        failures.append(f"heavy modules imported eagerly: {', '.join(heavy)}")
+    for failure in failures:
+        print(f"✗ {failure}", file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,30 +3,73 @@ FastAPI Main Application
 Physical AI & Humanoid Robotics Interactive Textbook - Backend API
 """
 
-from fastapi import FastAPI
+from ..utils.startup import startup_timeline
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+import asyncio
 import logging
+import time
 
-# Import routers
-from .routers import chat, health
+# Import routers (services load their heavy dependencies lazily)
+from .routers import admin, chat, health
+from ..models.config import settings
+from ..services.health import get_health_monitor
+from ..services.embedding import get_embedding_service
+from ..services.cache_warmer import get_cache_warmer
+from ..utils.logger import (
+    configure_logging,
+    shutdown_logging,
+    parse_sample_rates,
+    generate_request_id,
+    request_id_var,
+)
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+# Configure logging (JSON, written from a background thread)
+configure_logging(
+    level=settings.log_level,
+    sample_rates=parse_sample_rates(settings.log_sample_rates)
 )
 logger = logging.getLogger(__name__)
+startup_timeline.mark("imports")
+
+
+async def warm_up():
+    """Load the embedding model off the event loop once the API is serving"""
+    await asyncio.sleep(0)
+    await asyncio.to_thread(get_embedding_service().warm_up)
+    startup_timeline.mark("warm_up_done")
+    if settings.startup_profile:
+        logger.info("Startup timeline", extra={"startup": startup_timeline.report()})
+
+
+async def warm_caches(warm_up_task):
+    """Replay hot questions from query_logs once the embedding model is loaded"""
+    if warm_up_task:
+        await asyncio.wait({warm_up_task})
+    await get_cache_warmer().run()
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan events"""
     logger.info("Starting Physical AI Textbook API...")
-    # Startup: Initialize connections, load models, etc.
+    startup_timeline.mark("lifespan_start")
+    # Startup: Probe dependencies in the background (also warms up clients)
+    get_health_monitor().start()
+    # Heavy ML imports happen in a worker thread; /api/health is served meanwhile
+    warm_up_task = asyncio.create_task(warm_up()) if settings.warm_up_embedding_model else None
+    cache_task = asyncio.create_task(warm_caches(warm_up_task)) if settings.cache_warm_on_startup else None
+    startup_timeline.mark("serving")
     yield
     # Shutdown: Clean up resources
     logger.info("Shutting down Physical AI Textbook API...")
+    for task in (warm_up_task, cache_task):
+        if task:
+            task.cancel()
+    await get_health_monitor().stop()
+    shutdown_logging()
 
 
 # Create FastAPI application
@@ -46,6 +89,25 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.middleware("http")
+async def request_context(request: Request, call_next):
+    """Assign a request_id (or reuse X-Request-ID) for log correlation"""
+    request_id = request.headers.get("x-request-id") or generate_request_id()
+    token = request_id_var.set(request_id)
+    start = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        request_id_var.reset(token)
+    response.headers["X-Request-ID"] = request_id
+    logger.debug(
+        f"{request.method} {request.url.path} {response.status_code}",
+        extra={"duration_ms": round((time.perf_counter() - start) * 1000, 2)}
+    )
+    return response
+
+
 # Root endpoint
 @app.get("/")
 async def root():
@@ -61,6 +123,7 @@ async def root():
 # Include routers
 app.include_router(health.router, prefix="/api", tags=["health"])
 app.include_router(chat.router, prefix="/api", tags=["chat"])
+app.include_router(admin.router, prefix="/api/admin", tags=["admin"], include_in_schema=False)
 
 
 if __name__ == "__main__":
@@ -1,5 +1,5 @@
 """Routers package"""
 
-from . import chat, health
+from . import admin, chat, health
 
-__all__ = ["chat", "health"]
+__all__ = ["admin", "chat", "health"]
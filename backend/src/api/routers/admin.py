@@ -0,0 +1,151 @@
+"""
+Admin Router
+Token-protected diagnostics for a live worker: request stack sampling and
+tracemalloc snapshots
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import PlainTextResponse
+from pydantic import BaseModel, Field
+from typing import Optional
+import hmac
+
+from ...models.config import settings
+from ...services.diagnostics import get_memory_snapshots, get_request_profiler
+
+router = APIRouter()
+
+
+def require_admin(request: Request):
+    """
+    Check the admin bearer token.
+
+    The whole surface answers 404 while settings.admin_token is unset, so
+    it cannot be probed on deployments that never enabled it.
+    """
+    if not settings.admin_token:
+        raise HTTPException(status_code=404, detail="Not Found")
+
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(token.encode(), settings.admin_token.encode()):
+        raise HTTPException(
+            status_code=401,
+            detail="Admin token required",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+
+
+class ProfilerConfig(BaseModel):
+    """Request profiler settings"""
+    sample_percent: float = Field(..., ge=0, le=100, description="Share of /api/chat calls sampled; 0 disables")
+    interval_ms: Optional[float] = Field(None, ge=1, le=1000, description="Stack sampling interval")
+    reset: bool = Field(False, description="Drop samples collected so far")
+
+
+class SnapshotRequest(BaseModel):
+    """Memory snapshot options"""
+    label: Optional[str] = Field(None, max_length=100)
+
+
+class TracingRequest(BaseModel):
+    """tracemalloc options"""
+    frames: Optional[int] = Field(None, ge=1, le=100, description="Traceback depth per allocation")
+
+
+@router.get("/profiler", dependencies=[Depends(require_admin)])
+async def profiler_status(limit: int = Query(20, ge=1, le=500)):
+    """Profiler settings, sample counts and the hottest functions"""
+    profiler = get_request_profiler()
+    return {**profiler.stats(), "hot_functions": profiler.hot_functions(limit)}
+
+
+@router.post("/profiler", dependencies=[Depends(require_admin)])
+async def configure_profiler(config: ProfilerConfig):
+    """Enable, adjust or disable (sample_percent 0) request sampling"""
+    profiler = get_request_profiler()
+    if config.reset:
+        profiler.reset()
+    profiler.configure(config.sample_percent, config.interval_ms)
+    return profiler.stats()
+
+
+@router.get("/profiler/stacks", dependencies=[Depends(require_admin)])
+async def profiler_stacks(
+    limit: int = Query(50, ge=1, le=5000),
+    format: str = Query("json", pattern="^(json|folded)$")
+):
+    """
+    Aggregated hot stacks; format=folded returns every stack as
+    "frame;frame;frame count" lines for flamegraph tools
+    """
+    profiler = get_request_profiler()
+    if format == "folded":
+        return PlainTextResponse(profiler.folded())
+    return {"samples": profiler.stats()["samples"], "stacks": profiler.hot_stacks(limit)}
+
+
+@router.delete("/profiler", dependencies=[Depends(require_admin)])
+async def reset_profiler():
+    """Drop collected samples (the sampling rate is kept)"""
+    profiler = get_request_profiler()
+    profiler.reset()
+    return profiler.stats()
+
+
+@router.post("/memory/tracing", dependencies=[Depends(require_admin)])
+async def start_tracing(request: Optional[TracingRequest] = None):
+    """Start tracemalloc (allocations made before this are not attributed)"""
+    snapshots = get_memory_snapshots()
+    snapshots.start(request.frames if request else None)
+    return snapshots.stats()
+
+
+@router.delete("/memory/tracing", dependencies=[Depends(require_admin)])
+async def stop_tracing():
+    """Stop tracemalloc and drop all snapshots"""
+    snapshots = get_memory_snapshots()
+    snapshots.stop()
+    return snapshots.stats()
+
+
+@router.get("/memory/snapshots", dependencies=[Depends(require_admin)])
+async def list_snapshots():
+    """Snapshots kept for diffs"""
+    snapshots = get_memory_snapshots()
+    return {**snapshots.stats(), "items": snapshots.snapshots()}
+
+
+@router.post("/memory/snapshots", dependencies=[Depends(require_admin)])
+async def take_snapshot(request: Optional[SnapshotRequest] = None):
+    """Capture a snapshot (409 unless tracing was started)"""
+    try:
+        return get_memory_snapshots().take(request.label if request else None)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+@router.get("/memory/snapshots/{snapshot_id}", dependencies=[Depends(require_admin)])
+async def snapshot_top(
+    snapshot_id: int,
+    key_type: str = Query("lineno", pattern="^(lineno|filename|traceback)$"),
+    limit: int = Query(20, ge=1, le=500)
+):
+    """Largest allocation sites of one snapshot"""
+    try:
+        return {"id": snapshot_id, "top": get_memory_snapshots().top(snapshot_id, key_type, limit)}
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Unknown snapshot {snapshot_id}")
+
+
+@router.get("/memory/diff", dependencies=[Depends(require_admin)])
+async def snapshot_diff(
+    from_id: int = Query(..., alias="from"),
+    to_id: int = Query(..., alias="to"),
+    key_type: str = Query("lineno", pattern="^(lineno|filename|traceback)$"),
+    limit: int = Query(20, ge=1, le=500)
+):
+    """Allocation sites that grew most between two snapshots"""
+    try:
+        return get_memory_snapshots().diff(from_id, to_id, key_type, limit)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=f"Unknown snapshot {e.args[0]}")
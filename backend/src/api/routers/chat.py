@@ -3,12 +3,40 @@ Chat Router
 API endpoints for RAG chatbot following strict grounding policies
 """
 
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel, Field
-from typing import Optional, List
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse, RedirectResponse, StreamingResponse
+from starlette.background import BackgroundTask
+from pydantic import BaseModel, Field, field_validator
+from typing import Optional, List, Any
+from urllib.parse import urlencode
+import asyncio
+import hashlib
+import json
 import logging
+import time
 
+from ...models.config import settings
 from ...services.retrieval import get_retrieval_service
+from ...services.provenance import get_provenance_service
+from ...services.answers import get_answer_cache, get_precomputed_answer_service, normalize_query
+from ...services.cache_warmer import get_cache_warmer
+from ...services.query_log import get_query_log_service
+from ...services.metadata import get_metadata_service
+from ...services.translation import get_translation_service, TranslationFailed
+from ...services.extractive import get_extractive_service
+from ...services.anchors import get_anchor_service
+from ...services.embedding import EMBEDDING_MODEL
+from ...services.session import get_session_service
+from ...services.rerank import get_rerank_service
+from ...services.health import get_health_monitor
+from ...services.usage import get_usage_tracker, usage_endpoint_var
+from ...services.diagnostics import get_request_profiler
+from ...services.admission import (
+    get_admission_controller, Overloaded, PRIORITY_SCOPED, PRIORITY_GLOBAL
+)
+from ...utils.validation import validate_session_id, ValidationError
+from ...utils.circuit_breaker import breaker_stats
+from ...utils.startup import startup_timeline
 from ...services.llm import get_llm_service, REFUSAL_NO_CONTENT, REFUSAL_NO_TRANSLATION
 
 logger = logging.getLogger(__name__)
@@ -18,18 +46,43 @@ router = APIRouter()
 
 # Request/Response Models
 
+class SelectionAnchor(BaseModel):
+    """Where a selection sits on the page: chapter, heading anchor, offsets in the section text"""
+    chapter: str = Field(..., max_length=100)
+    anchor: str = Field("", max_length=200, description="Id of the nearest heading above the selection")
+    start: Optional[int] = Field(None, ge=0, description="Offset of the selection in the section's collapsed text")
+    end: Optional[int] = Field(None, ge=0)
+
+
 class ChatRequest(BaseModel):
     """Chat query request"""
     query: str = Field(..., min_length=1, max_length=500)
-    chapter_filter: Optional[str] = Field(None, description="Scope to specific chapter")
+    chapter_filter: Optional[str] = Field(None, max_length=100, description="Scope to specific chapter")
     selected_text: Optional[str] = Field(None, description="User-highlighted text for scoped query")
+    selection_anchor: Optional[SelectionAnchor] = Field(None, description="Location of selected_text (skips the vector search)")
+    session_id: Optional[str] = Field(None, description="Conversation session (ses_{timestamp}_{random})")
+    answer_mode: str = Field(
+        "auto",
+        pattern="^(auto|generative|extractive)$",
+        description="extractive: quoted sentences without the LLM; auto: extractive when the LLM is unavailable or under load"
+    )
+
+    @field_validator('session_id')
+    @classmethod
+    def check_session_id(cls, v):
+        if v is not None:
+            try:
+                validate_session_id(v)
+            except ValidationError as e:
+                raise ValueError(str(e))
+        return v
 
 
 class TranslateRequest(BaseModel):
     """Translation request"""
     content: str = Field(..., min_length=1, description="Content to translate (must be from retrieval)")
     target_language: str = Field(..., pattern="^(pashto|dari)$", description="Target language: pashto or dari")
-    source_chapter: Optional[str] = Field(None, description="Source chapter for verification")
+    source_chapter: Optional[str] = Field(None, max_length=100, description="Source chapter for verification")
 
 
 class ChatResponse(BaseModel):
@@ -37,6 +90,8 @@ class ChatResponse(BaseModel):
     response: str
     sources: List[str] = []
     grounded: bool = True
+    session_id: Optional[str] = None
+    answer_mode: Optional[str] = None  # generative | extractive | precomputed | cached
 
 
 class TranslateResponse(BaseModel):
@@ -48,66 +103,392 @@ class TranslateResponse(BaseModel):
 
 # Endpoints
 
+async def _race_retrieval(func, *args, **kwargs) -> Any:
+    """
+    Run a blocking retrieval call in a worker thread, racing it against
+    the Qdrant timeout. Returns None when the timeout wins.
+    """
+    try:
+        return await asyncio.wait_for(
+            asyncio.to_thread(func, *args, **kwargs),
+            timeout=settings.qdrant_search_timeout_seconds
+        )
+    except asyncio.TimeoutError:
+        logger.warning(f"Retrieval timed out after {settings.qdrant_search_timeout_seconds}s")
+        return None
+
+
+def _answers_extractively(request: ChatRequest) -> bool:
+    """
+    Decide whether to skip the LLM for this request: when asked to, when no
+    provider is configured or the token budget rules the LLM out, and in
+    auto mode also when the admission queue has backed up.
+    """
+    if request.answer_mode == "extractive":
+        return True
+    if not get_llm_service().is_available or not get_usage_tracker().plan().allows_llm:
+        return True
+    if request.answer_mode == "generative":
+        return False
+    queue_depth = settings.extractive_auto_queue_depth
+    return bool(queue_depth) and get_admission_controller().stats()["queue_depth"] >= queue_depth
+
+
+async def _wait_for_disconnect(http_request: Request):
+    while not await http_request.is_disconnected():
+        await asyncio.sleep(settings.admission_disconnect_poll_seconds)
+
+
+async def _admitted(http_request: Request, priority: int, handler) -> Any:
+    """
+    Run a handler under admission control.
+
+    Sheds with 503 + Retry-After when the wait queue is full or the wait
+    times out, and cancels the handler (queued or running) if the client
+    disconnects first.
+    """
+    controller = get_admission_controller()
+    work = asyncio.ensure_future(controller.run(priority, handler))
+    watcher = asyncio.ensure_future(_wait_for_disconnect(http_request))
+
+    try:
+        await asyncio.wait({work, watcher}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        watcher.cancel()
+
+    if not work.done():
+        work.cancel()
+        await asyncio.wait({work})
+        controller.record_cancelled()
+        logger.info("Client disconnected - request cancelled")
+        raise HTTPException(status_code=499, detail="Client closed request")
+
+    try:
+        return work.result()
+    except Overloaded as e:
+        logger.warning(f"Request shed ({e.reason})")
+        raise HTTPException(
+            status_code=503,
+            detail="Server busy, please retry",
+            headers={"Retry-After": str(e.retry_after)}
+        )
+
+
 @router.post("/chat", response_model=ChatResponse)
-async def chat(request: ChatRequest):
+async def chat(request: ChatRequest, http_request: Request):
+    """Process a chat query (admission-controlled; scoped queries first)"""
+    return await _handle_chat(request, http_request)
+
+
+@router.get("/chat", response_model=ChatResponse)
+async def chat_get(
+    http_request: Request,
+    q: str = Query(..., min_length=1, max_length=500, description="Question"),
+    chapter: Optional[str] = Query(None, max_length=100, description="Scope to specific chapter")
+):
+    """
+    Cacheable, session-less form of POST /chat for standalone questions.
+
+    Requests are redirected (308) to the canonical URL - question trimmed
+    with whitespace collapsed, lowercase chapter, no other parameters - so
+    a CDN keeps one entry per question. Responses carry a strong ETag derived from the
+    answer and the index version, and Cache-Control allowing shared caches
+    to serve them (stale while revalidating). If-None-Match revalidations
+    of an answer still in the answer cache get 304 without admission or
+    the pipeline; others get 304 when the fresh answer still matches.
+    """
+    # Lossless: the question is answered as asked (the answer cache
+    # normalizes further for its own key)
+    query = " ".join(q.split())
+    if not normalize_query(query):
+        raise HTTPException(status_code=422, detail="Question has no words")
+    chapter = (chapter or "").strip().lower() or None
+
+    canonical = urlencode({"q": query, **({"chapter": chapter} if chapter else {})})
+    if http_request.url.query != canonical:
+        return RedirectResponse(
+            f"{http_request.url.path}?{canonical}",
+            status_code=308,
+            headers={"Cache-Control": _chat_cache_control(degraded=False)}
+        )
+
+    if_none_match = http_request.headers.get("if-none-match")
+    answer_cache = get_answer_cache()
+
+    # Revalidation of a cached answer: 304 without admission or the pipeline
+    if if_none_match and (query, chapter) in answer_cache:
+        cached = await asyncio.to_thread(answer_cache.get, query, chapter)
+        if cached:
+            etag = await _answer_etag(cached["response"], cached["sources"], True)
+            if _etag_matches(if_none_match, etag):
+                return Response(
+                    status_code=304,
+                    headers={"ETag": etag, "Cache-Control": _chat_cache_control(degraded=False)}
+                )
+
+    response = await _handle_chat(ChatRequest(query=query, chapter_filter=chapter), http_request, remember=False)
+    body = response.model_dump()
+    body["session_id"] = None
+    headers = {
+        "ETag": await _answer_etag(response.response, response.sources, response.grounded),
+        "Cache-Control": _chat_cache_control(degraded=response.answer_mode in (None, "extractive"))
+    }
+
+    if _etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(body, headers=headers)
+
+
+async def _answer_etag(response: str, sources: List[str], grounded: bool) -> str:
+    """
+    Strong ETag of an answer under the current index version; the same
+    answer gets the same tag whether generated or served from the cache
+    """
+    index_version = await asyncio.to_thread(get_metadata_service().get_index_version) or ""
+    digest = hashlib.blake2b(
+        json.dumps([index_version, response, sources, grounded], ensure_ascii=False).encode("utf-8"),
+        digest_size=16
+    ).hexdigest()
+    return f'"{digest}"'
+
+
+def _chat_cache_control(degraded: bool) -> str:
+    """
+    Cache-Control for GET /chat. Extractive answers (given under load) and
+    refusals (possibly a retrieval timeout) are kept only briefly at the edge.
+    """
+    if degraded:
+        return f"public, max-age=0, s-maxage={settings.chat_get_degraded_s_maxage}"
+    return (
+        f"public, max-age={settings.chat_get_max_age}, s-maxage={settings.chat_get_s_maxage}, "
+        f"stale-while-revalidate={settings.chat_get_stale_while_revalidate}"
+    )
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match check (weak comparison, as RFC 9110 specifies for it)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+
+
+async def _handle_chat(request: ChatRequest, http_request: Request, remember: bool = True) -> ChatResponse:
+    """Run a chat query under admission control, with sampling and query logging"""
+    priority = PRIORITY_SCOPED if request.selected_text else PRIORITY_GLOBAL
+    usage_endpoint_var.set("chat")
+    profiler = get_request_profiler()
+    start = time.perf_counter()
+    if profiler.sample_percent and profiler.should_sample():
+        with profiler:
+            response = await _admitted(http_request, priority, lambda: _chat(request, remember))
+    else:
+        response = await _admitted(http_request, priority, lambda: _chat(request, remember))
+
+    # Standalone questions feed the cache warmer
+    if not request.selected_text:
+        get_query_log_service().record(
+            session_id=response.session_id or "",
+            query=request.query,
+            response=response.response,
+            sources=response.sources,
+            response_time_ms=(time.perf_counter() - start) * 1000,
+            cache_hit=response.answer_mode in ("cached", "precomputed"),
+            client_ip=http_request.client.host if http_request.client else None,
+            chapter_filter=request.chapter_filter
+        )
+    return response
+
+
+async def _chat(request: ChatRequest, remember: bool = True) -> ChatResponse:
     """
     Process a chat query with RAG retrieval.
+
+    Blocking stages run in worker threads. For scoped queries the grounding
+    context is the selection itself, so with speculative generation on, a
+    selection that appears verbatim in the book starts its LLM call while
+    the selection match runs (a running call cannot be cancelled, so
+    selections likely to be refused never speculate).
+    Selections sent with their page location skip that search and are
+    matched from the anchor index. With `remember` off the turn is not
+    stored in the session.
     """
     retrieval_service = get_retrieval_service()
     llm_service = get_llm_service()
+    session_service = get_session_service()
 
     try:
+        # Session stores may be Redis (blocking client), so they run in worker threads
+        session = await asyncio.to_thread(session_service.get_or_create, request.session_id)
+
+        async def record_turn(response: str, chunks: List[dict]):
+            if remember:
+                await asyncio.to_thread(session_service.record_turn, session, request.query, response, chunks)
+        extractive = _answers_extractively(request)
+        answer_mode = "extractive" if extractive else "generative"
+
         # Scoped query: user selected specific text
         if request.selected_text:
-            matched_chunk = retrieval_service.retrieve_by_selection(
-                selected_text=request.selected_text
-            )
+            # Known location: resolve the chunk from the anchor index
+            matched_chunk = None
+            if request.selection_anchor:
+                location = request.selection_anchor
+                matched_chunk = get_anchor_service().resolve(
+                    request.selected_text, location.chapter, location.anchor, location.start, location.end
+                )
 
+            # Otherwise (or when the anchor is stale) find it by vector search
+            answer_task = None
             if not matched_chunk:
+                match_task = asyncio.ensure_future(_race_retrieval(
+                    retrieval_service.retrieve_by_selection,
+                    selected_text=request.selected_text
+                ))
+
+                speculate = (
+                    settings.chat_speculative_generation
+                    and not extractive
+                    and await asyncio.to_thread(get_provenance_service().contains, request.selected_text)
+                )
+                if speculate:
+                    system_prompt = llm_service.render_system_prompt(
+                        llm_service.build_context([], selected_text=request.selected_text)
+                    )
+                    answer_task = asyncio.ensure_future(asyncio.to_thread(
+                        llm_service.complete, system_prompt, request.query, request.chapter_filter
+                    ))
+
+                matched_chunk = await match_task
+
+            if not matched_chunk:
+                if answer_task:
+                    answer_task.cancel()
                 return ChatResponse(
                     response=REFUSAL_NO_CONTENT,
                     sources=[],
-                    grounded=False
+                    grounded=False,
+                    session_id=session.session_id
                 )
 
-            response = llm_service.generate_grounded_response(
-                query=request.query,
-                retrieved_chunks=[matched_chunk],
-                selected_text=request.selected_text
-            )
+            if answer_task:
+                response = await answer_task
+            elif extractive:
+                response = await asyncio.to_thread(
+                    llm_service.extractive_response,
+                    request.query,
+                    [matched_chunk],
+                    request.selected_text
+                )
+            else:
+                response = await asyncio.to_thread(
+                    llm_service.generate_grounded_response,
+                    query=request.query,
+                    retrieved_chunks=[matched_chunk],
+                    selected_text=request.selected_text
+                )
+
+            await record_turn(response, [matched_chunk])
 
             return ChatResponse(
                 response=response,
                 sources=[matched_chunk["chapter"]],
-                grounded=True
+                grounded=True,
+                session_id=session.session_id,
+                answer_mode=answer_mode
             )
 
+        # Follow-ups reuse chunks from earlier turns when they cover the new
+        # terms; otherwise search with the previous question as context
+        retrieved_chunks = None
+        search_query = request.query
+        standalone = not session_service.is_followup(session, request.query)
+        if not standalone:
+            retrieved_chunks = await asyncio.to_thread(
+                session_service.cached_chunks_for, session, request.query, request.chapter_filter
+            )
+            search_query = session_service.followup_query(session, request.query)
+        else:
+            # Repeated questions are answered from the answer cache
+            cached = None
+            if request.answer_mode != "extractive":
+                cached = await asyncio.to_thread(get_answer_cache().get, request.query, request.chapter_filter)
+            if cached:
+                await record_turn(cached["response"], cached["chunks"])
+                return ChatResponse(
+                    response=cached["response"],
+                    sources=cached["sources"],
+                    grounded=True,
+                    session_id=session.session_id,
+                    answer_mode="cached"
+                )
+
+            # Standalone questions close to an anticipated one are answered
+            # from the offline job without retrieval or an LLM call (matched
+            # more loosely once the token budget rules out the LLM)
+            threshold = None
+            if not get_usage_tracker().plan().allows_llm:
+                threshold = settings.precomputed_answer_degraded_threshold
+            precomputed = await asyncio.to_thread(
+                get_precomputed_answer_service().lookup,
+                request.query,
+                request.chapter_filter,
+                threshold
+            )
+            if precomputed:
+                await record_turn(precomputed["response"], precomputed["chunks"])
+                return ChatResponse(
+                    response=precomputed["response"],
+                    sources=precomputed["sources"],
+                    grounded=True,
+                    session_id=session.session_id,
+                    answer_mode="precomputed"
+                )
+
         # Global or chapter-scoped retrieval
-        retrieved_chunks = retrieval_service.retrieve(
-            query=request.query,
-            top_k=3,
-            chapter_filter=request.chapter_filter
-        )
+        if not retrieved_chunks:
+            retrieved_chunks = await _race_retrieval(
+                retrieval_service.retrieve,
+                query=search_query,
+                top_k=3,
+                chapter_filter=request.chapter_filter
+            )
 
         if not retrieved_chunks:
             return ChatResponse(
                 response=REFUSAL_NO_CONTENT,
                 sources=[],
-                grounded=False
+                grounded=False,
+                session_id=session.session_id
             )
 
-        response = llm_service.generate_grounded_response(
-            query=request.query,
-            retrieved_chunks=retrieved_chunks
-        )
+        history = session_service.history_prompt(session)
+        if extractive:
+            response = await asyncio.to_thread(
+                llm_service.extractive_response, request.query, retrieved_chunks
+            )
+        else:
+            response = await asyncio.to_thread(
+                llm_service.generate_grounded_response,
+                query=request.query,
+                retrieved_chunks=retrieved_chunks,
+                history=history
+            )
+        await record_turn(response, retrieved_chunks)
+
+        # Extract unique sources (best match first)
+        sources = list(dict.fromkeys(chunk["chapter"] for chunk in retrieved_chunks))
 
-        # Extract unique sources
-        sources = list(set(chunk["chapter"] for chunk in retrieved_chunks))
+        # Answers shaped by this user's conversation are not shared
+        if standalone and not extractive and not history and response != REFUSAL_NO_CONTENT:
+            get_answer_cache().put(request.query, request.chapter_filter, response, sources, retrieved_chunks)
 
         return ChatResponse(
             response=response,
             sources=sources,
-            grounded=True
+            grounded=True,
+            session_id=session.session_id,
+            answer_mode=answer_mode
         )
 
     except Exception as e:
@@ -116,30 +497,45 @@ async def chat(request: ChatRequest):
 
 
 @router.post("/translate", response_model=TranslateResponse)
-async def translate(request: TranslateRequest):
+async def translate(request: TranslateRequest, http_request: Request):
+    """Translate content (admission-controlled)"""
+    usage_endpoint_var.set("translate")
+    return await _admitted(http_request, PRIORITY_GLOBAL, lambda: _translate(request))
+
+
+async def _translation_allowed(request: TranslateRequest) -> bool:
+    """
+    Validate content exists in our index (prevent arbitrary translation).
+    Exact fingerprint match first; vector search only for fuzzy matches.
+    """
+    if not request.source_chapter:
+        return True
+    if await asyncio.to_thread(get_provenance_service().contains, request.content):
+        return True
+    matched = await asyncio.to_thread(
+        get_retrieval_service().retrieve_by_selection,
+        selected_text=request.content,
+        score_threshold=0.8
+    )
+    return bool(matched)
+
+
+async def _translate(request: TranslateRequest) -> TranslateResponse:
     """
     Translate retrieved content to Pashto or Dari.
     """
-    retrieval_service = get_retrieval_service()
-    llm_service = get_llm_service()
-
     try:
-        # Validate content exists in our index (prevent arbitrary translation)
-        if request.source_chapter:
-            matched = retrieval_service.retrieve_by_selection(
-                selected_text=request.content,
-                score_threshold=0.8
+        if not await _translation_allowed(request):
+            return TranslateResponse(
+                original=request.content,
+                translated=REFUSAL_NO_TRANSLATION,
+                target_language=request.target_language
             )
-            if not matched:
-                return TranslateResponse(
-                    original=request.content,
-                    translated=REFUSAL_NO_TRANSLATION,
-                    target_language=request.target_language
-                )
 
-        translated = llm_service.translate_content(
-            content=request.content,
-            target_language=request.target_language
+        translated = await get_translation_service().translate(
+            request.content,
+            request.target_language,
+            chapter=request.source_chapter
         )
 
         return TranslateResponse(
@@ -153,20 +549,116 @@ async def translate(request: TranslateRequest):
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+@router.post("/translate/stream")
+async def translate_stream(request: TranslateRequest):
+    """
+    Translate content, streaming it in order as NDJSON lines:
+    {"type": "segment", "text": ...} per piece, then {"type": "done"} or,
+    when the translation is refused, {"type": "refused", "translated": ...}.
+
+    Holds an admission slot until the stream ends.
+    """
+    usage_endpoint_var.set("translate")
+    controller = get_admission_controller()
+    try:
+        await controller.acquire(PRIORITY_GLOBAL)
+    except Overloaded as e:
+        logger.warning(f"Request shed ({e.reason})")
+        raise HTTPException(
+            status_code=503,
+            detail="Server busy, please retry",
+            headers={"Retry-After": str(e.retry_after)}
+        )
+
+    released = False
+
+    def release():
+        nonlocal released
+        if not released:
+            released = True
+            controller.release()
+
+    def line(event: dict) -> str:
+        return json.dumps(event, ensure_ascii=False) + "\n"
+
+    async def events():
+        service = get_translation_service()
+        try:
+            early = service.precheck(request.content, request.target_language)
+            if early is None and not await _translation_allowed(request):
+                early = REFUSAL_NO_TRANSLATION
+            if early == REFUSAL_NO_TRANSLATION:
+                yield line({"type": "refused", "translated": early})
+                return
+            if early is not None:
+                # Demo notice
+                yield line({"type": "segment", "text": early})
+                yield line({"type": "done"})
+                return
+
+            try:
+                async for piece in service.translate_stream(
+                    request.content, request.target_language, chapter=request.source_chapter
+                ):
+                    yield line({"type": "segment", "text": piece})
+            except TranslationFailed as e:
+                logger.error(f"Translation failed: {e}")
+                yield line({"type": "refused", "translated": REFUSAL_NO_TRANSLATION})
+                return
+            yield line({"type": "done"})
+        finally:
+            release()
+
+    return StreamingResponse(
+        events(),
+        media_type="application/x-ndjson",
+        background=BackgroundTask(release)
+    )
+
+
+@router.get("/chunks/locate")
+async def locate_chunk(chapter: str, anchor: str = "", start: Optional[int] = None, end: Optional[int] = None):
+    """Chunks under a heading anchor, those overlapping [start, end) first"""
+    chunks = get_anchor_service().locate(chapter, anchor, start, end)
+    if not chunks:
+        raise HTTPException(status_code=404, detail="Unknown chapter or anchor")
+    return {"chunks": chunks}
+
+
 @router.get("/status")
 async def status():
-    """Get RAG system status"""
-    retrieval_service = get_retrieval_service()
-    llm_service = get_llm_service()
-
+    """Get RAG system status (from the cached health snapshot)"""
     try:
-        collection_info = retrieval_service.get_collection_info()
+        snapshot = get_health_monitor().snapshot()
+        qdrant = snapshot["qdrant"]
+        breakers = breaker_stats()
+        operational = get_health_monitor().is_ready() and all(
+            breaker["state"] == "closed" for breaker in breakers.values()
+        )
         return {
-            "status": "operational",
-            "qdrant_configured": retrieval_service.is_available,
-            "groq_configured": llm_service.is_available,
-            "collection": collection_info,
-            "embedding_model": "all-MiniLM-L6-v2"
+            "status": "operational" if operational else "degraded",
+            "qdrant_configured": settings.is_qdrant_configured,
+            "groq_configured": snapshot["llm"]["status"] != "not_configured",
+            "collection": {
+                "name": settings.qdrant_collection_name,
+                "serving": qdrant.get("serving"),
+                "points_count": qdrant.get("points_count"),
+                "status": "ready" if qdrant["status"] == "up" else qdrant["status"],
+                "cache": get_retrieval_service()._cache.stats()
+            },
+            "embedding_model": EMBEDDING_MODEL,
+            "rerank": get_rerank_service().stats() if settings.rerank_enabled else {"enabled": False},
+            "precomputed_answers": get_precomputed_answer_service().stats(),
+            "cache_warming": get_cache_warmer().stats(),
+            "query_log": get_query_log_service().stats(),
+            "extractive": get_extractive_service().stats(),
+            "translation": get_translation_service().stats(),
+            "anchors": get_anchor_service().stats(),
+            "admission": get_admission_controller().stats(),
+            "circuit_breakers": breakers,
+            "token_usage": get_usage_tracker().stats(),
+            "startup": startup_timeline.report(),
+            "snapshot_age_seconds": get_health_monitor().age_seconds
         }
     except Exception as e:
         logger.error(f"Status check failed: {e}")
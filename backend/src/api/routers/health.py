@@ -1,11 +1,14 @@
 """
 Health Check Router
-Service health status endpoint
+Service health, liveness and readiness endpoints (served from a cached snapshot)
 """
 
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
 from datetime import datetime
 
+from ...services.health import get_health_monitor
+
 router = APIRouter()
 
 
@@ -15,16 +18,50 @@ async def health_check():
     Health check endpoint
 
     Returns:
-        Service status and timestamp
+        Service status, timestamp and the latest background probe results
     """
+    monitor = get_health_monitor()
     return {
         "status": "healthy",
         "service": "Physical AI Textbook API",
         "version": "1.0.0",
         "timestamp": datetime.utcnow().isoformat(),
+        "snapshot_age_seconds": monitor.age_seconds,
         "components": {
-            "api": "operational",
-            "database": "pending",  # Will check Qdrant/Neon when implemented
-            "cache": "pending",      # Will check Redis when implemented
+            "api": {"status": "up"},
+            **monitor.snapshot()
         }
     }
+
+
+@router.get("/health/live")
+async def liveness():
+    """
+    Liveness probe
+
+    Returns:
+        200 as long as the process can serve requests (no dependency checks)
+    """
+    return {"status": "alive"}
+
+
+@router.get("/health/ready")
+async def readiness():
+    """
+    Readiness probe
+
+    Returns:
+        200 when required dependencies were up at the last probe, 503 otherwise
+    """
+    monitor = get_health_monitor()
+    ready = monitor.is_ready()
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={
+            "status": "ready" if ready else "not_ready",
+            "snapshot_age_seconds": monitor.age_seconds,
+            "components": {
+                name: state["status"] for name, state in monitor.snapshot().items()
+            }
+        }
+    )
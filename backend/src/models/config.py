@@ -14,11 +14,35 @@ class Settings(BaseSettings):
     # Application
     environment: str = "development"
     log_level: str = "INFO"
+    log_sample_rates: str = ""  # e.g. "src.services.retrieval=0.1,httpx=0.01" (below WARNING only)
 
     # Qdrant Vector Database (optional for dev mode)
     qdrant_url: Optional[str] = None
     qdrant_api_key: Optional[str] = None
-    qdrant_collection_name: str = "robotics-textbook-v1"
+    qdrant_collection_name: str = "robotics-textbook"
+
+    # Qdrant collection schema (applied on startup; existing collections are migrated)
+    qdrant_payload_indexes: Union[str, List[str]] = "chapter,section,section_id,level,duplicate_chapters"  # Keyword indexes
+    qdrant_hnsw_m: int = 16
+    qdrant_hnsw_ef_construct: int = 100
+    qdrant_search_ef: int = 64  # hnsw_ef at query time
+    qdrant_quantization: str = "int8"  # int8 | none
+    qdrant_quantization_always_ram: bool = True  # Keep quantized vectors in RAM
+    qdrant_rescore: bool = True  # Rescore quantized hits with original vectors
+    qdrant_oversampling: float = 2.0
+    qdrant_vectors_on_disk: bool = False  # Original vectors on disk (mmap)
+    qdrant_hnsw_on_disk: bool = False
+    qdrant_payload_on_disk: bool = True
+
+    # Blue/green re-indexing (qdrant_collection_name is an alias over "{name}-vN")
+    qdrant_keep_versions: int = 2  # Live version plus one for rollback
+    index_smoke_min_score: float = 0.3  # Smoke queries must score at least this on a new build
+
+    # Portable index artifact (scripts/index_artifact.py)
+    index_artifact_on_ingest: bool = True  # Snapshot every validated build
+    index_artifact_path: Optional[str] = None  # Defaults to backend/data/index_artifact.tar
+    index_artifact_url: Optional[str] = None  # Release asset fetched at deploy (.github/workflows/index-artifact.yml)
+    index_restore_batch_size: int = 256  # Points per upload request
 
     # Neon PostgreSQL (optional for dev mode)
     neon_database_url: Optional[str] = None
@@ -28,6 +52,25 @@ class Settings(BaseSettings):
     groq_model: str = "llama-3.3-70b-versatile"
     groq_max_tokens: int = 500
 
+    # LLM Provider: groq | openai (any OpenAI-compatible server) | fake (offline load tests)
+    llm_provider: str = "groq"
+    llm_model: Optional[str] = None  # Defaults to groq_model
+    llm_base_url: Optional[str] = None  # e.g. http://localhost:8080/v1 for llm_provider=openai
+    llm_api_key: Optional[str] = None
+    llm_timeout_seconds: float = 30.0
+    fake_llm_latency_ms: float = 200.0
+    fake_llm_jitter_ms: float = 0.0
+    fake_llm_seed: int = 0
+
+    # Token Budgets (rolling; 0 = unlimited) and degradation points (share of budget used)
+    token_budget_per_minute: int = 6000
+    token_budget_per_day: int = 100000
+    token_budget_short_at: float = 0.7  # Cap max_tokens at degraded_max_tokens
+    token_budget_small_model_at: float = 0.85  # Switch to llm_small_model
+    token_budget_no_llm_at: float = 0.95  # Precomputed/extractive answers only
+    degraded_max_tokens: int = 200
+    llm_small_model: Optional[str] = "llama-3.1-8b-instant"  # Empty to skip this step
+
     # Redis Cache
     redis_url: str = "redis://localhost:6379"
     cache_ttl_seconds: int = 900  # 15 minutes
@@ -42,6 +85,20 @@ class Settings(BaseSettings):
             return [origin.strip() for origin in v.split(',')]
         return v
 
+    @field_validator('qdrant_payload_indexes', mode='before')
+    @classmethod
+    def parse_payload_indexes(cls, v):
+        if isinstance(v, str):
+            return [field.strip() for field in v.split(',') if field.strip()]
+        return v
+
+    @field_validator('translation_keep_terms', mode='before')
+    @classmethod
+    def parse_keep_terms(cls, v):
+        if isinstance(v, str):
+            return [term.strip() for term in v.split(',') if term.strip()]
+        return v
+
     # Rate Limiting
     rate_limit_per_minute: int = 10
 
@@ -50,6 +107,128 @@ class Settings(BaseSettings):
     neon_storage_limit_gb: float = 0.5
     groq_rate_limit_per_min: int = 30
 
+    # Admission Control (chat/translate)
+    admission_max_inflight: int = 8  # Concurrent LLM-bound requests
+    admission_max_queue: int = 32  # Requests allowed to wait for a slot
+    admission_queue_timeout_seconds: float = 10.0  # Max wait before shedding
+    admission_retry_after_seconds: int = 5  # Retry-After sent with 503s
+    admission_disconnect_poll_seconds: float = 0.25
+
+    # Circuit Breakers (Qdrant, LLM)
+    breaker_window_size: int = 20  # Recent calls scored per dependency
+    breaker_min_calls: int = 5  # Calls needed before the breaker can open
+    breaker_failure_rate: float = 0.5  # Share of failed/slow calls that opens it
+    breaker_open_seconds: float = 30.0  # Fail-fast period before a half-open probe
+    breaker_llm_slow_seconds: float = 20.0  # LLM calls slower than this count as failures
+
+    # Admin Diagnostics (/api/admin/*; disabled while admin_token is unset)
+    admin_token: Optional[str] = None  # Sent as "Authorization: Bearer <token>"
+    profiler_sample_percent: float = 0.0  # Share of /api/chat calls stack-sampled at startup
+    profiler_interval_ms: float = 5.0  # Stack sampling interval while a sampled call runs
+    tracemalloc_frames: int = 10  # Traceback depth recorded per allocation
+    tracemalloc_max_snapshots: int = 8  # Snapshots kept for diffs (oldest dropped)
+
+    # Cold Start
+    warm_up_embedding_model: bool = True  # Load the model in the background at startup
+    startup_profile: bool = False  # Log the startup timeline once warm (see scripts/profile_startup.py)
+
+    # Health Monitor
+    health_probe_interval_seconds: float = 30.0
+    health_probe_timeout_seconds: float = 5.0
+
+    # Embedding Cache
+    embedding_cache_size: int = 2048  # Recent query embeddings kept in memory
+
+    # Retrieval Result Cache
+    retrieval_cache_size: int = 1024  # Max cached searches (LRU)
+    retrieval_cache_fetch_limit: int = 10  # Widest limit fetched per search
+    retrieval_cache_min_score: float = 0.3  # Lowest threshold fetched per search
+    retrieval_cache_precision: int = 4  # Decimals kept when hashing query vectors
+    index_version_check_seconds: float = 30.0  # How often to poll metadata.index_version
+
+    # Hierarchical Retrieval (section/chapter summaries written at ingest)
+    retrieval_mode: str = "flat"  # flat | hierarchical (summaries first, then their chunks; no measured latency win yet)
+    hierarchical_top_chapters: int = 3  # Chapters kept by the first stage (0 = skip)
+    hierarchical_top_sections: int = 8  # Sections whose chunks are searched
+
+    # Near-Duplicate Detection (MinHash/LSH over chunks at ingest)
+    dedup_mode: str = "off"  # off | tag (cluster ids, one hit per cluster; over-fetches) | merge (index one chunk per cluster)
+    dedup_threshold: float = 0.8  # Estimated Jaccard similarity of word shingles
+    dedup_num_perm: int = 128  # MinHash slots per signature
+    dedup_bands: int = 16  # LSH bands (num_perm / bands rows each)
+    dedup_shingle_size: int = 5  # Words per shingle
+    dedup_overfetch: int = 3  # Chunk searches fetch limit x this before collapsing clusters
+
+    # Answer Cache (generated answers to standalone questions)
+    answer_cache_size: int = 1024  # 0 disables
+    answer_cache_report_requests: int = 100  # First N lookups after startup reported as the warm hit ratio
+
+    # Query Logs (Neon query_logs, written in the background)
+    query_log_enabled: bool = True
+    query_log_queue_size: int = 1000  # Records waiting for the writer before new ones are dropped
+    query_log_ip_secret: Optional[str] = None  # HMAC key for user_ip_hash (random per process if unset)
+
+    # Cache Warming (hot questions mined from query_logs)
+    cache_warm_on_startup: bool = True
+    cache_warm_interval_minutes: float = 0.0  # Re-warm period (0 = startup only)
+    cache_warm_window_hours: float = 168.0  # How far back to mine
+    cache_warm_per_chapter: int = 10  # Most asked questions kept per chapter
+    cache_warm_min_count: int = 2  # Ignore questions asked fewer times
+    cache_warm_concurrency: int = 4
+    cache_warm_rate_share: float = 0.5  # Share of groq_rate_limit_per_min the warmer may use
+
+    # Reranking (cross-encoder over the vector top-N)
+    rerank_enabled: bool = False
+    rerank_model: str = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+    rerank_candidates: int = 10  # Over-fetch this many chunks before reranking
+    rerank_budget_ms: float = 150.0  # Fall back to vector order past this
+    rerank_cache_size: int = 4096  # Cached (query, chunk) pair scores
+
+    # Chat Pipeline
+    qdrant_search_timeout_seconds: float = 3.0  # Retrieval race timeout before refusing
+    chat_speculative_generation: bool = False  # Start the LLM call while the selection match runs (verbatim selections only)
+
+    # Edge Caching (GET /api/chat responses)
+    chat_get_max_age: int = 300  # Browser cache lifetime
+    chat_get_s_maxage: int = 3600  # CDN cache lifetime
+    chat_get_stale_while_revalidate: int = 86400  # CDN may serve stale this long while refetching
+    chat_get_degraded_s_maxage: int = 30  # CDN lifetime of extractive answers and refusals
+
+    # Conversation Sessions
+    session_backend: str = "memory"  # memory | redis (uses redis_url)
+    session_ttl_seconds: int = 1800
+    session_max_sessions: int = 10000  # LRU bound for the memory backend
+    session_max_turns: int = 6
+    session_history_token_budget: int = 300  # Older turns are folded into a summary past this
+    session_max_chunks: int = 12  # Retrieved chunk ids remembered per session
+    session_chunk_cache_size: int = 2048  # Chunk contents shared by all sessions (LRU)
+    session_reuse_chunks: int = 3  # Chunks reused for a follow-up instead of re-searching
+
+    # Precomputed Answers (scripts/precompute_answers.py)
+    precomputed_answers_enabled: bool = True
+    precomputed_answers_path: Optional[str] = None  # Defaults to backend/data/precomputed_answers.json
+    precomputed_answer_threshold: float = 0.92  # Min cosine similarity to serve a stored answer
+    precomputed_answer_degraded_threshold: float = 0.85  # Used instead when the LLM is off-budget
+
+    # Anchor Index (selection lookup by chapter + heading anchor)
+    anchor_index_path: Optional[str] = None  # Defaults to backend/data/chunk_anchors.json
+
+    # Extractive Answers (no-LLM fast path; sentence index written by ingest)
+    extractive_max_sentences: int = 3
+    extractive_auto_queue_depth: int = 4  # Auto mode answers extractively at this admission queue depth (0 = never)
+    extractive_cache_size: int = 512  # Chunks embedded on demand when missing from the sentence index
+    sentence_index_path: Optional[str] = None  # Defaults to backend/data/sentence_index.npz
+
+    # Translation (segmented, concurrent, cached per segment)
+    translation_concurrency: int = 4  # Segments of one request translated at once
+    translation_segment_max_chars: int = 800  # Paragraphs are packed up to this; longer ones split between sentences
+    translation_cache_size: int = 2048  # Translated segments kept (LRU)
+    translation_keep_terms: Union[str, List[str]] = ""  # Extra terms left untranslated (comma-separated)
+
+    # Provenance Index (translation source verification)
+    provenance_index_path: Optional[str] = None  # Defaults to backend/data/provenance_index.json
+    provenance_shingle_size: int = 8  # Words per fingerprinted shingle
+
     class Config:
         env_file = ".env"
         case_sensitive = False
@@ -62,6 +241,10 @@ class Settings(BaseSettings):
     def is_groq_configured(self) -> bool:
         return bool(self.groq_api_key)
 
+    @property
+    def is_neon_configured(self) -> bool:
+        return bool(self.neon_database_url)
+
 
 # Global settings instance
 settings = Settings()
@@ -3,5 +3,39 @@
 from .embedding import get_embedding_service
 from .retrieval import get_retrieval_service
 from .llm import get_llm_service
+from .metadata import get_metadata_service
+from .provenance import get_provenance_service
+from .session import get_session_service
+from .rerank import get_rerank_service
+from .health import get_health_monitor
+from .answers import get_precomputed_answer_service, get_answer_cache
+from .admission import get_admission_controller
+from .usage import get_usage_tracker
+from .extractive import get_extractive_service
+from .anchors import get_anchor_service
+from .diagnostics import get_request_profiler, get_memory_snapshots
+from .query_log import get_query_log_service
+from .cache_warmer import get_cache_warmer
+from .translation import get_translation_service
 
-__all__ = ["get_embedding_service", "get_retrieval_service", "get_llm_service"]
+__all__ = [
+    "get_embedding_service",
+    "get_retrieval_service",
+    "get_llm_service",
+    "get_metadata_service",
+    "get_provenance_service",
+    "get_session_service",
+    "get_rerank_service",
+    "get_health_monitor",
+    "get_precomputed_answer_service",
+    "get_answer_cache",
+    "get_admission_controller",
+    "get_usage_tracker",
+    "get_extractive_service",
+    "get_anchor_service",
+    "get_request_profiler",
+    "get_memory_snapshots",
+    "get_query_log_service",
+    "get_cache_warmer",
+    "get_translation_service",
+]
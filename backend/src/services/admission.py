@@ -0,0 +1,140 @@
+"""
+Admission Control
+Bounded in-flight work with a priority wait queue and load shedding
+"""
+
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+from collections import deque
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+
+from ..models.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Lower values are admitted first
+PRIORITY_SCOPED = 0  # selected_text queries
+PRIORITY_GLOBAL = 1  # global/chapter queries and translations
+
+
+class Overloaded(Exception):
+    """Request shed because the wait queue is full or the wait timed out"""
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Limits concurrent LLM-bound requests to settings.admission_max_inflight.
+
+    Excess requests wait in a priority queue (scoped before global, FIFO
+    within a priority) for up to settings.admission_queue_timeout_seconds;
+    when settings.admission_max_queue requests are already waiting, new ones
+    are rejected immediately.
+    """
+
+    _instance = None
+    _inflight: int = 0
+    _waiters: List[Tuple[int, int, asyncio.Future]] = []
+    _sequence = None
+    _wait_times = None
+    _counters: Dict[str, int] = {}
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._waiters = []
+            cls._instance._sequence = itertools.count()
+            cls._instance._wait_times = deque(maxlen=1000)
+            cls._instance._counters = {
+                "admitted": 0,
+                "queued": 0,
+                "shed_queue_full": 0,
+                "shed_timeout": 0,
+                "cancelled": 0
+            }
+        return cls._instance
+
+    async def acquire(self, priority: int = PRIORITY_GLOBAL):
+        """Wait for an in-flight slot; raises Overloaded when shedding"""
+        if self._inflight < settings.admission_max_inflight and not self._waiters:
+            self._inflight += 1
+            self._counters["admitted"] += 1
+            self._wait_times.append(0.0)
+            return
+
+        if len(self._waiters) >= settings.admission_max_queue:
+            self._counters["shed_queue_full"] += 1
+            raise Overloaded("queue full", settings.admission_retry_after_seconds)
+
+        future = asyncio.get_running_loop().create_future()
+        entry = (priority, next(self._sequence), future)
+        heapq.heappush(self._waiters, entry)
+        self._counters["queued"] += 1
+        start = time.perf_counter()
+
+        try:
+            await asyncio.wait_for(asyncio.shield(future), timeout=settings.admission_queue_timeout_seconds)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if future.done() and not future.cancelled():
+                # Slot was handed over as we gave up - pass it on
+                self.release()
+            else:
+                future.cancel()
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+            if isinstance(e, asyncio.TimeoutError):
+                self._counters["shed_timeout"] += 1
+                raise Overloaded("queue wait timeout", settings.admission_retry_after_seconds)
+            raise
+
+        self._counters["admitted"] += 1
+        self._wait_times.append(time.perf_counter() - start)
+
+    def release(self):
+        """Free a slot, handing it straight to the highest-priority waiter"""
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(True)
+                return
+        self._inflight -= 1
+
+    async def run(self, priority: int, handler: Callable[[], Awaitable[Any]]) -> Any:
+        """Run handler() once admitted, releasing the slot when it finishes or is cancelled"""
+        await self.acquire(priority)
+        try:
+            return await handler()
+        finally:
+            self.release()
+
+    def record_cancelled(self):
+        """Count a request abandoned because the client disconnected"""
+        self._counters["cancelled"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Current load and shedding counters"""
+        samples = sorted(self._wait_times)
+        wait = {}
+        if samples:
+            for p in (50, 99):
+                wait[f"p{p}_ms"] = round(samples[min(len(samples) - 1, len(samples) * p // 100)] * 1000, 2)
+        return {
+            "inflight": self._inflight,
+            "max_inflight": settings.admission_max_inflight,
+            "queue_depth": len(self._waiters),
+            "max_queue": settings.admission_max_queue,
+            "queue_wait": wait,
+            **self._counters
+        }
+
+
+def get_admission_controller() -> AdmissionController:
+    """Get or create admission controller instance"""
+    return AdmissionController()
@@ -0,0 +1,225 @@
+"""
+Anchor Index Service
+Resolves a selection's (chapter, heading anchor, offset range) to the chunk it
+came from without embedding it
+"""
+
+from typing import Any, Dict, List, Optional
+from pathlib import Path
+import json
+import logging
+import re
+
+from ..models.config import settings
+from .provenance import normalize_words
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ANCHOR_INDEX_PATH = Path(__file__).parent.parent.parent / "data" / "chunk_anchors.json"
+ANCHOR_INDEX_FORMAT_VERSION = 1
+
+_EXPLICIT_ID = re.compile(r"\s*\{#([^}]+)\}\s*$")
+_LINK = re.compile(r"\[([^\]]*)\]\([^)]*\)")
+_SLUG_DROP = re.compile(r"[^\w\- ]")
+
+
+def heading_anchor(title: str) -> str:
+    """
+    Anchor id the docs site gives a heading (github-slugger rules, or an
+    explicit `{#id}`); duplicates within a page are suffixed by the caller.
+    """
+    explicit = _EXPLICIT_ID.search(title)
+    if explicit:
+        return explicit.group(1)
+    text = _LINK.sub(r"\1", title).replace("`", "").replace("*", "")
+    return _SLUG_DROP.sub("", text.strip().lower()).replace(" ", "-")
+
+
+def build_anchor_index(chunks: List[Dict]) -> Dict:
+    """
+    Build a serializable (chapter -> anchor -> chunks) index from ingested
+    chunks carrying `anchor`, `char_start` and `char_end`.
+    """
+    chapters: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    for chunk in chunks:
+        section = chapters.setdefault(chunk["chapter"], {}).setdefault(
+            chunk["anchor"], {"section": chunk["section"], "chunks": []}
+        )
+        section["chunks"].append({
+            "chunk_id": chunk["chunk_id"],
+            "start": chunk["char_start"],
+            "end": chunk["char_end"],
+            "content": chunk["content"]
+        })
+
+    return {
+        "format": ANCHOR_INDEX_FORMAT_VERSION,
+        "chunk_count": len(chunks),
+        "chapters": chapters
+    }
+
+
+def write_anchor_index(index: Dict, path: Optional[Path] = None) -> Path:
+    """Write an anchor index to disk"""
+    path = Path(path or settings.anchor_index_path or DEFAULT_ANCHOR_INDEX_PATH)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(index, f)
+    return path
+
+
+class AnchorIndexService:
+    """Service for anchor-based selection lookup (lazy loading)"""
+
+    _instance = None
+    _sections: Optional[Dict[tuple, Dict[str, Any]]] = None
+    _chunk_ids: Dict[str, tuple] = {}
+    _chapters: frozenset = frozenset()
+    _loaded_mtime: Optional[float] = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    @property
+    def index_path(self) -> Path:
+        return Path(settings.anchor_index_path or DEFAULT_ANCHOR_INDEX_PATH)
+
+    def _ensure_loaded(self):
+        """Load the index file, reloading it if ingest has rewritten it"""
+        try:
+            mtime = self.index_path.stat().st_mtime
+        except OSError:
+            self._sections = None
+            self._chunk_ids = {}
+            self._chapters = frozenset()
+            self._loaded_mtime = None
+            return
+
+        if mtime == self._loaded_mtime:
+            return
+
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+            if index.get("format") != ANCHOR_INDEX_FORMAT_VERSION:
+                raise ValueError(f"unsupported format {index.get('format')}")
+
+            sections = {}
+            chunk_ids = {}
+            for chapter, anchors in index["chapters"].items():
+                for anchor, section in anchors.items():
+                    for chunk in section["chunks"]:
+                        chunk["words"] = f" {' '.join(normalize_words(chunk['content']))} "
+                        chunk_ids[chunk["chunk_id"]] = (chapter, anchor, chunk)
+                    sections[(chapter, anchor)] = section
+            self._sections = sections
+            self._chunk_ids = chunk_ids
+            self._chapters = frozenset(index["chapters"])
+            self._loaded_mtime = mtime
+            logger.info(f"Loaded anchor index ({len(sections)} sections, {index['chunk_count']} chunks)")
+        except Exception as e:
+            logger.error(f"Failed to load anchor index: {e}")
+            self._sections = None
+            self._loaded_mtime = None
+
+    @property
+    def is_available(self) -> bool:
+        """Check if an anchor index is loaded"""
+        self._ensure_loaded()
+        return self._sections is not None
+
+    def _candidates(self, chapter: str, anchor: str, start: Optional[int], end: Optional[int]):
+        """(section, chunks) with chunks overlapping [start, end) first, then by distance"""
+        self._ensure_loaded()
+        section = (self._sections or {}).get((chapter, anchor))
+        if not section:
+            return None, []
+
+        chunks = section["chunks"]
+        if start is not None:
+            end = start if end is None else end
+            chunks = sorted(chunks, key=lambda c: max(0, c["start"] - end, start - c["end"]))
+        return section, chunks
+
+    @staticmethod
+    def _chunk_dict(chapter: str, anchor: str, section: Dict[str, Any], chunk: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "chunk_id": chunk["chunk_id"],
+            "content": chunk["content"],
+            "chapter": chapter,
+            "section": section["section"],
+            "anchor": anchor,
+            "start": chunk["start"],
+            "end": chunk["end"]
+        }
+
+    def locate(
+        self,
+        chapter: str,
+        anchor: str,
+        start: Optional[int] = None,
+        end: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Chunks of a section, those overlapping [start, end) first. Offsets
+        count characters of the section's whitespace-collapsed text.
+        """
+        section, chunks = self._candidates(chapter, anchor, start, end)
+        return [self._chunk_dict(chapter, anchor, section, chunk) for chunk in chunks]
+
+    def resolve(
+        self,
+        selected_text: str,
+        chapter: str,
+        anchor: str,
+        start: Optional[int] = None,
+        end: Optional[int] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Find the chunk containing a selection from its location on the page.
+
+        The located chunk must contain the selection verbatim (after word
+        normalization), so stale or wrong anchors return None and callers
+        fall back to a vector search.
+        """
+        words = normalize_words(selected_text)
+        if not words:
+            return None
+        needle = f" {' '.join(words)} "
+
+        section, chunks = self._candidates(chapter, anchor, start, end)
+        for chunk in chunks:
+            if needle in chunk["words"]:
+                return {**self._chunk_dict(chapter, anchor, section, chunk), "score": 1.0}
+        return None
+
+    def chapters(self) -> frozenset:
+        """Ids of the indexed chapters (empty when the index is unavailable)"""
+        self._ensure_loaded()
+        return self._chapters
+
+    def get_chunk(self, chunk_id: str) -> Optional[Dict[str, Any]]:
+        """A chunk by its id, or None if the index does not hold it"""
+        self._ensure_loaded()
+        entry = self._chunk_ids.get(chunk_id)
+        if entry is None:
+            return None
+        chapter, anchor, chunk = entry
+        return self._chunk_dict(chapter, anchor, self._sections[(chapter, anchor)], chunk)
+
+    def stats(self) -> Dict[str, Any]:
+        """Indexed sections and chunks"""
+        self._ensure_loaded()
+        sections = self._sections or {}
+        return {
+            "available": self._sections is not None,
+            "sections": len(sections),
+            "chunks": sum(len(section["chunks"]) for section in sections.values())
+        }
+
+
+def get_anchor_service() -> AnchorIndexService:
+    """Get or create anchor index service instance"""
+    return AnchorIndexService()
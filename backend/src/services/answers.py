@@ -0,0 +1,295 @@
+"""
+Precomputed Answer Service
+Serves answers generated offline (scripts/precompute_answers.py) for questions
+that closely match an anticipated one, without calling the LLM, and keeps
+recent generated answers in an in-process cache
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+from collections import OrderedDict
+from pathlib import Path
+import json
+import logging
+import re
+import threading
+
+from ..models.config import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ANSWERS_PATH = Path(__file__).parent.parent.parent / "data" / "precomputed_answers.json"
+ANSWERS_FORMAT_VERSION = 1
+
+_NON_WORD = re.compile(r"[^\w\s]")
+
+
+def normalize_query(query: str) -> str:
+    """Cache key form of a question: lowercase, no punctuation, single spaces"""
+    return " ".join(_NON_WORD.sub(" ", query.lower()).split())
+
+
+def write_precomputed_answers(
+    answers: List[Dict[str, Any]],
+    index_version: Optional[str],
+    path: Optional[Path] = None
+) -> Path:
+    """
+    Write precomputed answers to disk.
+
+    Each answer holds the question, its embedding, the grounded response and
+    the chunks it was generated from.
+    """
+    path = Path(path or settings.precomputed_answers_path or DEFAULT_ANSWERS_PATH)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({
+            "format": ANSWERS_FORMAT_VERSION,
+            "index_version": index_version,
+            "answers": answers
+        }, f)
+    return path
+
+
+class PrecomputedAnswerService:
+    """Service for nearest-question lookup over precomputed answers (lazy loading)"""
+
+    _instance = None
+    _answers: Optional[List[Dict[str, Any]]] = None
+    _matrix = None
+    _index_version: Optional[str] = None
+    _loaded_mtime: Optional[float] = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    @property
+    def answers_path(self) -> Path:
+        return Path(settings.precomputed_answers_path or DEFAULT_ANSWERS_PATH)
+
+    def _ensure_loaded(self):
+        """Load the answers file, reloading it if the job has rewritten it"""
+        try:
+            mtime = self.answers_path.stat().st_mtime
+        except OSError:
+            self._answers = None
+            self._matrix = None
+            self._loaded_mtime = None
+            return
+
+        if mtime == self._loaded_mtime:
+            return
+
+        try:
+            import numpy as np
+
+            with open(self.answers_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("format") != ANSWERS_FORMAT_VERSION:
+                raise ValueError(f"unsupported format {data.get('format')}")
+
+            answers = data["answers"]
+            matrix = np.asarray([a["embedding"] for a in answers], dtype=np.float32)
+            if len(answers):
+                matrix /= np.linalg.norm(matrix, axis=1, keepdims=True) + 1e-12
+
+            self._answers = answers
+            self._matrix = matrix
+            self._index_version = data.get("index_version")
+            self._loaded_mtime = mtime
+            logger.info(f"Loaded {len(answers)} precomputed answers (index {self._index_version})")
+        except Exception as e:
+            logger.error(f"Failed to load precomputed answers: {e}")
+            self._answers = None
+            self._matrix = None
+            self._loaded_mtime = None
+
+    @property
+    def is_available(self) -> bool:
+        """Check if precomputed answers are enabled and loaded"""
+        if not settings.precomputed_answers_enabled:
+            return False
+        self._ensure_loaded()
+        return bool(self._answers)
+
+    def _is_current(self) -> bool:
+        """Answers were generated against the live index (unknown versions are trusted)"""
+        from .metadata import get_metadata_service
+
+        live_version = get_metadata_service().get_index_version()
+        return not (live_version and self._index_version and live_version != self._index_version)
+
+    def lookup(
+        self,
+        query: str,
+        chapter_filter: Optional[str] = None,
+        threshold: Optional[float] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Find a precomputed answer for a closely matching question.
+
+        Returns None when no stored question reaches `threshold` (default
+        settings.precomputed_answer_threshold), when a chapter filter excludes
+        the answer's sources, or when the answers predate the current index.
+        """
+        if not self.is_available or not self._is_current():
+            return None
+
+        import numpy as np
+        from .embedding import get_embedding_service
+
+        query_vector = np.asarray(get_embedding_service().embed_text(query), dtype=np.float32)
+        query_vector /= np.linalg.norm(query_vector) + 1e-12
+
+        threshold = settings.precomputed_answer_threshold if threshold is None else threshold
+        scores = self._matrix @ query_vector
+        for i in np.argsort(-scores)[:5]:
+            score = float(scores[i])
+            if score < threshold:
+                break
+            answer = self._answers[i]
+            if chapter_filter and any(c["chapter"] != chapter_filter for c in answer["chunks"]):
+                continue
+            return {**answer, "similarity": score}
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        """Loaded answer count and the index version they were generated for"""
+        return {
+            "enabled": settings.precomputed_answers_enabled,
+            "answers": len(self._answers or []),
+            "index_version": self._index_version
+        }
+
+
+def get_precomputed_answer_service() -> PrecomputedAnswerService:
+    """Get or create precomputed answer service instance"""
+    return PrecomputedAnswerService()
+
+
+class AnswerCache:
+    """
+    LRU cache of generated answers to standalone questions.
+
+    Keyed by the normalized question and chapter filter; the whole cache is
+    dropped when the index version changes. Hits among the first
+    settings.answer_cache_report_requests lookups after startup are counted
+    separately to show how well the cache warmer did.
+    """
+
+    _instance = None
+    _entries = None
+    _lock = None
+    _version: Optional[str] = None
+    hits: int = 0
+    misses: int = 0
+    warmed: int = 0
+    _first_lookups: int = 0
+    _first_hits: int = 0
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._entries = OrderedDict()
+            cls._instance._lock = threading.Lock()
+        return cls._instance
+
+    def sync_version(self):
+        """Drop all entries if the index version changed (blocking Neon read at most every 30 s)"""
+        from .metadata import get_metadata_service
+
+        version = get_metadata_service().get_index_version()
+        with self._lock:
+            if version != self._version:
+                if self._entries:
+                    logger.info(f"Index version changed ({self._version} -> {version}), clearing answer cache")
+                self._entries.clear()
+                self._version = version
+
+    @staticmethod
+    def _key(query: str, chapter_filter: Optional[str]) -> Tuple[str, Optional[str]]:
+        return normalize_query(query), chapter_filter
+
+    def get(self, query: str, chapter_filter: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Cached answer ({response, sources, chunks}) for a question, or None"""
+        if not settings.answer_cache_size:
+            return None
+        self.sync_version()
+        key = self._key(query, chapter_filter)
+
+        report = None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+
+            if self._first_lookups < settings.answer_cache_report_requests:
+                self._first_lookups += 1
+                self._first_hits += entry is not None
+                if self._first_lookups == settings.answer_cache_report_requests:
+                    report = self._first_report()
+
+        if report:
+            logger.info("Answer cache warm hit ratio", extra={"answer_cache": report})
+        return entry
+
+    def put(
+        self,
+        query: str,
+        chapter_filter: Optional[str],
+        response: str,
+        sources: List[str],
+        chunks: List[Dict[str, Any]],
+        warmed: bool = False
+    ):
+        """
+        Store a generated answer.
+
+        Does not re-check the index version (a blocking Neon read): the
+        version synced by the preceding get() or sync_version() is reused,
+        and an answer stored across a version change is dropped by the next
+        get().
+        """
+        if not settings.answer_cache_size:
+            return
+        with self._lock:
+            self._entries[self._key(query, chapter_filter)] = {
+                "response": response,
+                "sources": sources,
+                "chunks": chunks
+            }
+            self.warmed += warmed
+            while len(self._entries) > settings.answer_cache_size:
+                self._entries.popitem(last=False)
+
+    def __contains__(self, item: Tuple[str, Optional[str]]) -> bool:
+        query, chapter_filter = item
+        with self._lock:
+            return self._key(query, chapter_filter) in self._entries
+
+    def _first_report(self) -> Dict[str, Any]:
+        return {
+            "requests": self._first_lookups,
+            "hits": self._first_hits,
+            "hit_ratio": round(self._first_hits / self._first_lookups, 3) if self._first_lookups else None
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "warmed": self.warmed,
+                "first_requests": self._first_report(),
+                "index_version": self._version
+            }
+
+
+def get_answer_cache() -> AnswerCache:
+    """Get or create answer cache instance"""
+    return AnswerCache()
@@ -0,0 +1,179 @@
+"""
+Cache Warmer
+Replays the most asked questions from query_logs after a restart (and on a
+schedule) so the first wave of popular questions hits warm caches
+"""
+
+from typing import Any, Dict, List, Optional
+from datetime import datetime
+import asyncio
+import logging
+import time
+
+from ..models.config import settings
+from .answers import get_answer_cache, normalize_query
+from .query_log import get_query_log_service
+
+logger = logging.getLogger(__name__)
+
+TOP_K = 3  # Same as /api/chat
+
+
+def mine_hot_queries(
+    window_hours: Optional[float] = None,
+    per_chapter: Optional[int] = None,
+    min_count: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Most frequent normalized questions per chapter in the window.
+
+    Spellings of a question that normalize alike are merged; the most
+    common spelling is replayed so the embedding cache holds that exact
+    text. Returns dicts with query, chapter_filter, chapter and count,
+    most asked first.
+    """
+    window_hours = window_hours or settings.cache_warm_window_hours
+    per_chapter = per_chapter or settings.cache_warm_per_chapter
+    min_count = settings.cache_warm_min_count if min_count is None else min_count
+
+    groups: Dict[tuple, Dict[str, Any]] = {}
+    for row in get_query_log_service().query_counts(window_hours):
+        key = (normalize_query(row["query"]), row["chapter_filter"])
+        group = groups.setdefault(key, {
+            "query": row["query"],
+            "chapter_filter": row["chapter_filter"],
+            "chapter": row["chapter"],
+            "count": 0,
+            "top_spelling": 0
+        })
+        group["count"] += row["count"]
+        if row["count"] > group["top_spelling"]:
+            group["query"], group["chapter"], group["top_spelling"] = row["query"], row["chapter"], row["count"]
+
+    by_chapter: Dict[Optional[str], List[Dict[str, Any]]] = {}
+    for group in sorted(groups.values(), key=lambda g: g["count"], reverse=True):
+        if group["count"] < min_count:
+            break
+        chapter_queries = by_chapter.setdefault(group["chapter"], [])
+        if len(chapter_queries) < per_chapter:
+            group.pop("top_spelling")
+            chapter_queries.append(group)
+
+    return sorted((q for queries in by_chapter.values() for q in queries), key=lambda g: g["count"], reverse=True)
+
+
+async def _warm_one(query: Dict[str, Any], semaphore: asyncio.Semaphore, limiter) -> str:
+    """Warm the caches for one question; returns the outcome"""
+    from .retrieval import get_retrieval_service
+    from .llm import get_llm_service, REFUSAL_NO_CONTENT
+    from .usage import get_usage_tracker
+
+    answer_cache = get_answer_cache()
+    if (query["query"], query["chapter_filter"]) in answer_cache:
+        return "cached"
+
+    async with semaphore:
+        # Embedding + retrieval caches
+        chunks = await asyncio.to_thread(
+            get_retrieval_service().retrieve,
+            query=query["query"],
+            top_k=TOP_K,
+            chapter_filter=query["chapter_filter"]
+        )
+        if not chunks:
+            return "no_content"
+
+        llm_service = get_llm_service()
+        if not llm_service.is_available or not get_usage_tracker().plan().allows_llm:
+            return "retrieval_only"
+
+        async with limiter:
+            response = await asyncio.to_thread(
+                llm_service.generate_grounded_response,
+                query=query["query"],
+                retrieved_chunks=chunks
+            )
+
+    if response == REFUSAL_NO_CONTENT:
+        return "refused"
+    answer_cache.put(
+        query["query"],
+        query["chapter_filter"],
+        response,
+        list(dict.fromkeys(chunk["chapter"] for chunk in chunks)),
+        chunks,
+        warmed=True
+    )
+    return "answered"
+
+
+class CacheWarmer:
+    """Runs warm-ups and keeps the last report (lazy singleton)"""
+
+    _instance = None
+    _last_report: Optional[Dict[str, Any]] = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    async def warm(self, queries: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """
+        Replay hot questions through retrieval and generation.
+
+        LLM calls are paced to settings.cache_warm_rate_share of
+        groq_rate_limit_per_min, leaving the rest to live traffic, and
+        stop early when the token budget rules the LLM out.
+        """
+        from ..utils.rate_limit import AsyncRateLimiter
+        from .usage import usage_endpoint_var
+
+        usage_endpoint_var.set("warm")
+        start = time.perf_counter()
+        if queries is None:
+            queries = await asyncio.to_thread(mine_hot_queries)
+        # Warmed answers are stored under the current index version
+        await asyncio.to_thread(get_answer_cache().sync_version)
+
+        semaphore = asyncio.Semaphore(settings.cache_warm_concurrency)
+        limiter = AsyncRateLimiter(max(1.0, settings.groq_rate_limit_per_min * settings.cache_warm_rate_share))
+        outcomes = await asyncio.gather(
+            *(_warm_one(query, semaphore, limiter) for query in queries),
+            return_exceptions=True
+        )
+
+        counts: Dict[str, int] = {}
+        for query, outcome in zip(queries, outcomes):
+            if isinstance(outcome, Exception):
+                logger.warning(f"Cache warm-up failed for '{query['query']}': {outcome}")
+                outcome = "failed"
+            counts[outcome] = counts.get(outcome, 0) + 1
+
+        self._last_report = {
+            "finished_at": datetime.utcnow().isoformat(),
+            "seconds": round(time.perf_counter() - start, 2),
+            "queries": len(queries),
+            "outcomes": counts
+        }
+        logger.info("Cache warm-up finished", extra={"cache_warm": self._last_report})
+        return self._last_report
+
+    async def run(self):
+        """Warm once, then every settings.cache_warm_interval_minutes (0 = once)"""
+        while True:
+            try:
+                await self.warm()
+            except Exception as e:
+                logger.error(f"Cache warm-up failed: {e}")
+            if not settings.cache_warm_interval_minutes:
+                return
+            await asyncio.sleep(settings.cache_warm_interval_minutes * 60)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"last_run": self._last_report, "answer_cache": get_answer_cache().stats()}
+
+
+def get_cache_warmer() -> CacheWarmer:
+    """Get or create cache warmer instance"""
+    return CacheWarmer()
@@ -0,0 +1,165 @@
+"""
+Near-Duplicate Detection
+MinHash signatures over word shingles, banded LSH to find near-duplicate
+chunks at ingest, and cluster tagging so retrieval returns one chunk per
+cluster
+"""
+
+from typing import Any, Dict, List, Optional
+import hashlib
+import logging
+
+from ..models.config import settings
+from .provenance import normalize_words, shingle_hashes
+
+logger = logging.getLogger(__name__)
+
+_MERSENNE_PRIME = (1 << 31) - 1
+_SEED = 1  # Fixed so signatures are comparable across ingests
+
+
+def _permutations(num_perm: int):
+    """(a, b) coefficients of the hash functions h(x) = (a*x + b) mod p"""
+    import numpy as np
+
+    rng = np.random.default_rng(_SEED)
+    a = rng.integers(1, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+    b = rng.integers(0, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+    return a, b
+
+
+def minhash_signature(text: str, num_perm: Optional[int] = None, shingle_size: Optional[int] = None, permutations=None):
+    """
+    MinHash signature of a text's word shingles (uint64 array of num_perm).
+
+    Texts shorter than one shingle are hashed as a single shingle.
+    """
+    import numpy as np
+
+    num_perm = num_perm or settings.dedup_num_perm
+    shingle_size = shingle_size or settings.dedup_shingle_size
+    a, b = permutations if permutations is not None else _permutations(num_perm)
+
+    words = normalize_words(text)
+    hashes = list(shingle_hashes(words, min(shingle_size, max(1, len(words)))))
+    if not hashes:
+        return np.full(num_perm, _MERSENNE_PRIME, dtype=np.uint64)
+
+    shingles = np.array(hashes, dtype=np.uint64) % np.uint64(_MERSENNE_PRIME)
+    # a*x < 2^62, so the products cannot overflow uint64
+    return ((np.outer(shingles, a) + b) % np.uint64(_MERSENNE_PRIME)).min(axis=0)
+
+
+def estimated_jaccard(signature_a, signature_b) -> float:
+    """Share of agreeing MinHash slots, an estimate of shingle-set Jaccard similarity"""
+    return float((signature_a == signature_b).mean())
+
+
+def find_clusters(
+    signatures: List[Any],
+    threshold: Optional[float] = None,
+    bands: Optional[int] = None
+) -> List[List[int]]:
+    """
+    Group near-duplicate signatures; returns clusters of indexes (size > 1).
+
+    Each signature is cut into `bands` bands and hashed into one bucket per
+    band, so only items sharing a bucket are compared - roughly linear in
+    the number of items. Candidate pairs are kept when their estimated
+    Jaccard similarity reaches `threshold`; clusters are the connected
+    components of kept pairs, in order of their first member.
+    """
+    threshold = settings.dedup_threshold if threshold is None else threshold
+    bands = bands or settings.dedup_bands
+    if not signatures:
+        return []
+    rows = len(signatures[0]) // bands
+
+    parent = list(range(len(signatures)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    compared = set()
+    for band in range(bands):
+        buckets: Dict[bytes, List[int]] = {}
+        for i, signature in enumerate(signatures):
+            key = hashlib.blake2b(signature[band * rows:(band + 1) * rows].tobytes(), digest_size=8).digest()
+            buckets.setdefault(key, []).append(i)
+
+        for members in buckets.values():
+            for x, i in enumerate(members):
+                for j in members[x + 1:]:
+                    if (i, j) in compared or find(i) == find(j):
+                        continue
+                    compared.add((i, j))
+                    if estimated_jaccard(signatures[i], signatures[j]) >= threshold:
+                        parent[find(j)] = find(i)
+
+    clusters: Dict[int, List[int]] = {}
+    for i in range(len(signatures)):
+        clusters.setdefault(find(i), []).append(i)
+    return sorted((members for members in clusters.values() if len(members) > 1), key=lambda m: m[0])
+
+
+def cluster_chunks(chunks: List[Dict], mode: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Detect near-duplicate chunks and tag or merge them.
+
+    Every chunk gets a `cluster_id`: the chunk_id of its cluster's
+    representative (the longest member, first on ties), or its own
+    chunk_id. In "merge" mode only representatives are kept for indexing,
+    each listing the chunk ids and chapters it stands for; in "tag" mode
+    all chunks are kept and retrieval collapses each cluster to its best
+    hit. Returns {"chunks": chunks to index, "report": counts}.
+    """
+    mode = mode or settings.dedup_mode
+    for chunk in chunks:
+        chunk["cluster_id"] = chunk["chunk_id"]
+    if mode == "off" or not chunks:
+        return {"chunks": chunks, "report": {"mode": mode, "chunks": len(chunks)}}
+
+    permutations = _permutations(settings.dedup_num_perm)
+    signatures = [minhash_signature(chunk["content"], permutations=permutations) for chunk in chunks]
+    clusters = find_clusters(signatures)
+
+    dropped = set()
+    for members in clusters:
+        representative = chunks[max(members, key=lambda i: (len(chunks[i]["content"]), -i))]
+        for i in members:
+            chunks[i]["cluster_id"] = representative["chunk_id"]
+        if mode == "merge":
+            representative["duplicate_chunk_ids"] = [chunks[i]["chunk_id"] for i in members if chunks[i] is not representative]
+            representative["duplicate_chapters"] = sorted({chunks[i]["chapter"] for i in members} - {representative["chapter"]})
+            dropped.update(i for i in members if chunks[i] is not representative)
+
+    kept = [chunk for i, chunk in enumerate(chunks) if i not in dropped]
+    duplicates = sum(len(members) - 1 for members in clusters)
+    report = {
+        "mode": mode,
+        "chunks": len(chunks),
+        "clusters": len(clusters),
+        "duplicates": duplicates,
+        "largest_cluster": max((len(members) for members in clusters), default=1),
+        "indexed_chunks": len(kept),
+        "retrievable_chunks": len(chunks) - duplicates,
+        "reduction": round(duplicates / len(chunks), 4)
+    }
+    logger.info("Near-duplicate detection", extra={"dedup": report})
+    return {"chunks": kept, "report": report}
+
+
+def collapse_clusters(chunks: List[Dict[str, Any]], limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Keep the first (best scored) chunk of each cluster; chunks without a cluster_id stand alone"""
+    seen = set()
+    collapsed = []
+    for chunk in chunks:
+        cluster = chunk.get("cluster_id") or chunk.get("chunk_id")
+        if cluster in seen:
+            continue
+        seen.add(cluster)
+        collapsed.append(chunk)
+    return collapsed[:limit] if limit is not None else collapsed
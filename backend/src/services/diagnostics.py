@@ -0,0 +1,338 @@
+"""
+Diagnostics Service
+On-demand wall-clock stack sampling of a share of chat requests and
+tracemalloc snapshots with diffs, for debugging a live worker
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+from collections import OrderedDict
+from datetime import datetime
+import logging
+import os
+import random
+import sys
+import threading
+import time
+
+from ..models.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Leaf frames of threads parked waiting for work (event loop select, idle pool
+# workers, the logging queue listener, ...)
+_IDLE_LEAVES = {
+    ("selectors.py", "select"),
+    ("threading.py", "wait"),
+    ("queue.py", "get"),
+    ("thread.py", "_worker"),
+    ("handlers.py", "dequeue"),
+}
+
+# Distinct stacks kept; samples of any further stacks are counted under OTHER_STACK
+MAX_DISTINCT_STACKS = 5000
+OTHER_STACK = "[other]"
+
+
+def _frame_label(frame) -> Tuple[str, str]:
+    code = frame.f_code
+    filename = os.path.basename(code.co_filename)
+    return filename, f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+def _folded_stack(frame) -> Optional[str]:
+    """Root-to-leaf "a;b;c" stack of a frame, or None for an idle thread"""
+    leaf_file, _ = _frame_label(frame)
+    if (leaf_file, frame.f_code.co_name) in _IDLE_LEAVES:
+        return None
+
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame)[1])
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+class RequestProfiler:
+    """
+    Wall-clock sampling profiler for a share of /api/chat requests.
+
+    While at least one sampled request is in flight, a background thread
+    records the stacks of every other thread (event loop and worker
+    threads) every `interval_ms`. Samples aggregate into folded stacks,
+    ready for flamegraph tools. With `sample_percent` at 0 the request path
+    only reads one attribute and no thread runs.
+    """
+
+    _instance = None
+    _lock = None
+    _active = None
+    sample_percent: float = 0.0
+    interval_ms: float = 5.0
+    _inflight: int = 0
+    _thread: Optional[threading.Thread] = None
+    _stacks: Dict[str, int] = {}
+    _samples: int = 0
+    _idle_samples: int = 0
+    _sampled_requests: int = 0
+    _enabled_at: Optional[str] = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._lock = threading.Lock()
+            cls._instance._active = threading.Event()
+            cls._instance._stacks = {}
+            cls._instance.sample_percent = settings.profiler_sample_percent
+            cls._instance.interval_ms = settings.profiler_interval_ms
+        return cls._instance
+
+    def configure(self, sample_percent: float, interval_ms: Optional[float] = None):
+        """Set the share of chat requests sampled (0 disables the profiler)"""
+        self.sample_percent = max(0.0, min(100.0, sample_percent))
+        if interval_ms:
+            self.interval_ms = interval_ms
+        self._enabled_at = datetime.utcnow().isoformat() if self.sample_percent else None
+        logger.info(f"Request profiler set to {self.sample_percent}% every {self.interval_ms}ms")
+
+    def should_sample(self) -> bool:
+        """Roll for the current request"""
+        return self.sample_percent > 0 and random.random() * 100 < self.sample_percent
+
+    def reset(self):
+        """Drop collected samples"""
+        with self._lock:
+            self._stacks = {}
+            self._samples = 0
+            self._idle_samples = 0
+            self._sampled_requests = 0
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        own_ident = threading.get_ident()
+        while True:
+            self._active.wait()
+            frames = sys._current_frames()
+            stacks = [_folded_stack(frame) for ident, frame in frames.items() if ident != own_ident]
+            del frames
+
+            with self._lock:
+                for stack in stacks:
+                    if stack is None:
+                        self._idle_samples += 1
+                        continue
+                    if stack not in self._stacks and len(self._stacks) >= MAX_DISTINCT_STACKS:
+                        stack = OTHER_STACK
+                    self._stacks[stack] = self._stacks.get(stack, 0) + 1
+                    self._samples += 1
+            time.sleep(self.interval_ms / 1000)
+
+    def __enter__(self):
+        with self._lock:
+            self._inflight += 1
+            self._sampled_requests += 1
+            self._ensure_thread()
+            self._active.set()
+        return self
+
+    def __exit__(self, *exc):
+        with self._lock:
+            self._inflight -= 1
+            if not self._inflight:
+                self._active.clear()
+        return False
+
+    def hot_stacks(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """Most sampled stacks with their share of busy samples"""
+        with self._lock:
+            stacks = sorted(self._stacks.items(), key=lambda item: item[1], reverse=True)[:limit]
+            total = self._samples
+        return [
+            {"stack": stack.split(";"), "samples": count, "share": round(count / total, 4)}
+            for stack, count in stacks
+        ]
+
+    def hot_functions(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Functions by samples spent in them (self) and under them (total)"""
+        own: Dict[str, int] = {}
+        cumulative: Dict[str, int] = {}
+        with self._lock:
+            stacks = list(self._stacks.items())
+            total = self._samples
+        for stack, count in stacks:
+            frames = stack.split(";")
+            own[frames[-1]] = own.get(frames[-1], 0) + count
+            for function in set(frames):
+                cumulative[function] = cumulative.get(function, 0) + count
+        ranked = sorted(own.items(), key=lambda item: item[1], reverse=True)[:limit]
+        return [
+            {
+                "function": function,
+                "self_share": round(count / total, 4),
+                "total_share": round(cumulative[function] / total, 4)
+            }
+            for function, count in ranked
+        ]
+
+    def folded(self) -> str:
+        """All stacks in folded format ("a;b;c count" per line)"""
+        with self._lock:
+            return "".join(f"{stack} {count}\n" for stack, count in self._stacks.items())
+
+    def stats(self) -> Dict[str, Any]:
+        """Profiler settings and sample counts"""
+        with self._lock:
+            return {
+                "enabled": self.sample_percent > 0,
+                "sample_percent": self.sample_percent,
+                "interval_ms": self.interval_ms,
+                "enabled_at": self._enabled_at,
+                "sampled_requests": self._sampled_requests,
+                "inflight": self._inflight,
+                "samples": self._samples,
+                "idle_samples": self._idle_samples,
+                "distinct_stacks": len(self._stacks)
+            }
+
+
+def _rss_mb() -> Optional[float]:
+    """Current resident set size (Linux), None where /proc is unavailable"""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            pages = int(f.read().split()[1])
+        return round(pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024), 2)
+    except (OSError, ValueError):
+        return None
+
+
+class MemorySnapshots:
+    """
+    tracemalloc snapshots kept in memory and compared on demand.
+
+    Tracing only runs between start() and stop(), so it costs nothing
+    otherwise; the oldest snapshots are dropped past
+    settings.tracemalloc_max_snapshots.
+    """
+
+    _instance = None
+    _lock = None
+    _snapshots = None
+    _next_id: int = 1
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._lock = threading.Lock()
+            cls._instance._snapshots = OrderedDict()
+        return cls._instance
+
+    @property
+    def tracing(self) -> bool:
+        import tracemalloc
+
+        return tracemalloc.is_tracing()
+
+    def start(self, frames: Optional[int] = None):
+        """Start tracing allocations (already-allocated memory is not attributed)"""
+        import tracemalloc
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames or settings.tracemalloc_frames)
+            logger.info("tracemalloc started")
+
+    def stop(self):
+        """Stop tracing and drop the snapshots"""
+        import tracemalloc
+
+        tracemalloc.stop()
+        with self._lock:
+            self._snapshots.clear()
+        logger.info("tracemalloc stopped")
+
+    def take(self, label: Optional[str] = None) -> Dict[str, Any]:
+        """Capture a snapshot; raises RuntimeError when tracing is off"""
+        import tracemalloc
+
+        if not tracemalloc.is_tracing():
+            raise RuntimeError("tracemalloc is not tracing")
+
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        ))
+        current, peak = tracemalloc.get_traced_memory()
+        with self._lock:
+            snapshot_id = self._next_id
+            self._next_id += 1
+            info = {
+                "id": snapshot_id,
+                "label": label,
+                "taken_at": datetime.utcnow().isoformat(),
+                "traced_mb": round(current / (1024 * 1024), 2),
+                "traced_peak_mb": round(peak / (1024 * 1024), 2),
+                "rss_mb": _rss_mb()
+            }
+            self._snapshots[snapshot_id] = (info, snapshot)
+            while len(self._snapshots) > settings.tracemalloc_max_snapshots:
+                self._snapshots.popitem(last=False)
+        return info
+
+    def snapshots(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [info for info, _ in self._snapshots.values()]
+
+    def top(self, snapshot_id: int, key_type: str = "lineno", limit: int = 20) -> List[Dict[str, Any]]:
+        """Largest allocation sites of one snapshot; raises KeyError for unknown ids"""
+        with self._lock:
+            _, snapshot = self._snapshots[snapshot_id]
+        return [
+            {
+                "location": self._location(stat.traceback),
+                "size_kb": round(stat.size / 1024, 1),
+                "count": stat.count
+            }
+            for stat in snapshot.statistics(key_type)[:limit]
+        ]
+
+    def diff(self, from_id: int, to_id: int, key_type: str = "lineno", limit: int = 20) -> Dict[str, Any]:
+        """Allocation sites that grew most between two snapshots; raises KeyError for unknown ids"""
+        with self._lock:
+            before_info, before = self._snapshots[from_id]
+            after_info, after = self._snapshots[to_id]
+        stats = after.compare_to(before, key_type)
+        return {
+            "from": before_info,
+            "to": after_info,
+            "size_diff_mb": round(sum(stat.size_diff for stat in stats) / (1024 * 1024), 3),
+            "top": [
+                {
+                    "location": self._location(stat.traceback),
+                    "size_diff_kb": round(stat.size_diff / 1024, 1),
+                    "size_kb": round(stat.size / 1024, 1),
+                    "count_diff": stat.count_diff
+                }
+                for stat in stats[:limit]
+            ]
+        }
+
+    @staticmethod
+    def _location(traceback) -> List[str]:
+        """Innermost frame first"""
+        return [f"{frame.filename}:{frame.lineno}" for frame in reversed(traceback)]
+
+    def stats(self) -> Dict[str, Any]:
+        return {"tracing": self.tracing, "snapshots": len(self._snapshots), "rss_mb": _rss_mb()}
+
+
+def get_request_profiler() -> RequestProfiler:
+    """Get or create request profiler instance"""
+    return RequestProfiler()
+
+
+def get_memory_snapshots() -> MemorySnapshots:
+    """Get or create memory snapshot store instance"""
+    return MemorySnapshots()
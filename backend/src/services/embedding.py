@@ -4,10 +4,17 @@ Generates vector embeddings using sentence-transformers
 """
 
 from typing import List, Optional
+from collections import OrderedDict
 import logging
+import threading
+
+from ..models.config import settings
+from ..utils.startup import startup_timeline
 
 logger = logging.getLogger(__name__)
 
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+
 
 class EmbeddingService:
     """Service for generating text embeddings (lazy initialization)"""
@@ -15,30 +22,63 @@ class EmbeddingService:
     _instance = None
     _model = None
     _initialized = False
+    _cache = None
+    _cache_lock = None
+    _load_lock = None
 
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
+            cls._instance._cache = OrderedDict()
+            cls._instance._cache_lock = threading.Lock()
+            cls._instance._load_lock = threading.Lock()
         return cls._instance
 
     def _ensure_initialized(self):
-        """Lazy load the model on first use"""
-        if not self._initialized:
+        """Lazy load the model on first use (concurrent callers wait for one load)"""
+        if self._initialized:
+            return
+        with self._load_lock:
+            if self._initialized:
+                return
             try:
-                from sentence_transformers import SentenceTransformer
-                logger.info("Loading embedding model: all-MiniLM-L6-v2")
-                self._model = SentenceTransformer('all-MiniLM-L6-v2')
+                with startup_timeline.stage("embedding_model"):
+                    from sentence_transformers import SentenceTransformer
+                    logger.info(f"Loading embedding model: {EMBEDDING_MODEL}")
+                    self._model = SentenceTransformer(EMBEDDING_MODEL)
                 self._initialized = True
                 logger.info("Embedding model loaded successfully")
             except Exception as e:
                 logger.error(f"Failed to load embedding model: {e}")
                 raise
 
+    def warm_up(self):
+        """Load the model ahead of the first query (call from a worker thread)"""
+        try:
+            self._ensure_initialized()
+        except Exception:
+            pass  # Logged above; the first query retries
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._initialized
+
     def embed_text(self, text: str) -> List[float]:
-        """Generate embedding for a single text"""
+        """Generate embedding for a single text (LRU-cached)"""
+        with self._cache_lock:
+            cached = self._cache.get(text)
+            if cached is not None:
+                self._cache.move_to_end(text)
+                return cached
+
         self._ensure_initialized()
-        embedding = self._model.encode(text, convert_to_numpy=True)
-        return embedding.tolist()
+        embedding = self._model.encode(text, convert_to_numpy=True).tolist()
+
+        with self._cache_lock:
+            self._cache[text] = embedding
+            while len(self._cache) > settings.embedding_cache_size:
+                self._cache.popitem(last=False)
+        return embedding
 
     def embed_batch(self, texts: List[str]) -> List[List[float]]:
         """Generate embeddings for multiple texts"""
@@ -49,7 +89,7 @@ class EmbeddingService:
     @property
     def dimension(self) -> int:
         """Return embedding dimension"""
-        return 384  # all-MiniLM-L6-v2 dimension
+        return 384  # EMBEDDING_MODEL dimension
 
     @property
     def is_available(self) -> bool:
@@ -0,0 +1,281 @@
+"""
+Extractive Answer Service
+Answers from the book without the LLM: ranks the sentences of retrieved chunks
+against the query and returns the best ones with section citations
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+from collections import OrderedDict
+from pathlib import Path
+import hashlib
+import logging
+import re
+import threading
+
+from ..models.config import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SENTENCE_INDEX_PATH = Path(__file__).parent.parent.parent / "data" / "sentence_index.npz"
+SENTENCE_INDEX_FORMAT_VERSION = 1
+
+MIN_SENTENCE_WORDS = 4
+EMBED_BATCH_SIZE = 256
+
+# Chunk text is whitespace-collapsed at ingest, so markdown structure is
+# recovered from inline markers: sentence ends, headings and list items
+_UNIT_BOUNDARY = re.compile(r"(?<=[.!?])\s+(?=[\"'(\[#*]?[A-Z0-9])|\s+(?=(?:#{1,6}|[-*+]|\d+[.)])\s+[\"'(\[*A-Z0-9])")
+_LEADING_MARKUP = re.compile(r"^(?:#{1,6}|[-*+>]|\d+[.)])\s+")
+
+
+def split_sentences(text: str) -> List[str]:
+    """
+    Split chunk text into answerable sentences.
+
+    Code blocks, headings, table rows and questions are dropped, list items
+    count as their own units, and fragments shorter than MIN_SENTENCE_WORDS
+    are skipped.
+    """
+    prose = " ".join(text.split("```")[::2])
+    sentences = []
+    for unit in _UNIT_BOUNDARY.split(prose):
+        unit = unit.strip()
+        if unit.startswith("#") or unit.endswith("?") or unit.count("|") >= 2:
+            continue
+        unit = _LEADING_MARKUP.sub("", unit).replace("**", "").strip()
+        if len(unit.split()) >= MIN_SENTENCE_WORDS:
+            sentences.append(unit)
+    return sentences
+
+
+def content_key(content: str) -> str:
+    """Stable key for a chunk's text (chunk ids may change between ingests)"""
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _embed_sentences(embedding_service, sentences: List[str]):
+    """Embed sentences in batches and L2-normalize them (float32 rows)"""
+    import numpy as np
+
+    vectors = np.zeros((len(sentences), embedding_service.dimension), dtype=np.float32)
+    for start in range(0, len(sentences), EMBED_BATCH_SIZE):
+        batch = sentences[start:start + EMBED_BATCH_SIZE]
+        vectors[start:start + len(batch)] = embedding_service.embed_batch(batch)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True) + 1e-12
+    return vectors
+
+
+def build_sentence_index(chunks: List[Dict], embedding_service=None) -> Dict:
+    """
+    Split every chunk into sentences and embed them in batches.
+
+    Returns arrays ready for write_sentence_index: one row per sentence,
+    tagged with the content key of the chunk it came from. Chunks with the
+    same content are stored once.
+    """
+    import numpy as np
+    from .embedding import get_embedding_service
+
+    embedding_service = embedding_service or get_embedding_service()
+    keys, sentences = [], []
+    seen = set()
+    for chunk in chunks:
+        key = content_key(chunk["content"])
+        if key in seen:
+            continue
+        seen.add(key)
+        for sentence in split_sentences(chunk["content"]):
+            keys.append(key)
+            sentences.append(sentence)
+
+    return {
+        "format": np.asarray(SENTENCE_INDEX_FORMAT_VERSION),
+        "keys": np.asarray(keys, dtype=str),
+        "sentences": np.asarray(sentences, dtype=str),
+        "vectors": _embed_sentences(embedding_service, sentences)
+    }
+
+
+def write_sentence_index(index: Dict, path: Optional[Path] = None) -> Path:
+    """Write a sentence index to disk (uncompressed .npz)"""
+    import numpy as np
+
+    path = Path(path or settings.sentence_index_path or DEFAULT_SENTENCE_INDEX_PATH)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as f:
+        np.savez(f, **index)
+    return path
+
+
+class ExtractiveAnswerService:
+    """Service for sentence-level extractive answers (lazy loading)"""
+
+    _instance = None
+    _embedding_service = None
+    _rows: Dict[str, Tuple[int, int]] = {}
+    _sentences = None
+    _vectors = None
+    _loaded_mtime: Optional[float] = None
+    _cache = None
+    _cache_lock = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._cache = OrderedDict()
+            cls._instance._cache_lock = threading.Lock()
+        return cls._instance
+
+    @property
+    def index_path(self) -> Path:
+        return Path(settings.sentence_index_path or DEFAULT_SENTENCE_INDEX_PATH)
+
+    def _get_embedding_service(self):
+        if self._embedding_service is None:
+            from .embedding import get_embedding_service
+            self._embedding_service = get_embedding_service()
+        return self._embedding_service
+
+    def _ensure_loaded(self):
+        """Load the ingest-time sentence index, reloading it if ingest has rewritten it"""
+        try:
+            mtime = self.index_path.stat().st_mtime
+        except OSError:
+            self._rows = {}
+            self._loaded_mtime = None
+            return
+
+        if mtime == self._loaded_mtime:
+            return
+
+        try:
+            import numpy as np
+
+            with np.load(self.index_path) as index:
+                if int(index["format"]) != SENTENCE_INDEX_FORMAT_VERSION:
+                    raise ValueError(f"unsupported format {int(index['format'])}")
+                keys = index["keys"]
+                sentences = index["sentences"].tolist()
+                vectors = index["vectors"]
+
+            # Sentences of a chunk are stored contiguously. Identical contents
+            # split into identical sentences, so only the first run of a key
+            # counts; a span over a later repeat would take in other chunks' rows.
+            rows: Dict[str, Tuple[int, int]] = {}
+            for i, key in enumerate(keys.tolist()):
+                start, end = rows.get(key, (i, i))
+                if end == i:
+                    rows[key] = (start, i + 1)
+
+            self._sentences = sentences
+            self._vectors = vectors
+            self._rows = rows
+            self._loaded_mtime = mtime
+            logger.info(f"Loaded sentence index ({len(sentences)} sentences, {len(rows)} chunks)")
+        except Exception as e:
+            logger.error(f"Failed to load sentence index: {e}")
+            self._rows = {}
+            self._loaded_mtime = None
+
+    def _chunk_sentences(self, content: str):
+        """Sentences and normalized vectors of a chunk: ingest index, then LRU, then embed"""
+        key = content_key(content)
+        self._ensure_loaded()
+        if key in self._rows:
+            start, end = self._rows[key]
+            return self._sentences[start:end], self._vectors[start:end]
+
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                return cached
+
+        sentences = split_sentences(content)
+        entry = (sentences, _embed_sentences(self._get_embedding_service(), sentences))
+
+        with self._cache_lock:
+            self._cache[key] = entry
+            while len(self._cache) > settings.extractive_cache_size:
+                self._cache.popitem(last=False)
+        return entry
+
+    def rank(
+        self,
+        query: str,
+        chunks: List[Dict],
+        max_sentences: Optional[int] = None
+    ) -> List[Tuple[float, int, int, str]]:
+        """
+        Score every sentence of the chunks against the query in one matrix
+        product. Returns the top (score, chunk index, sentence index, text).
+        """
+        import numpy as np
+
+        max_sentences = max_sentences or settings.extractive_max_sentences
+        per_chunk = [self._chunk_sentences(chunk["content"]) for chunk in chunks]
+        owners = [(c, s) for c, (sentences, _) in enumerate(per_chunk) for s in range(len(sentences))]
+        if not owners:
+            return []
+
+        query_vector = np.asarray(self._get_embedding_service().embed_text(query), dtype=np.float32)
+        query_vector /= np.linalg.norm(query_vector) + 1e-12
+        scores = np.vstack([vectors for _, vectors in per_chunk if len(vectors)]) @ query_vector
+
+        k = min(max_sentences, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        return sorted(
+            (float(scores[i]), owners[i][0], owners[i][1], per_chunk[owners[i][0]][0][owners[i][1]])
+            for i in top
+        )[::-1]
+
+    def answer(
+        self,
+        query: str,
+        chunks: List[Dict],
+        selected_text: Optional[str] = None,
+        max_sentences: Optional[int] = None
+    ) -> Optional[str]:
+        """
+        Build a cited extractive answer, or None when no sentence qualifies.
+
+        With selected text only the selection's sentences are used, cited
+        with the section it was matched to. Sentences are shown in reading
+        order, grouped under the section they came from.
+        """
+        if not chunks:
+            return None
+
+        sources = chunks
+        if selected_text:
+            sources = [{**chunks[0], "content": selected_text}]
+
+        ranked = self.rank(query, sources, max_sentences)
+        if not ranked:
+            return None
+
+        by_chunk: Dict[int, List[Tuple[int, str]]] = {}
+        for _, chunk_index, sentence_index, sentence in ranked:
+            by_chunk.setdefault(chunk_index, []).append((sentence_index, sentence))
+
+        # Sections ordered by their best sentence, sentences in reading order
+        parts = []
+        for chunk_index in dict.fromkeys(chunk_index for _, chunk_index, _, _ in ranked):
+            chunk = sources[chunk_index]
+            text = " ".join(sentence for _, sentence in sorted(by_chunk[chunk_index]))
+            parts.append(f"{text} [Source: {chunk['chapter']} - {chunk['section']}]")
+        return "\n\n".join(parts)
+
+    def stats(self) -> Dict[str, Any]:
+        """Ingest index size and on-demand cache occupancy"""
+        self._ensure_loaded()
+        return {
+            "indexed_chunks": len(self._rows),
+            "indexed_sentences": len(self._sentences or []) if self._rows else 0,
+            "cached_chunks": len(self._cache)
+        }
+
+
+def get_extractive_service() -> ExtractiveAnswerService:
+    """Get or create extractive answer service instance"""
+    return ExtractiveAnswerService()
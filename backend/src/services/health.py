@@ -0,0 +1,206 @@
+"""
+Health Monitor
+Background probes of Qdrant, the LLM provider, Redis and Neon, served as a cached snapshot
+"""
+
+from typing import Any, Callable, Dict, Optional
+from datetime import datetime
+import asyncio
+import logging
+import time
+
+from ..models.config import settings
+from ..utils.startup import startup_timeline
+
+logger = logging.getLogger(__name__)
+
+# Average stored payload per chunk (~500 words of content plus metadata)
+QDRANT_PAYLOAD_BYTES_PER_POINT = 3500
+BYTES_PER_GB = 1024 ** 3
+
+
+def _probe_qdrant() -> Dict[str, Any]:
+    from .retrieval import get_retrieval_service
+
+    if not settings.is_qdrant_configured:
+        return {"status": "not_configured"}
+
+    retrieval_service = get_retrieval_service()
+    if not retrieval_service.is_available:
+        return {"status": "down", "error": "client not initialized"}
+
+    from .qdrant_schema import resolve_alias
+
+    client = retrieval_service._client
+    info = client.get_collection(settings.qdrant_collection_name)
+    points = getattr(info, "points_count", 0) or 0
+    dimension = info.config.params.vectors.size
+    quantized = bool(getattr(info.config, "quantization_config", None))
+    estimated_bytes = points * (dimension * (5 if quantized else 4) + QDRANT_PAYLOAD_BYTES_PER_POINT)
+    return {
+        "status": "up",
+        "collection": settings.qdrant_collection_name,
+        "serving": resolve_alias(client, settings.qdrant_collection_name) or settings.qdrant_collection_name,
+        "points_count": points,
+        "usage": {
+            "estimated_gb": round(estimated_bytes / BYTES_PER_GB, 4),
+            "limit_gb": settings.qdrant_storage_limit_gb,
+            "percent": round(estimated_bytes / BYTES_PER_GB / settings.qdrant_storage_limit_gb * 100, 2)
+        }
+    }
+
+
+def _probe_llm() -> Dict[str, Any]:
+    from .llm import get_llm_service
+
+    llm_service = get_llm_service()
+    if not llm_service.is_available:
+        return {"status": "not_configured"}
+    llm_service.ping()
+    return {
+        "status": "up",
+        "provider": llm_service._provider.name,
+        "model": llm_service._provider.model,
+        "rate_limit_per_min": settings.groq_rate_limit_per_min
+    }
+
+
+def _probe_redis() -> Dict[str, Any]:
+    if settings.session_backend != "redis":
+        return {"status": "not_configured"}
+
+    import redis
+    client = redis.Redis.from_url(settings.redis_url, socket_timeout=settings.health_probe_timeout_seconds)
+    try:
+        client.ping()
+        memory = client.info("memory")
+        return {"status": "up", "used_memory_mb": round(memory.get("used_memory", 0) / 1024 ** 2, 2)}
+    finally:
+        client.close()
+
+
+def _probe_neon() -> Dict[str, Any]:
+    if not settings.is_neon_configured:
+        return {"status": "not_configured"}
+
+    import psycopg
+    with psycopg.connect(
+        settings.neon_database_url,
+        connect_timeout=max(1, int(settings.health_probe_timeout_seconds))
+    ) as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT pg_database_size(current_database())")
+            size_bytes = cur.fetchone()[0]
+    return {
+        "status": "up",
+        "usage": {
+            "gb": round(size_bytes / BYTES_PER_GB, 4),
+            "limit_gb": settings.neon_storage_limit_gb,
+            "percent": round(size_bytes / BYTES_PER_GB / settings.neon_storage_limit_gb * 100, 2)
+        }
+    }
+
+
+PROBES: Dict[str, Callable[[], Dict[str, Any]]] = {
+    "qdrant": _probe_qdrant,
+    "llm": _probe_llm,
+    "redis": _probe_redis,
+    "neon": _probe_neon,
+}
+
+# Components that must be up (when configured) for the API to take traffic
+REQUIRED_COMPONENTS = ("qdrant", "llm")
+
+
+class HealthMonitor:
+    """Periodically probes dependencies and keeps the latest snapshot in memory"""
+
+    _instance = None
+    _task: Optional[asyncio.Task] = None
+    _snapshot: Dict[str, Any] = {}
+    _checked_at: Optional[float] = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._snapshot = {
+                name: {"status": "pending"} for name in PROBES
+            }
+        return cls._instance
+
+    async def _probe(self, name: str) -> Dict[str, Any]:
+        """Run one blocking probe in a thread with a timeout and record latency"""
+        start = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(
+                asyncio.to_thread(PROBES[name]),
+                timeout=settings.health_probe_timeout_seconds
+            )
+        except asyncio.TimeoutError:
+            result = {"status": "down", "error": "timeout"}
+        except Exception as e:
+            result = {"status": "down", "error": str(e)[:200]}
+        result["latency_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        result["checked_at"] = datetime.utcnow().isoformat()
+        return result
+
+    async def probe_all(self) -> Dict[str, Any]:
+        """Probe every component concurrently and replace the snapshot"""
+        names = list(PROBES)
+        results = await asyncio.gather(*(self._probe(name) for name in names))
+        self._snapshot = dict(zip(names, results))
+        self._checked_at = time.monotonic()
+        startup_timeline.mark("first_health_probe")
+
+        for name, result in self._snapshot.items():
+            if result["status"] == "down":
+                logger.warning(f"Health probe failed: {name} ({result.get('error')})")
+        return self._snapshot
+
+    async def _run(self):
+        while True:
+            try:
+                await self.probe_all()
+            except Exception as e:
+                logger.error(f"Health monitor iteration failed: {e}")
+            await asyncio.sleep(settings.health_probe_interval_seconds)
+
+    def start(self):
+        """Start the background probe loop (first probe runs immediately)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    @property
+    def age_seconds(self) -> Optional[float]:
+        """Seconds since the last completed probe round"""
+        if self._checked_at is None:
+            return None
+        return round(time.monotonic() - self._checked_at, 1)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Latest component states (never blocks)"""
+        return self._snapshot
+
+    def is_ready(self) -> bool:
+        """Required components are up (or not configured) and the snapshot is fresh"""
+        age = self.age_seconds
+        if age is None or age > settings.health_probe_interval_seconds * 3:
+            return False
+        return all(
+            self._snapshot[name]["status"] in ("up", "not_configured")
+            for name in REQUIRED_COMPONENTS
+        )
+
+
+def get_health_monitor() -> HealthMonitor:
+    """Get or create health monitor instance"""
+    return HealthMonitor()
@@ -0,0 +1,131 @@
+"""
+Index Hierarchy
+Section- and chapter-level summary points, stored in a sibling collection of
+the chunks, used to narrow a search before the chunk-level pass
+"""
+
+from typing import Any, Dict, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Payload "level" of each point kind (chunks indexed before levels existed have none)
+LEVEL_CHUNK = "chunk"
+LEVEL_SECTION = "section"
+LEVEL_CHAPTER = "chapter"
+SUMMARY_LEVELS = [LEVEL_SECTION, LEVEL_CHAPTER]
+
+
+def summary_collection(name: str) -> str:
+    """Sibling collection (or alias) holding the summaries of a chunk collection (or alias)"""
+    return f"{name}-summaries"
+
+
+def section_id(chapter: str, anchor: str) -> str:
+    """Key shared by a section's summary point and its chunks"""
+    return f"{chapter}#{anchor}"
+
+
+def _normalized(vector):
+    import numpy as np
+
+    return vector / (np.linalg.norm(vector) + 1e-12)
+
+
+def build_summaries(
+    chunks: List[Dict],
+    chunk_vectors: List[List[float]],
+    embedding_service=None
+) -> List[Dict[str, Any]]:
+    """
+    Build section and chapter summary points from ingested chunks.
+
+    A section vector blends the embedding of its heading (with the chapter
+    name) and the centroid of its chunk vectors, so short sections are
+    still found by topic and long ones by content. A chapter vector blends
+    its title with the centroid of its sections. Returns dicts with
+    `key` (for a stable point id), `vector` and `payload`.
+    """
+    import numpy as np
+    from .embedding import get_embedding_service
+
+    embedding_service = embedding_service or get_embedding_service()
+
+    sections: Dict[str, Dict[str, Any]] = {}
+    for chunk, vector in zip(chunks, chunk_vectors):
+        sid = section_id(chunk["chapter"], chunk["anchor"])
+        entry = sections.setdefault(sid, {
+            "chapter": chunk["chapter"],
+            "chapter_name": chunk.get("chapter_name") or chunk["chapter"],
+            "section": chunk["section"],
+            "vectors": []
+        })
+        entry["vectors"].append(vector)
+
+    titles = [f"{s['chapter_name']}: {s['section']}" for s in sections.values()]
+    title_vectors = embedding_service.embed_batch(titles) if titles else []
+
+    summaries = []
+    chapters: Dict[str, Dict[str, Any]] = {}
+    for (sid, entry), title_vector in zip(sections.items(), title_vectors):
+        centroid = _normalized(np.mean(np.asarray(entry["vectors"], dtype=np.float32), axis=0))
+        vector = _normalized(centroid + _normalized(np.asarray(title_vector, dtype=np.float32)))
+        summaries.append({
+            "key": f"{sid}@{LEVEL_SECTION}",
+            "vector": vector.tolist(),
+            "payload": {
+                "level": LEVEL_SECTION,
+                "content": entry["section"],
+                "chapter": entry["chapter"],
+                "section": entry["section"],
+                "section_id": sid
+            }
+        })
+        chapters.setdefault(entry["chapter"], {"name": entry["chapter_name"], "vectors": []})["vectors"].append(vector)
+
+    chapter_titles = embedding_service.embed_batch([c["name"] for c in chapters.values()]) if chapters else []
+    for (chapter, entry), title_vector in zip(chapters.items(), chapter_titles):
+        centroid = _normalized(np.mean(np.asarray(entry["vectors"], dtype=np.float32), axis=0))
+        vector = _normalized(centroid + _normalized(np.asarray(title_vector, dtype=np.float32)))
+        summaries.append({
+            "key": f"{chapter}@{LEVEL_CHAPTER}",
+            "vector": vector.tolist(),
+            "payload": {
+                "level": LEVEL_CHAPTER,
+                "content": entry["name"],
+                "chapter": chapter,
+                "section": None,
+                "section_id": None
+            }
+        })
+
+    logger.info(f"Built {len(sections)} section and {len(chapters)} chapter summaries")
+    return summaries
+
+
+def hierarchical_candidates(
+    query_points,
+    query_vector: List[float],
+    chapter_filter: Optional[str],
+    top_chapters: int,
+    top_sections: int
+) -> Optional[List[str]]:
+    """
+    Pick candidate section ids: the best chapters (unless a chapter filter
+    already scopes the query), then the best sections within them.
+
+    `query_points(query_vector, limit, chapter_filter, score_threshold, **filters)`
+    runs one filtered search. Returns None when the index has no summaries,
+    so callers fall back to a flat search.
+    """
+    chapters = None
+    if top_chapters and not chapter_filter:
+        hits = query_points(query_vector, top_chapters, None, 0.0, level=LEVEL_CHAPTER)
+        if not hits:
+            return None
+        chapters = [hit["chapter"] for hit in hits]
+
+    hits = query_points(query_vector, top_sections, chapter_filter, 0.0, level=LEVEL_SECTION, chapters=chapters)
+    if not hits:
+        return None
+    return [hit["section_id"] for hit in hits]
@@ -0,0 +1,298 @@
+"""
+Index Artifact
+Portable snapshot of an index version (payloads + float32 vectors + manifest)
+that restores into Qdrant without re-embedding
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import datetime
+from pathlib import Path
+import hashlib
+import io
+import json
+import logging
+import os
+import tarfile
+
+from ..models.config import settings
+from .embedding import EMBEDDING_MODEL
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ARTIFACT_PATH = Path(__file__).parent.parent.parent / "data" / "index_artifact.tar"
+ARTIFACT_FORMAT_VERSION = 1
+
+MANIFEST_NAME = "manifest.json"
+IDS_NAME = "ids.npy"
+VECTORS_NAME = "vectors.npy"
+PAYLOADS_NAME = "payloads.jsonl"
+
+SCROLL_BATCH_SIZE = 256
+
+
+class ArtifactError(Exception):
+    """Raised when an artifact is missing, corrupt or incompatible"""
+
+
+def _npy_bytes(array) -> bytes:
+    import numpy as np
+
+    buffer = io.BytesIO()
+    np.save(buffer, array, allow_pickle=False)
+    return buffer.getvalue()
+
+
+def _read_points(client, collection_name: str) -> Tuple[List[int], List[List[float]], List[Dict]]:
+    """All points of a collection as (ids, vectors, payloads), ordered by id"""
+    ids, vectors, payloads = [], [], []
+    offset = None
+    while True:
+        points, offset = client.scroll(
+            collection_name=collection_name,
+            limit=SCROLL_BATCH_SIZE,
+            offset=offset,
+            with_payload=True,
+            with_vectors=True
+        )
+        for point in points:
+            ids.append(point.id)
+            vectors.append(point.vector)
+            payloads.append(point.payload)
+        if offset is None:
+            break
+
+    order = sorted(range(len(ids)), key=lambda i: ids[i])
+    return [ids[i] for i in order], [vectors[i] for i in order], [payloads[i] for i in order]
+
+
+def auxiliary_index_paths() -> Dict[str, Path]:
+    """Files rebuilt with every ingest that travel with the artifact (member name -> local path)"""
+    from .provenance import DEFAULT_INDEX_PATH
+    from .extractive import DEFAULT_SENTENCE_INDEX_PATH
+    from .anchors import DEFAULT_ANCHOR_INDEX_PATH
+
+    return {
+        "provenance_index.json": Path(settings.provenance_index_path or DEFAULT_INDEX_PATH),
+        "sentence_index.npz": Path(settings.sentence_index_path or DEFAULT_SENTENCE_INDEX_PATH),
+        "chunk_anchors.json": Path(settings.anchor_index_path or DEFAULT_ANCHOR_INDEX_PATH)
+    }
+
+
+def install_auxiliary_indexes(extra_files: Dict[str, bytes]) -> List[Path]:
+    """Write bundled auxiliary indexes to their configured paths (atomic per file)"""
+    written = []
+    for name, target in auxiliary_index_paths().items():
+        if name not in extra_files:
+            continue
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = target.with_suffix(target.suffix + ".tmp")
+        tmp_path.write_bytes(extra_files[name])
+        os.replace(tmp_path, target)
+        written.append(target)
+    return written
+
+
+def export_artifact(
+    client,
+    collection_name: str,
+    path: Optional[Path] = None,
+    index_version: Optional[str] = None,
+    extra_files: Optional[Dict[str, Path]] = None
+) -> Dict[str, Any]:
+    """
+    Snapshot a collection into a single tar file and return its manifest.
+
+    Summary points from the collection's sibling summary collection are
+    stored with the chunks (told apart by their payload "level"). Vectors
+    are stored as an (N, dimension) float32 .npy next to the point
+    ids and one JSON payload per line; `extra_files` (default: the
+    auxiliary indexes built alongside the collection) are bundled as-is.
+    Every member is listed in the manifest with its SHA-256.
+    """
+    import numpy as np
+    from .hierarchy import summary_collection
+
+    if extra_files is None:
+        extra_files = auxiliary_index_paths()
+
+    ids, vectors, payloads = _read_points(client, collection_name)
+    summary_points = 0
+    if client.collection_exists(summary_collection(collection_name)):
+        summary_ids, summary_vectors, summary_payloads = _read_points(client, summary_collection(collection_name))
+        ids, vectors, payloads = ids + summary_ids, vectors + summary_vectors, payloads + summary_payloads
+        summary_points = len(summary_ids)
+    vector_array = np.asarray(vectors, dtype=np.float32)
+    if vector_array.ndim != 2:
+        vector_array = vector_array.reshape(len(ids), -1)
+
+    members = {
+        IDS_NAME: _npy_bytes(np.asarray(ids, dtype=np.uint64)),
+        VECTORS_NAME: _npy_bytes(vector_array),
+        PAYLOADS_NAME: "".join(json.dumps(payload, ensure_ascii=False) + "\n" for payload in payloads).encode("utf-8")
+    }
+    for name, extra_path in extra_files.items():
+        extra_path = Path(extra_path)
+        if extra_path.exists():
+            members[name] = extra_path.read_bytes()
+
+    manifest = {
+        "format": ARTIFACT_FORMAT_VERSION,
+        "created_at": datetime.utcnow().isoformat(),
+        "collection": collection_name,
+        "index_version": index_version,
+        "embedding_model": EMBEDDING_MODEL,
+        "dimension": int(vector_array.shape[1]) if len(ids) else 0,
+        "points": len(ids),
+        "summary_points": summary_points,
+        "files": {
+            name: {"sha256": hashlib.sha256(data).hexdigest(), "bytes": len(data)}
+            for name, data in members.items()
+        }
+    }
+
+    path = Path(path or settings.index_artifact_path or DEFAULT_ARTIFACT_PATH)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with tarfile.open(tmp_path, "w") as tar:
+        for name, data in [(MANIFEST_NAME, json.dumps(manifest, indent=2).encode("utf-8")), *members.items()]:
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mtime = int(datetime.utcnow().timestamp())
+            tar.addfile(info, io.BytesIO(data))
+    os.replace(tmp_path, path)
+
+    logger.info(f"Exported {len(ids)} points from {collection_name} to {path}")
+    return manifest
+
+
+def artifact_digest(manifest: Dict[str, Any]) -> str:
+    """Content digest of an artifact (its members' checksums), independent of when it was written"""
+    checksums = json.dumps({name: info["sha256"] for name, info in manifest["files"].items()}, sort_keys=True)
+    return hashlib.sha256(checksums.encode("utf-8")).hexdigest()
+
+
+def download_artifact(url: str, path: Optional[Path] = None, timeout: float = 300.0) -> Dict[str, Any]:
+    """
+    Download an artifact (e.g. a release asset) and return its manifest.
+
+    The file only replaces `path` once every member has been verified, so
+    a failed download leaves any previous artifact in place.
+    """
+    import httpx
+
+    path = Path(path or settings.index_artifact_path or DEFAULT_ARTIFACT_PATH)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".download")
+    try:
+        with httpx.stream("GET", url, follow_redirects=True, timeout=timeout) as response:
+            response.raise_for_status()
+            with open(tmp_path, "wb") as f:
+                for block in response.iter_bytes():
+                    f.write(block)
+        manifest, _ = read_artifact(tmp_path)
+    except httpx.HTTPError as e:
+        tmp_path.unlink(missing_ok=True)
+        raise ArtifactError(f"download failed from {url}: {e}")
+    except ArtifactError:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    os.replace(tmp_path, path)
+
+    logger.info(f"Downloaded artifact ({manifest['points']} points) from {url} to {path}")
+    return manifest
+
+
+def read_artifact(path: Optional[Path] = None) -> Tuple[Dict[str, Any], Dict[str, bytes]]:
+    """
+    Read an artifact and verify every member against the manifest.
+
+    Returns (manifest, {member name: bytes}); raises ArtifactError on a
+    missing file, unknown format or checksum mismatch.
+    """
+    path = Path(path or settings.index_artifact_path or DEFAULT_ARTIFACT_PATH)
+    if not path.exists():
+        raise ArtifactError(f"artifact not found: {path}")
+
+    try:
+        with tarfile.open(path, "r") as tar:
+            data = {member.name: tar.extractfile(member).read() for member in tar.getmembers() if member.isfile()}
+        manifest = json.loads(data.pop(MANIFEST_NAME))
+    except (tarfile.TarError, KeyError, ValueError) as e:
+        raise ArtifactError(f"unreadable artifact {path}: {e}")
+
+    if manifest.get("format") != ARTIFACT_FORMAT_VERSION:
+        raise ArtifactError(f"unsupported artifact format {manifest.get('format')}")
+
+    for name, expected in manifest["files"].items():
+        if name not in data:
+            raise ArtifactError(f"artifact is missing {name}")
+        if hashlib.sha256(data[name]).hexdigest() != expected["sha256"]:
+            raise ArtifactError(f"checksum mismatch for {name}")
+    return manifest, data
+
+
+def restore_artifact(
+    client,
+    alias: str,
+    path: Optional[Path] = None,
+    batch_size: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Bulk-load a verified artifact into the next index version for an alias.
+
+    The stored vectors are uploaded as-is, so the embedding model is never
+    loaded. Summary points go to the new version's summary collection.
+    Nothing is served yet (see switch_alias), and the version is dropped if
+    the upload fails or a point count does not match. Returns the
+    collection name, its chunk count, the manifest and the bundled extra
+    files.
+    """
+    import numpy as np
+    from .hierarchy import SUMMARY_LEVELS, summary_collection
+    from .index_versions import create_version, delete_version
+    from .qdrant_schema import create_collection
+
+    manifest, data = read_artifact(path)
+    if not manifest["points"]:
+        raise ArtifactError("artifact is empty")
+    if manifest["embedding_model"] != EMBEDDING_MODEL:
+        raise ArtifactError(
+            f"artifact embeddings are from {manifest['embedding_model']}, this build uses {EMBEDDING_MODEL}"
+        )
+
+    ids = np.load(io.BytesIO(data.pop(IDS_NAME)), allow_pickle=False)
+    vectors = np.load(io.BytesIO(data.pop(VECTORS_NAME)), allow_pickle=False)
+    payloads = [json.loads(line) for line in data.pop(PAYLOADS_NAME).decode("utf-8").splitlines()]
+    if not (len(ids) == len(vectors) == len(payloads) == manifest["points"]):
+        raise ArtifactError("artifact point counts disagree with the manifest")
+
+    # Artifacts written before summaries had their own collection mix both kinds too
+    is_summary = np.array([payload.get("level") in SUMMARY_LEVELS for payload in payloads], dtype=bool)
+    collection_name = create_version(client, alias, manifest["dimension"])
+    try:
+        for target, selected in (
+            (collection_name, ~is_summary),
+            (summary_collection(collection_name), is_summary)
+        ):
+            if not selected.any():
+                continue
+            if target != collection_name:
+                create_collection(client, target, manifest["dimension"])
+            client.upload_collection(
+                collection_name=target,
+                vectors=vectors[selected],
+                payload=[payload for payload, keep in zip(payloads, selected) if keep],
+                ids=ids[selected].tolist(),
+                batch_size=batch_size or settings.index_restore_batch_size,
+                wait=True
+            )
+            restored = client.count(target, exact=True).count
+            if restored != int(selected.sum()):
+                raise ArtifactError(f"restored {restored} of {int(selected.sum())} points into {target}")
+    except Exception:
+        delete_version(client, collection_name)
+        raise
+
+    chunks = int((~is_summary).sum())
+    logger.info(f"Restored {chunks} chunks and {int(is_summary.sum())} summaries into {collection_name}")
+    return {"collection": collection_name, "chunks": chunks, "manifest": manifest, "extra_files": data}
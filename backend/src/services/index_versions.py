@@ -0,0 +1,131 @@
+"""
+Index Versions
+Blue/green Qdrant collections ("{alias}-v1", "{alias}-v2", ...) served through an alias;
+each version's summaries ("{alias}-vN-summaries") are served through "{alias}-summaries"
+"""
+
+from typing import List, Optional, Tuple
+import logging
+import re
+
+from ..models.config import settings
+from .qdrant_schema import create_collection, resolve_alias
+from .hierarchy import summary_collection
+
+logger = logging.getLogger(__name__)
+
+
+class EmptyVersionError(Exception):
+    """Raised when asked to serve a version that holds no points"""
+
+
+def versioned_name(alias: str, number: int) -> str:
+    return f"{alias}-v{number}"
+
+
+def list_versions(client, alias: str) -> List[Tuple[int, str]]:
+    """Versioned collections for an alias as (number, name), oldest first"""
+    pattern = re.compile(rf"^{re.escape(alias)}-v(\d+)$")
+    versions = []
+    for collection in client.get_collections().collections:
+        match = pattern.match(collection.name)
+        if match:
+            versions.append((int(match.group(1)), collection.name))
+    return sorted(versions)
+
+
+def create_version(client, alias: str, dimension: int) -> str:
+    """Create the next versioned collection (not yet served)"""
+    versions = list_versions(client, alias)
+    name = versioned_name(alias, versions[-1][0] + 1 if versions else 1)
+    create_collection(client, name, dimension)
+    return name
+
+
+def delete_version(client, collection_name: str):
+    """Delete a versioned collection and its summaries"""
+    client.delete_collection(collection_name)
+    if client.collection_exists(summary_collection(collection_name)):
+        client.delete_collection(summary_collection(collection_name))
+
+
+def switch_alias(client, alias: str, collection_name: str) -> Optional[str]:
+    """
+    Atomically point the alias at a collection; returns the previous target.
+
+    The summaries alias moves with it, or is removed when the collection
+    has no summaries. Nothing is deleted here: Qdrant cannot alias over a
+    collection, so an alias name still used by a pre-versioning collection
+    is refused (serve the versions under a new alias name; the old
+    collection stays live until then and is pruned afterwards).
+    """
+    from qdrant_client.models import (
+        CreateAlias, CreateAliasOperation, DeleteAlias, DeleteAliasOperation
+    )
+
+    previous = resolve_alias(client, alias)
+    collections = {c.name for c in client.get_collections().collections}
+    operations = []
+    for name, target in (
+        (alias, collection_name),
+        (summary_collection(alias), summary_collection(collection_name))
+    ):
+        if resolve_alias(client, name) is not None:
+            operations.append(DeleteAliasOperation(delete_alias=DeleteAlias(alias_name=name)))
+        elif name in collections:
+            raise ValueError(
+                f"{name} is a collection, not an alias - set QDRANT_COLLECTION_NAME to a new alias name"
+            )
+        if name == alias or target in collections:
+            operations.append(CreateAliasOperation(
+                create_alias=CreateAlias(collection_name=target, alias_name=name)
+            ))
+    client.update_collection_aliases(change_aliases_operations=operations)
+    logger.info(f"Alias {alias}: {previous} -> {collection_name}")
+    return previous
+
+
+def ensure_not_empty(client, collection_name: str):
+    """Refuse to serve a collection without points (e.g. a build that never finished)"""
+    if client.count(collection_name, exact=True).count == 0:
+        raise EmptyVersionError(f"{collection_name} has no points")
+
+
+def rollback(client, alias: str) -> Optional[str]:
+    """
+    Point the alias at the newest version older than the live one; returns it.
+
+    Raises EmptyVersionError (leaving the alias alone) if that version is empty.
+    """
+    versions = list_versions(client, alias)
+    live = resolve_alias(client, alias)
+    live_number = next((n for n, name in versions if name == live), None)
+    older = [name for n, name in versions if live_number is None or n < live_number]
+    if not older:
+        return None
+    ensure_not_empty(client, older[-1])
+    switch_alias(client, alias, older[-1])
+    return older[-1]
+
+
+def prune_versions(client, alias: str, keep: Optional[int] = None) -> List[str]:
+    """
+    Delete old versions, keeping the newest `keep` (settings.qdrant_keep_versions).
+
+    The live collection is never deleted. A pre-versioning collection named
+    like a version (e.g. "robotics-textbook-v1" under the
+    "robotics-textbook" alias) counts as the oldest one, so it is only
+    dropped once newer versions are served.
+    """
+    keep = settings.qdrant_keep_versions if keep is None else keep
+    live = resolve_alias(client, alias)
+    versions = [name for _, name in list_versions(client, alias)]
+    deleted = []
+    for name in versions[:max(0, len(versions) - keep)]:
+        if name == live:
+            continue
+        delete_version(client, name)
+        deleted.append(name)
+    if deleted:
+        logger.info(f"Deleted old index versions: {deleted}")
+    return deleted
@@ -1,12 +1,18 @@
 """
 LLM Service
-Handles chat completions using Groq API with strict RAG grounding
+Handles chat completions through a pluggable LLM provider with strict RAG grounding
 """
 
 from typing import List, Dict, Optional
 import logging
+import re
 
 from ..models.config import settings
+from ..utils.circuit_breaker import get_circuit_breaker, CircuitOpenError
+from ..utils.startup import startup_timeline
+from .llm_providers import create_provider, estimate_tokens, Completion
+from .usage import get_usage_tracker
+from .extractive import get_extractive_service
 
 logger = logging.getLogger(__name__)
 
@@ -14,49 +20,87 @@ logger = logging.getLogger(__name__)
 REFUSAL_NO_CONTENT = "The answer is not available in the selected content."
 REFUSAL_NO_TRANSLATION = "The requested content is not available for translation."
 
+GROUNDED_SYSTEM_PROMPT = """You are a technical assistant for a Physical AI and Humanoid Robotics textbook.
+
+STRICT RULES:
+1. Answer ONLY based on the provided context below
+2. If the context does not contain information to answer the question, respond exactly: "The answer is not available in the selected content."
+3. Do NOT add information beyond what is in the context
+4. Do NOT make assumptions or inferences not supported by the context
+5. Keep responses concise and technical
+6. Cite the source chapter/section when relevant
+
+CONTEXT:
+{context}"""
+
+HISTORY_PROMPT = """
+
+CONVERSATION SO FAR (only for resolving references like "it" or "they"; NOT a source of facts):
+{history}"""
+
 
 class LLMService:
-    """Service for grounded LLM responses using Groq (lazy initialization)"""
+    """Service for grounded LLM responses (lazy initialization)"""
 
     _instance = None
-    _client = None
+    _provider = None
     _initialized = False
+    _breaker = None
 
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
+            cls._instance._breaker = get_circuit_breaker(
+                "llm",
+                slow_call_seconds=settings.breaker_llm_slow_seconds,
+                on_half_open=cls._instance._reconnect
+            )
         return cls._instance
 
     def _ensure_initialized(self):
-        """Lazy initialize Groq client"""
+        """Lazy initialize the configured LLM provider"""
         if self._initialized:
             return
 
-        if not settings.is_groq_configured:
-            logger.warning("Groq not configured - LLM responses will use fallback")
-            self._initialized = True
-            return
-
         try:
-            from groq import Groq
-            self._client = Groq(api_key=settings.groq_api_key)
-            self._initialized = True
-            logger.info("Groq client initialized successfully")
+            with startup_timeline.stage("llm_provider"):
+                self._provider = create_provider()
+            if self._provider:
+                logger.info(f"LLM provider initialized: {self._provider.name} ({self._provider.model})")
+            else:
+                logger.warning("LLM provider not configured - LLM responses will use fallback")
         except Exception as e:
-            logger.error(f"Failed to initialize Groq: {e}")
-            self._initialized = True
+            logger.error(f"Failed to initialize LLM provider: {e}")
+        self._initialized = True
+
+    def _reconnect(self):
+        """Recreate the provider client before a half-open probe"""
+        provider = create_provider()
+        if provider is not None:
+            self._provider = provider
+            logger.info(f"LLM provider reconnected: {provider.name}")
+
+    def _provider_chat(self, **kwargs) -> Completion:
+        # Resolved per call so a half-open reconnect takes effect for the probe
+        return self._provider.chat(**kwargs)
 
     @property
     def is_available(self) -> bool:
         """Check if LLM service is configured"""
         self._ensure_initialized()
-        return self._client is not None
+        return self._provider is not None
+
+    def ping(self) -> bool:
+        """Check the provider is reachable (no completion quota used)"""
+        self._ensure_initialized()
+        return self._provider is not None and self._provider.ping()
 
     def generate_grounded_response(
         self,
         query: str,
         retrieved_chunks: List[Dict],
-        selected_text: Optional[str] = None
+        selected_text: Optional[str] = None,
+        history: Optional[str] = None
     ) -> str:
         """
         Generate response strictly grounded in retrieved content.
@@ -67,60 +111,122 @@ class LLMService:
         if not retrieved_chunks:
             return REFUSAL_NO_CONTENT
 
-        # Build context from retrieved chunks
+        # No LLM provider configured, or token budget nearly spent:
+        # answer from the book without the LLM
+        if not self._provider or not get_usage_tracker().plan().allows_llm:
+            return self.extractive_response(query, retrieved_chunks, selected_text)
+
+        return self.complete(
+            self.render_system_prompt(self.build_context(retrieved_chunks, selected_text), history),
+            query,
+            chapter=retrieved_chunks[0]["chapter"]
+        )
+
+    @staticmethod
+    def extractive_response(
+        query: str,
+        retrieved_chunks: List[Dict],
+        selected_text: Optional[str] = None
+    ) -> str:
+        """
+        Answer without the LLM: the sentences most similar to the query,
+        cited by section. Falls back to the opening sentences of the best
+        source when sentence embeddings are unavailable.
+        """
+        if not retrieved_chunks:
+            return REFUSAL_NO_CONTENT
+
+        try:
+            answer = get_extractive_service().answer(query, retrieved_chunks, selected_text)
+            if answer:
+                return answer
+        except Exception as e:
+            logger.warning(f"Extractive ranking failed, using leading sentences: {e}")
+
+        chunk = retrieved_chunks[0]
+        text = (selected_text or chunk["content"]).strip()
+        sentences = re.split(r'(?<=[.!?])\s+', text)
+        excerpt = " ".join(sentences[:settings.extractive_max_sentences])
+        return f"{excerpt}\n\n[Source: {chunk['chapter']} - {chunk['section']}]"
+
+    @staticmethod
+    def build_context(
+        retrieved_chunks: List[Dict],
+        selected_text: Optional[str] = None
+    ) -> str:
+        """Build the grounding context from selected text or retrieved chunks"""
         if selected_text:
-            context = selected_text
-        else:
-            context = "\n\n".join([
-                f"[{chunk['chapter']} - {chunk['section']}]\n{chunk['content']}"
-                for chunk in retrieved_chunks
-            ])
+            return selected_text
+        return "\n\n".join([
+            f"[{chunk['chapter']} - {chunk['section']}]\n{chunk['content']}"
+            for chunk in retrieved_chunks
+        ])
 
-        # If Groq not configured, return context summary
-        if not self._client:
-            return f"[Demo Mode - Groq not configured]\n\nBased on retrieved content:\n{context[:500]}..."
+    @staticmethod
+    def render_system_prompt(context: str, history: Optional[str] = None) -> str:
+        """Render the grounded system prompt for a context (and optional history)"""
+        prompt = GROUNDED_SYSTEM_PROMPT.format(context=context)
+        if history:
+            prompt += HISTORY_PROMPT.format(history=history)
+        return prompt
 
-        system_prompt = """You are a technical assistant for a Physical AI and Humanoid Robotics textbook.
+    def complete(self, system_prompt: str, query: str, chapter: Optional[str] = None) -> str:
+        """
+        Run a grounded chat completion for a pre-rendered system prompt.
 
-STRICT RULES:
-1. Answer ONLY based on the provided context below
-2. If the context does not contain information to answer the question, respond exactly: "The answer is not available in the selected content."
-3. Do NOT add information beyond what is in the context
-4. Do NOT make assumptions or inferences not supported by the context
-5. Keep responses concise and technical
-6. Cite the source chapter/section when relevant
+        max_tokens and the model follow the token budget plan; once the
+        budget is spent this refuses instead of calling the provider.
+        """
+        self._ensure_initialized()
 
-CONTEXT:
-{context}"""
+        if not self._provider:
+            return REFUSAL_NO_CONTENT
+
+        tracker = get_usage_tracker()
+        plan = tracker.plan()
+        if not plan.allows_llm:
+            logger.warning(f"Token budget at {plan.pressure:.0%} - not calling the LLM")
+            return REFUSAL_NO_CONTENT
 
         try:
-            response = self._client.chat.completions.create(
-                model=settings.groq_model,
+            completion = self._breaker.call(
+                self._provider_chat,
                 messages=[
                     {
                         "role": "system",
-                        "content": system_prompt.format(context=context)
+                        "content": system_prompt
                     },
                     {
                         "role": "user",
                         "content": query
                     }
                 ],
-                max_tokens=settings.groq_max_tokens,
-                temperature=0.1
+                max_tokens=plan.max_tokens,
+                temperature=0.1,
+                model=plan.model
             )
-            return response.choices[0].message.content
+        except CircuitOpenError:
+            logger.warning("LLM circuit open - refusing without calling the provider")
+            return REFUSAL_NO_CONTENT
         except Exception as e:
             logger.error(f"LLM generation failed: {e}")
             return REFUSAL_NO_CONTENT
 
+        tracker.record(completion.model, completion.prompt_tokens, completion.completion_tokens, chapter)
+        return completion.text
+
     def translate_content(
         self,
         content: str,
-        target_language: str
+        target_language: str,
+        chapter: Optional[str] = None
     ) -> str:
         """
-        Translate retrieved content to target language.
+        Translate one segment of retrieved content to the target language.
+
+        Placeholders like ⟦0⟧ stand for code and technical terms and must
+        come back unchanged (see services/translation.py). Output is sized
+        to the segment; returns REFUSAL_NO_TRANSLATION on any failure.
         """
         self._ensure_initialized()
 
@@ -133,8 +239,8 @@ CONTEXT:
         if not content or not content.strip():
             return REFUSAL_NO_TRANSLATION
 
-        # If Groq not configured
-        if not self._client:
+        # If no LLM provider configured
+        if not self._provider:
             return f"[Demo Mode - Translation to {target_language} not available without Groq API key]"
 
         language_names = {
@@ -150,13 +256,22 @@ STRICT RULES:
 3. Keep all technical terms, code identifiers, and proper nouns untranslated
 4. Maintain the original paragraph and list structure
 5. Do NOT add any commentary or clarifications
+6. Copy every placeholder such as ⟦0⟧ exactly as it appears, in the matching position
 
 TEXT TO TRANSLATE:
 {content}"""
 
+        # Translations are never shortened (a cut-off translation is wrong),
+        # only moved to the small model, and refused once the budget is spent
+        tracker = get_usage_tracker()
+        plan = tracker.plan()
+        if not plan.allows_llm:
+            logger.warning(f"Token budget at {plan.pressure:.0%} - translation not attempted")
+            return REFUSAL_NO_TRANSLATION
+
         try:
-            response = self._client.chat.completions.create(
-                model=settings.groq_model,
+            completion = self._breaker.call(
+                self._provider_chat,
                 messages=[
                     {
                         "role": "system",
@@ -167,14 +282,20 @@ TEXT TO TRANSLATE:
                         "content": f"Translate to {language_names[target_language.lower()]}"
                     }
                 ],
-                max_tokens=settings.groq_max_tokens * 2,
-                temperature=0.1
+                max_tokens=min(settings.groq_max_tokens * 2, 64 + estimate_tokens(content) * 4),
+                temperature=0.1,
+                model=plan.model
             )
-            return response.choices[0].message.content
+        except CircuitOpenError:
+            logger.warning("LLM circuit open - translation not attempted")
+            return REFUSAL_NO_TRANSLATION
         except Exception as e:
             logger.error(f"Translation failed: {e}")
             return REFUSAL_NO_TRANSLATION
 
+        tracker.record(completion.model, completion.prompt_tokens, completion.completion_tokens, chapter)
+        return completion.text
+
 
 def get_llm_service() -> LLMService:
     """Get or create LLM service instance"""
@@ -0,0 +1,247 @@
+"""
+LLM Providers
+Chat completion backends behind a common interface (Groq, OpenAI-compatible HTTP, fake)
+"""
+
+from abc import ABC, abstractmethod
+from typing import List, Dict, Optional
+import hashlib
+import logging
+import random
+import time
+
+from ..models.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token) for backends without usage data"""
+    return max(1, len(text) // 4)
+
+
+class Completion:
+    """Assistant message plus the token usage reported by the backend"""
+
+    __slots__ = ("text", "model", "prompt_tokens", "completion_tokens")
+
+    def __init__(self, text: str, model: str, prompt_tokens: int, completion_tokens: int):
+        self.text = text
+        self.model = model
+        self.prompt_tokens = prompt_tokens
+        self.completion_tokens = completion_tokens
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+
+class LLMProvider(ABC):
+    """Chat completion backend"""
+
+    name: str = "base"
+
+    def __init__(self, model: str):
+        self.model = model
+
+    @abstractmethod
+    def chat(
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        temperature: float = 0.1,
+        model: Optional[str] = None
+    ) -> Completion:
+        """Complete a list of chat messages (with `model` overriding the default)"""
+
+    def ping(self) -> bool:
+        """Cheap reachability check that does not consume completion quota"""
+        return True
+
+
+class GroqProvider(LLMProvider):
+    """Groq SDK backend"""
+
+    name = "groq"
+
+    def __init__(self, model: str, api_key: str):
+        super().__init__(model)
+        from groq import Groq
+        self._client = Groq(api_key=api_key)
+
+    def chat(
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        temperature: float = 0.1,
+        model: Optional[str] = None
+    ) -> Completion:
+        response = self._client.chat.completions.create(
+            model=model or self.model,
+            messages=messages,
+            max_tokens=max_tokens,
+            temperature=temperature
+        )
+        text = response.choices[0].message.content
+        usage = response.usage
+        return Completion(
+            text=text,
+            model=response.model or model or self.model,
+            prompt_tokens=usage.prompt_tokens if usage else estimate_tokens(str(messages)),
+            completion_tokens=usage.completion_tokens if usage else estimate_tokens(text)
+        )
+
+    def ping(self) -> bool:
+        self._client.models.list()
+        return True
+
+
+class OpenAICompatibleProvider(LLMProvider):
+    """
+    Plain HTTP backend for any OpenAI-compatible /chat/completions server
+    (llama.cpp server, vLLM, scripts/llm_stub_server.py, ...).
+    """
+
+    name = "openai"
+
+    def __init__(
+        self,
+        model: str,
+        base_url: str,
+        api_key: Optional[str] = None,
+        timeout: float = 30.0
+    ):
+        super().__init__(model)
+        import httpx
+        headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+        self._client = httpx.Client(
+            base_url=base_url.rstrip("/"),
+            headers=headers,
+            timeout=timeout
+        )
+
+    def chat(
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        temperature: float = 0.1,
+        model: Optional[str] = None
+    ) -> Completion:
+        response = self._client.post("/chat/completions", json={
+            "model": model or self.model,
+            "messages": messages,
+            "max_tokens": max_tokens,
+            "temperature": temperature
+        })
+        response.raise_for_status()
+        data = response.json()
+        text = data["choices"][0]["message"]["content"]
+        usage = data.get("usage") or {}
+        return Completion(
+            text=text,
+            model=data.get("model") or model or self.model,
+            prompt_tokens=usage.get("prompt_tokens") or estimate_tokens(str(messages)),
+            completion_tokens=usage.get("completion_tokens") or estimate_tokens(text)
+        )
+
+    def ping(self) -> bool:
+        self._client.get("/models").raise_for_status()
+        return True
+
+
+class FakeProvider(LLMProvider):
+    """
+    Deterministic in-process backend for offline load tests.
+
+    Sleeps for `latency_ms` plus up to `jitter_ms` (seeded from the prompt,
+    so the same request always takes the same time) plus `ms_per_token` per
+    completion token, and answers with the opening words of the prompt's
+    context (translations echo the whole text). A share of calls given by
+    `error_rate` fails after the delay, for fault-injection runs.
+    """
+
+    name = "fake"
+
+    def __init__(
+        self,
+        model: str = "fake",
+        latency_ms: float = 200.0,
+        jitter_ms: float = 0.0,
+        seed: int = 0,
+        error_rate: float = 0.0,
+        ms_per_token: float = 0.0
+    ):
+        super().__init__(model)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.seed = seed
+        self.error_rate = error_rate
+        self.ms_per_token = ms_per_token
+        self._faults = random.Random(seed)
+
+    def latency_for(self, messages: List[Dict[str, str]]) -> float:
+        """Injected latency in seconds for a request"""
+        digest = hashlib.blake2b(
+            repr((self.seed, messages)).encode("utf-8"), digest_size=8
+        ).digest()
+        jitter = random.Random(digest).random() * self.jitter_ms
+        return (self.latency_ms + jitter) / 1000
+
+    def chat(
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        temperature: float = 0.1,
+        model: Optional[str] = None
+    ) -> Completion:
+        model = model or self.model
+        system = messages[0]["content"] if messages else ""
+        if "TEXT TO TRANSLATE:" in system:
+            words = system.split("TEXT TO TRANSLATE:", 1)[1].split()
+        else:
+            words = system.split("CONTEXT:", 1)[-1].split()[:max(1, min(max_tokens, 60))]
+        text = f"[{self.name}:{model}] " + " ".join(words)
+
+        time.sleep(self.latency_for(messages) + estimate_tokens(text) * self.ms_per_token / 1000)
+        if self.error_rate and self._faults.random() < self.error_rate:
+            raise RuntimeError("injected provider failure")
+
+        return Completion(
+            text=text,
+            model=model,
+            prompt_tokens=sum(estimate_tokens(m.get("content", "")) for m in messages),
+            completion_tokens=estimate_tokens(text)
+        )
+
+
+def create_provider() -> Optional[LLMProvider]:
+    """Create the provider selected by settings.llm_provider (None if unconfigured)"""
+    provider = settings.llm_provider.lower()
+    model = settings.llm_model or settings.groq_model
+
+    if provider == "groq":
+        if not settings.is_groq_configured:
+            return None
+        return GroqProvider(model=model, api_key=settings.groq_api_key)
+
+    if provider == "openai":
+        if not settings.llm_base_url:
+            logger.warning("llm_provider=openai but llm_base_url is not set")
+            return None
+        return OpenAICompatibleProvider(
+            model=model,
+            base_url=settings.llm_base_url,
+            api_key=settings.llm_api_key,
+            timeout=settings.llm_timeout_seconds
+        )
+
+    if provider == "fake":
+        return FakeProvider(
+            model=settings.llm_model or "fake",
+            latency_ms=settings.fake_llm_latency_ms,
+            jitter_ms=settings.fake_llm_jitter_ms,
+            seed=settings.fake_llm_seed
+        )
+
+    logger.error(f"Unknown llm_provider: {settings.llm_provider}")
+    return None
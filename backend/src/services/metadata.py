@@ -0,0 +1,144 @@
+"""
+Metadata Service
+Reads and updates system metadata (index version) in Neon PostgreSQL
+"""
+
+from typing import Optional, Dict, Any
+from datetime import datetime
+import json
+import logging
+import time
+
+from ..models.config import settings
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION_KEY = "index_version"
+TOTAL_CHUNKS_KEY = "total_chunks"
+
+
+def next_version(version: Optional[str]) -> str:
+    """Increment the patch component of a semantic version string"""
+    try:
+        major, minor, patch = (int(part) for part in (version or "").split("."))
+    except ValueError:
+        return "1.0.0"
+    return f"{major}.{minor}.{patch + 1}"
+
+
+class MetadataService:
+    """Service for the Neon metadata key-value table (lazy connections)"""
+
+    _instance = None
+    _index_version: Optional[str] = None
+    _index_version_checked_at: float = 0.0
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def _connect(self):
+        """Open a connection to Neon PostgreSQL"""
+        import psycopg
+        return psycopg.connect(settings.neon_database_url, connect_timeout=5)
+
+    @property
+    def is_available(self) -> bool:
+        """Check if metadata storage is configured"""
+        return settings.is_neon_configured
+
+    def get_value(self, key: str) -> Optional[Dict[str, Any]]:
+        """Read a metadata value by key"""
+        if not self.is_available:
+            return None
+
+        try:
+            with self._connect() as conn:
+                with conn.cursor() as cur:
+                    cur.execute("SELECT value FROM metadata WHERE key = %s", (key,))
+                    row = cur.fetchone()
+            return row[0] if row else None
+        except Exception as e:
+            logger.error(f"Failed to read metadata '{key}': {e}")
+            return None
+
+    def set_value(self, key: str, value: Dict[str, Any]) -> bool:
+        """Insert or update a metadata value"""
+        if not self.is_available:
+            return False
+
+        try:
+            with self._connect() as conn:
+                with conn.cursor() as cur:
+                    cur.execute(
+                        """
+                        INSERT INTO metadata (key, value, updated_at)
+                        VALUES (%s, %s::jsonb, NOW())
+                        ON CONFLICT (key) DO UPDATE
+                        SET value = EXCLUDED.value, updated_at = NOW()
+                        """,
+                        (key, json.dumps(value))
+                    )
+                conn.commit()
+            return True
+        except Exception as e:
+            logger.error(f"Failed to write metadata '{key}': {e}")
+            return False
+
+    def get_index_version(self, max_age: Optional[float] = None) -> Optional[str]:
+        """
+        Get the current index version.
+
+        The value is cached in-process and re-read from Neon at most once
+        every `max_age` seconds (defaults to settings.index_version_check_seconds).
+        """
+        if max_age is None:
+            max_age = settings.index_version_check_seconds
+
+        now = time.monotonic()
+        if self._index_version_checked_at and now - self._index_version_checked_at < max_age:
+            return self._index_version
+
+        value = self.get_value(INDEX_VERSION_KEY)
+        self._index_version_checked_at = now
+        if value is not None:
+            self._index_version = value.get("version")
+        return self._index_version
+
+    def bump_index_version(
+        self,
+        total_chunks: Optional[int] = None,
+        collection: Optional[str] = None,
+        artifact: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Record a new index version (and the collection serving it) after
+        ingestion; `artifact` is the digest of the artifact it was restored from
+        """
+        current = self.get_value(INDEX_VERSION_KEY) or {}
+        version = next_version(current.get("version"))
+
+        value = {
+            "version": version,
+            "indexed_at": datetime.utcnow().isoformat()
+        }
+        if collection:
+            value["collection"] = collection
+        if artifact:
+            value["artifact"] = artifact
+        if not self.set_value(INDEX_VERSION_KEY, value):
+            return None
+
+        if total_chunks is not None:
+            self.set_value(TOTAL_CHUNKS_KEY, {"count": total_chunks})
+
+        self._index_version = version
+        self._index_version_checked_at = time.monotonic()
+        logger.info(f"Index version bumped to {version}")
+        return version
+
+
+def get_metadata_service() -> MetadataService:
+    """Get or create metadata service instance"""
+    return MetadataService()
@@ -0,0 +1,132 @@
+"""
+Provenance Service
+Fast check that text comes from the indexed book using word-shingle fingerprints
+"""
+
+from typing import Dict, Iterable, List, Optional, Set
+from pathlib import Path
+import hashlib
+import json
+import logging
+import re
+
+from ..models.config import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INDEX_PATH = Path(__file__).parent.parent.parent / "data" / "provenance_index.json"
+INDEX_FORMAT_VERSION = 1
+
+_TOKEN_PATTERN = re.compile(r"[^\W_]+")
+
+
+def normalize_words(text: str) -> List[str]:
+    """Lowercase text and reduce it to word tokens (drops markdown and punctuation)"""
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+def shingle_hashes(words: List[str], size: int) -> Iterable[int]:
+    """Yield 64-bit fingerprints of every run of `size` consecutive words"""
+    for i in range(len(words) - size + 1):
+        shingle = " ".join(words[i:i + size]).encode("utf-8")
+        yield int.from_bytes(hashlib.blake2b(shingle, digest_size=8).digest(), "big")
+
+
+def build_provenance_index(chunks: List[Dict], shingle_size: Optional[int] = None) -> Dict:
+    """Build a serializable fingerprint index from ingested chunks"""
+    size = shingle_size or settings.provenance_shingle_size
+    hashes: Set[int] = set()
+    for chunk in chunks:
+        hashes.update(shingle_hashes(normalize_words(chunk["content"]), size))
+
+    return {
+        "format": INDEX_FORMAT_VERSION,
+        "shingle_size": size,
+        "chunk_count": len(chunks),
+        "hashes": sorted(hashes)
+    }
+
+
+def write_provenance_index(index: Dict, path: Optional[Path] = None) -> Path:
+    """Write a fingerprint index to disk"""
+    path = Path(path or settings.provenance_index_path or DEFAULT_INDEX_PATH)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(index, f)
+    return path
+
+
+class ProvenanceService:
+    """Service for exact-substring provenance checks (lazy loading)"""
+
+    _instance = None
+    _hashes: Optional[Set[int]] = None
+    _shingle_size: int = 0
+    _loaded_mtime: Optional[float] = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    @property
+    def index_path(self) -> Path:
+        return Path(settings.provenance_index_path or DEFAULT_INDEX_PATH)
+
+    def _ensure_loaded(self):
+        """Load the index file, reloading it if ingest has rewritten it"""
+        try:
+            mtime = self.index_path.stat().st_mtime
+        except OSError:
+            if self._hashes is not None:
+                logger.warning(f"Provenance index removed: {self.index_path}")
+            self._hashes = None
+            self._loaded_mtime = None
+            return
+
+        if mtime == self._loaded_mtime:
+            return
+
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+            if index.get("format") != INDEX_FORMAT_VERSION:
+                raise ValueError(f"unsupported format {index.get('format')}")
+            self._hashes = set(index["hashes"])
+            self._shingle_size = index["shingle_size"]
+            self._loaded_mtime = mtime
+            logger.info(f"Loaded provenance index ({len(self._hashes)} fingerprints)")
+        except Exception as e:
+            logger.error(f"Failed to load provenance index: {e}")
+            self._hashes = None
+            self._loaded_mtime = None
+
+    @property
+    def is_available(self) -> bool:
+        """Check if a fingerprint index is loaded"""
+        self._ensure_loaded()
+        return self._hashes is not None
+
+    def contains(self, text: str) -> bool:
+        """
+        Check that text appears verbatim (after normalization) in the book.
+
+        Returns False when the index is unavailable, the text is shorter than
+        one shingle, or any shingle is missing; callers should then fall back
+        to a fuzzy vector search.
+        """
+        self._ensure_loaded()
+
+        if not self._hashes:
+            return False
+
+        words = normalize_words(text)
+        if len(words) < self._shingle_size:
+            return False
+
+        return all(h in self._hashes for h in shingle_hashes(words, self._shingle_size))
+
+
+def get_provenance_service() -> ProvenanceService:
+    """Get or create provenance service instance"""
+    return ProvenanceService()
@@ -0,0 +1,189 @@
+"""
+Qdrant Collection Schema
+Declarative collection definition (from Settings) with create-or-migrate support
+"""
+
+from typing import Any, Dict, List, Optional
+import logging
+
+from ..models.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def vectors_config(dimension: int):
+    """Vector parameters for the collection"""
+    from qdrant_client.models import Distance, VectorParams
+    return VectorParams(
+        size=dimension,
+        distance=Distance.COSINE,
+        on_disk=settings.qdrant_vectors_on_disk
+    )
+
+
+def hnsw_config():
+    """HNSW index parameters"""
+    from qdrant_client.models import HnswConfigDiff
+    return HnswConfigDiff(
+        m=settings.qdrant_hnsw_m,
+        ef_construct=settings.qdrant_hnsw_ef_construct,
+        on_disk=settings.qdrant_hnsw_on_disk
+    )
+
+
+def quantization_config():
+    """Scalar int8 quantization, or None when disabled"""
+    if settings.qdrant_quantization != "int8":
+        return None
+    from qdrant_client.models import ScalarQuantization, ScalarQuantizationConfig, ScalarType
+    return ScalarQuantization(
+        scalar=ScalarQuantizationConfig(
+            type=ScalarType.INT8,
+            quantile=0.99,
+            always_ram=settings.qdrant_quantization_always_ram
+        )
+    )
+
+
+def search_params():
+    """Per-query search parameters (HNSW ef and quantization rescoring)"""
+    from qdrant_client.models import SearchParams, QuantizationSearchParams
+    quantization = None
+    if settings.qdrant_quantization == "int8":
+        quantization = QuantizationSearchParams(
+            rescore=settings.qdrant_rescore,
+            oversampling=settings.qdrant_oversampling
+        )
+    return SearchParams(hnsw_ef=settings.qdrant_search_ef, quantization=quantization)
+
+
+def create_collection(client, collection_name: str, dimension: int):
+    """Create a collection with the configured schema and payload indexes"""
+    logger.info(f"Creating collection: {collection_name}")
+    client.create_collection(
+        collection_name=collection_name,
+        vectors_config=vectors_config(dimension),
+        hnsw_config=hnsw_config(),
+        quantization_config=quantization_config(),
+        on_disk_payload=settings.qdrant_payload_on_disk
+    )
+    ensure_payload_indexes(client, collection_name)
+    logger.info("Collection created successfully")
+
+
+def ensure_payload_indexes(client, collection_name: str) -> List[str]:
+    """Create missing keyword payload indexes; returns the fields created"""
+    from qdrant_client.models import PayloadSchemaType
+
+    info = client.get_collection(collection_name)
+    existing = set((getattr(info, "payload_schema", None) or {}).keys())
+    created = []
+    for field in settings.qdrant_payload_indexes:
+        if field not in existing:
+            client.create_payload_index(
+                collection_name=collection_name,
+                field_name=field,
+                field_schema=PayloadSchemaType.KEYWORD
+            )
+            created.append(field)
+    return created
+
+
+def schema_diff(info) -> Dict[str, Any]:
+    """Settings that differ between an existing collection and the desired schema"""
+    diff: Dict[str, Any] = {}
+    config = info.config
+
+    hnsw = config.hnsw_config
+    for key, desired in (
+        ("m", settings.qdrant_hnsw_m),
+        ("ef_construct", settings.qdrant_hnsw_ef_construct),
+        ("on_disk", settings.qdrant_hnsw_on_disk),
+    ):
+        current = getattr(hnsw, key, None)
+        if key == "on_disk":
+            current = bool(current)
+        if current != desired:
+            diff[f"hnsw.{key}"] = (current, desired)
+
+    vectors = config.params.vectors
+    if bool(getattr(vectors, "on_disk", None)) != settings.qdrant_vectors_on_disk:
+        diff["vectors.on_disk"] = (getattr(vectors, "on_disk", None), settings.qdrant_vectors_on_disk)
+
+    if bool(getattr(config.params, "on_disk_payload", None)) != settings.qdrant_payload_on_disk:
+        diff["on_disk_payload"] = (getattr(config.params, "on_disk_payload", None), settings.qdrant_payload_on_disk)
+
+    current_quantization = "int8" if getattr(config, "quantization_config", None) else "none"
+    if current_quantization != settings.qdrant_quantization:
+        diff["quantization"] = (current_quantization, settings.qdrant_quantization)
+
+    existing_indexes = set((getattr(info, "payload_schema", None) or {}).keys())
+    missing = [f for f in settings.qdrant_payload_indexes if f not in existing_indexes]
+    if missing:
+        diff["payload_indexes"] = (sorted(existing_indexes), settings.qdrant_payload_indexes)
+
+    return diff
+
+
+def migrate_collection(client, collection_name: str) -> Dict[str, Any]:
+    """
+    Bring an existing collection in line with the configured schema.
+
+    Qdrant applies HNSW/quantization/on-disk changes in place and rebuilds
+    indexes in the background, so the collection stays queryable.
+    """
+    from qdrant_client.models import CollectionParamsDiff, Disabled, VectorParamsDiff
+
+    diff = schema_diff(client.get_collection(collection_name))
+    if not diff:
+        return diff
+
+    logger.info(f"Migrating collection {collection_name}: {diff}")
+    collection_changes = {k for k in diff if k != "payload_indexes"}
+    if collection_changes:
+        client.update_collection(
+            collection_name=collection_name,
+            vectors_config={"": VectorParamsDiff(on_disk=settings.qdrant_vectors_on_disk)},
+            hnsw_config=hnsw_config(),
+            quantization_config=quantization_config() or Disabled.DISABLED,
+            collection_params=CollectionParamsDiff(on_disk_payload=settings.qdrant_payload_on_disk)
+        )
+    ensure_payload_indexes(client, collection_name)
+    return diff
+
+
+def resolve_alias(client, name: str) -> Optional[str]:
+    """Collection an alias points to (None if `name` is not an alias)"""
+    for alias in client.get_aliases().aliases:
+        if alias.alias_name == name:
+            return alias.collection_name
+    return None
+
+
+def ensure_collection(client, collection_name: str, dimension: int) -> Dict[str, Any]:
+    """
+    Make `collection_name` queryable with the configured schema; returns applied changes.
+
+    An alias is migrated through its target collection. When the alias does
+    not exist yet, it is pointed at the newest non-empty versioned
+    collection ("{name}-vN", which includes a pre-versioning collection
+    named like one), or the first version is created, so later re-indexing
+    can switch versions atomically.
+    """
+    collection_names = [c.name for c in client.get_collections().collections]
+    if collection_name in collection_names:
+        return migrate_collection(client, collection_name)
+
+    target = resolve_alias(client, collection_name)
+    if target:
+        return migrate_collection(client, target)
+
+    from .index_versions import create_version, list_versions, switch_alias
+    for _, version in reversed(list_versions(client, collection_name)):
+        if client.count(version, exact=True).count:
+            migrate_collection(client, version)
+            switch_alias(client, collection_name, version)
+            return {"adopted": version, "alias": collection_name}
+    version = create_version(client, collection_name, dimension)
+    switch_alias(client, collection_name, version)
+    return {"created": version, "alias": collection_name}
@@ -0,0 +1,187 @@
+"""
+Query Log Service
+Records chat exchanges in Neon's query_logs table from a background writer
+and mines them for the most asked questions
+"""
+
+from typing import Any, Dict, List, Optional
+import hashlib
+import hmac
+import json
+import logging
+import queue
+import secrets
+import threading
+
+from ..models.config import settings
+
+logger = logging.getLogger(__name__)
+
+MIN_QUERY_LENGTH = 5  # query_logs CHECK constraint
+MAX_QUERY_LENGTH = 500  # query_logs.query_text VARCHAR(500)
+MAX_CHAPTER_LENGTH = 100  # query_logs.chapter_filter VARCHAR(100)
+WRITE_BATCH_SIZE = 100
+
+INSERT_SQL = """
+    INSERT INTO query_logs (
+        session_id, query_text, response_text, citations, retrieved_chunks,
+        response_time_ms, cache_hit, user_ip_hash, chapter_filter
+    ) VALUES (%s, %s, %s, %s::jsonb, %s::jsonb, %s, %s, %s, %s)
+"""
+
+# Grouped by exact (trimmed, lowercased) text here; finer normalization is
+# applied by the caller. The top cited chapter stands in for the chapter.
+QUERY_COUNTS_SQL = """
+    SELECT lower(btrim(query_text)) AS text,
+           chapter_filter,
+           COALESCE(chapter_filter, citations->>0) AS chapter,
+           COUNT(*) AS asked
+    FROM query_logs
+    WHERE created_at > NOW() - make_interval(hours => %s)
+      AND jsonb_array_length(citations) > 0
+    GROUP BY 1, 2, 3
+    ORDER BY asked DESC
+    LIMIT %s
+"""
+
+
+class QueryLogService:
+    """
+    Service for query_logs writes and reads (lazy connections).
+
+    record() only enqueues; a daemon thread inserts in batches so logging
+    never adds a database round trip to a request. Records are dropped when
+    Neon is not configured or the queue is full.
+    """
+
+    _instance = None
+    _queue = None
+    _thread: Optional[threading.Thread] = None
+    _lock = None
+    _written: int = 0
+    _dropped: int = 0
+    _ip_key: Optional[bytes] = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._queue = queue.Queue(maxsize=settings.query_log_queue_size)
+            cls._instance._lock = threading.Lock()
+        return cls._instance
+
+    @property
+    def is_available(self) -> bool:
+        """Check if query logging is enabled and Neon is configured"""
+        return settings.query_log_enabled and settings.is_neon_configured
+
+    def _hash_ip(self, client_ip: Optional[str]) -> str:
+        """
+        Keyed hash of the client IP (HMAC-SHA256).
+
+        A plain hash of an IPv4 address is reversed by hashing the whole
+        address space. Without settings.query_log_ip_secret a random key is
+        used, so hashes only link requests within one process.
+        """
+        if self._ip_key is None:
+            if settings.query_log_ip_secret:
+                self._ip_key = settings.query_log_ip_secret.encode("utf-8")
+            else:
+                logger.warning("query_log_ip_secret not set - IP hashes use a per-process key")
+                self._ip_key = secrets.token_bytes(32)
+        return hmac.new(self._ip_key, (client_ip or "").encode("utf-8"), hashlib.sha256).hexdigest()
+
+    def _connect(self):
+        import psycopg
+        return psycopg.connect(settings.neon_database_url, connect_timeout=5)
+
+    def record(
+        self,
+        session_id: str,
+        query: str,
+        response: str,
+        sources: List[str],
+        response_time_ms: float,
+        cache_hit: bool,
+        client_ip: Optional[str] = None,
+        chapter_filter: Optional[str] = None
+    ):
+        """
+        Queue one exchange for the background writer.
+
+        Values are cut to their column widths, since one oversized row would
+        fail the whole batch insert.
+        """
+        if not self.is_available or len(query.strip()) < MIN_QUERY_LENGTH:
+            return
+
+        row = (
+            session_id,
+            query[:MAX_QUERY_LENGTH],
+            response,
+            json.dumps(sources),
+            "[]",
+            max(1, int(response_time_ms)),
+            cache_hit,
+            self._hash_ip(client_ip),
+            chapter_filter[:MAX_CHAPTER_LENGTH] if chapter_filter else None
+        )
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            self._dropped += 1
+            return
+
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="query-log-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            rows = [self._queue.get()]
+            while len(rows) < WRITE_BATCH_SIZE:
+                try:
+                    rows.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                with self._connect() as conn:
+                    with conn.cursor() as cur:
+                        cur.executemany(INSERT_SQL, rows)
+                    conn.commit()
+                self._written += len(rows)
+            except Exception as e:
+                self._dropped += len(rows)
+                logger.error(f"Failed to write {len(rows)} query logs: {e}")
+
+    def query_counts(self, window_hours: float, limit: int = 5000) -> List[Dict[str, Any]]:
+        """Most asked (query text, chapter filter, chapter) groups in the window"""
+        if not settings.is_neon_configured:
+            return []
+
+        try:
+            with self._connect() as conn:
+                with conn.cursor() as cur:
+                    cur.execute(QUERY_COUNTS_SQL, (window_hours, limit))
+                    rows = cur.fetchall()
+        except Exception as e:
+            logger.error(f"Failed to read query logs: {e}")
+            return []
+
+        return [
+            {"query": text, "chapter_filter": chapter_filter, "chapter": chapter, "count": asked}
+            for text, chapter_filter, chapter, asked in rows
+        ]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.is_available,
+            "queued": self._queue.qsize(),
+            "written": self._written,
+            "dropped": self._dropped
+        }
+
+
+def get_query_log_service() -> QueryLogService:
+    """Get or create query log service instance"""
+    return QueryLogService()
@@ -0,0 +1,203 @@
+"""
+Rerank Service
+Cross-encoder reranking of retrieved chunks under a hard latency budget
+"""
+
+from typing import List, Dict, Any, Optional, Tuple
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+import hashlib
+import logging
+import threading
+import time
+
+from ..models.config import settings
+
+logger = logging.getLogger(__name__)
+
+_WORKERS = 2
+
+
+def _pair_key(query: str, chunk: Dict[str, Any]) -> Tuple[str, str]:
+    """Cache key for a (query, chunk) pair"""
+    query_hash = hashlib.blake2b(query.strip().lower().encode("utf-8"), digest_size=12).hexdigest()
+    chunk_id = chunk.get("chunk_id") or hashlib.blake2b(
+        chunk["content"].encode("utf-8"), digest_size=12
+    ).hexdigest()
+    return query_hash, chunk_id
+
+
+class RerankService:
+    """Service for cross-encoder reranking (lazy, background model loading)"""
+
+    _instance = None
+    _model = None
+    _loading = False
+    _executor = None
+    _lock = None
+    _pair_scores = None
+    _latencies = None
+    _outcomes = None
+    _inflight = 0
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._executor = ThreadPoolExecutor(max_workers=_WORKERS, thread_name_prefix="rerank")
+            cls._instance._lock = threading.Lock()
+            cls._instance._pair_scores = OrderedDict()
+            cls._instance._latencies = deque(maxlen=1000)
+            cls._instance._outcomes = {"reranked": 0, "cached": 0, "timeout": 0, "unavailable": 0, "busy": 0, "error": 0}
+        return cls._instance
+
+    def _load_model(self):
+        """Load the cross-encoder (runs in the rerank executor)"""
+        try:
+            from sentence_transformers import CrossEncoder
+            logger.info(f"Loading rerank model: {settings.rerank_model}")
+            self._model = CrossEncoder(settings.rerank_model)
+            logger.info("Rerank model loaded successfully")
+        except Exception as e:
+            logger.error(f"Failed to load rerank model: {e}")
+        finally:
+            self._loading = False
+
+    def warm_up(self):
+        """Start loading the model in the background (never blocks a request)"""
+        with self._lock:
+            if self._model is None and not self._loading:
+                self._loading = True
+                self._executor.submit(self._load_model)
+
+    @property
+    def is_ready(self) -> bool:
+        return self._model is not None
+
+    def _score(
+        self,
+        query: str,
+        chunks: List[Dict[str, Any]],
+        keys: List[Tuple[str, str]]
+    ) -> List[float]:
+        """
+        Score (query, chunk) pairs in one batched call and cache them.
+
+        Caching happens here so a call that overruns the budget still
+        benefits the next identical request.
+        """
+        scores = [float(s) for s in self._model.predict([(query, chunk["content"]) for chunk in chunks])]
+        for key, score in zip(keys, scores):
+            self._cache_put(key, score)
+        return scores
+
+    def _cache_get(self, key: Tuple[str, str]) -> Optional[float]:
+        with self._lock:
+            score = self._pair_scores.get(key)
+            if score is not None:
+                self._pair_scores.move_to_end(key)
+            return score
+
+    def _cache_put(self, key: Tuple[str, str], score: float):
+        with self._lock:
+            self._pair_scores[key] = score
+            self._pair_scores.move_to_end(key)
+            while len(self._pair_scores) > settings.rerank_cache_size:
+                self._pair_scores.popitem(last=False)
+
+    def _job_done(self, future):
+        with self._lock:
+            self._inflight -= 1
+
+    def rerank(
+        self,
+        query: str,
+        chunks: List[Dict[str, Any]],
+        top_k: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Reorder chunks by cross-encoder score and return the top_k.
+
+        Falls back to the incoming (vector) order when the model is not
+        loaded yet, every rerank worker is already busy, or scoring exceeds
+        settings.rerank_budget_ms.
+        """
+        if len(chunks) <= 1:
+            return chunks[:top_k]
+
+        if not self.is_ready:
+            self.warm_up()
+            self._outcomes["unavailable"] += 1
+            return chunks[:top_k]
+
+        start = time.perf_counter()
+        keys = [_pair_key(query, chunk) for chunk in chunks]
+        scores = [self._cache_get(key) for key in keys]
+        missing = [i for i, score in enumerate(scores) if score is None]
+
+        if missing:
+            # Queued jobs would only wait out the budget behind running ones
+            with self._lock:
+                if self._inflight >= _WORKERS:
+                    busy = True
+                else:
+                    busy = False
+                    self._inflight += 1
+            if busy:
+                self._outcomes["busy"] += 1
+                return chunks[:top_k]
+
+            future = self._executor.submit(
+                self._score,
+                query,
+                [chunks[i] for i in missing],
+                [keys[i] for i in missing]
+            )
+            future.add_done_callback(self._job_done)
+            try:
+                fresh = future.result(timeout=settings.rerank_budget_ms / 1000)
+            except FutureTimeoutError:
+                # Drops the job if it has not started; a running one finishes and still caches its scores
+                future.cancel()
+                self._outcomes["timeout"] += 1
+                self._latencies.append(time.perf_counter() - start)
+                logger.warning(f"Rerank exceeded {settings.rerank_budget_ms}ms budget - using vector order")
+                return chunks[:top_k]
+            except Exception as e:
+                self._outcomes["error"] += 1
+                logger.error(f"Rerank failed: {e}")
+                return chunks[:top_k]
+
+            for i, score in zip(missing, fresh):
+                scores[i] = score
+            self._outcomes["reranked"] += 1
+        else:
+            self._outcomes["cached"] += 1
+
+        self._latencies.append(time.perf_counter() - start)
+
+        ranked = sorted(zip(scores, range(len(chunks))), key=lambda item: item[0], reverse=True)
+        return [
+            {**chunks[i], "rerank_score": score}
+            for score, i in ranked[:top_k]
+        ]
+
+    def stats(self) -> Dict[str, Any]:
+        """Recent rerank latency distribution and outcome counts"""
+        samples = sorted(self._latencies)
+        latency = {}
+        if samples:
+            for p in (50, 90, 99):
+                latency[f"p{p}_ms"] = round(samples[min(len(samples) - 1, len(samples) * p // 100)] * 1000, 2)
+        return {
+            "model_loaded": self.is_ready,
+            "budget_ms": settings.rerank_budget_ms,
+            "latency": latency,
+            "outcomes": dict(self._outcomes),
+            "inflight": self._inflight,
+            "cached_pairs": len(self._pair_scores)
+        }
+
+
+def get_rerank_service() -> RerankService:
+    """Get or create rerank service instance"""
+    return RerankService()
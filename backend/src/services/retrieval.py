@@ -3,14 +3,97 @@ RAG Retrieval Service
 Retrieves relevant content from Qdrant vector database
 """
 
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
+from collections import OrderedDict
+import hashlib
 import logging
+import struct
+import threading
+import time
 
 from ..models.config import settings
+from ..utils.circuit_breaker import get_circuit_breaker, CircuitOpenError
+from ..utils.startup import startup_timeline
+from .hierarchy import (
+    LEVEL_CHUNK, hierarchical_candidates, section_id, summary_collection
+)
+from .dedup import collapse_clusters
 
 logger = logging.getLogger(__name__)
 
 
+def point_id(chunk_id: str) -> int:
+    """Qdrant point id for a chunk, stable across processes (unlike hash())"""
+    return int.from_bytes(hashlib.blake2b(chunk_id.encode("utf-8"), digest_size=8).digest(), "big") >> 1
+
+
+class RetrievalCache:
+    """
+    LRU cache of Qdrant search results.
+
+    Entries are keyed by a quantized hash of the query vector plus the
+    chapter filter, and always hold the widest fetch (largest limit, lowest
+    threshold) so narrower lookups are answered by filtering locally.
+    The whole cache is dropped when the index version changes.
+    """
+
+    def __init__(self, max_size: int, precision: int):
+        self._entries: "OrderedDict[Tuple[str, Optional[str]], List[Dict[str, Any]]]" = OrderedDict()
+        self._max_size = max_size
+        self._scale = 10 ** precision
+        self._lock = threading.Lock()
+        self._version: Optional[str] = None
+        self.hits = 0
+        self.misses = 0
+
+    def make_key(self, vector: List[float], chapter_filter: Optional[str]) -> Tuple[str, Optional[str]]:
+        """Build a cache key from a quantized query vector and filter"""
+        quantized = [int(round(x * self._scale)) for x in vector]
+        digest = hashlib.blake2b(
+            struct.pack(f"<{len(quantized)}i", *quantized),
+            digest_size=16
+        ).hexdigest()
+        return digest, chapter_filter
+
+    def sync_version(self, version: Optional[str]):
+        """Invalidate all entries if the index version has changed"""
+        with self._lock:
+            if version != self._version:
+                if self._entries:
+                    logger.info(f"Index version changed ({self._version} -> {version}), clearing retrieval cache")
+                self._entries.clear()
+                self._version = version
+
+    def get(self, key: Tuple[str, Optional[str]]) -> Optional[List[Dict[str, Any]]]:
+        with self._lock:
+            chunks = self._entries.get(key)
+            if chunks is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return chunks
+
+    def put(self, key: Tuple[str, Optional[str]], chunks: List[Dict[str, Any]]):
+        with self._lock:
+            self._entries[key] = chunks
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "index_version": self._version
+        }
+
+
 class RetrievalService:
     """Service for RAG retrieval from Qdrant (lazy initialization)"""
 
@@ -18,14 +101,31 @@ class RetrievalService:
     _client = None
     _initialized = False
     _embedding_service = None
+    _cache = None
+    _breaker = None
 
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
+            cls._instance._cache = RetrievalCache(
+                max_size=settings.retrieval_cache_size,
+                precision=settings.retrieval_cache_precision
+            )
+            cls._instance._breaker = get_circuit_breaker(
+                "qdrant",
+                slow_call_seconds=settings.qdrant_search_timeout_seconds,
+                on_half_open=cls._instance._reconnect
+            )
         return cls._instance
 
     def _ensure_initialized(self):
-        """Lazy initialize Qdrant client"""
+        """
+        Lazy initialize Qdrant client.
+
+        A failed connection is retried, gated by the Qdrant circuit breaker
+        so an outage costs one attempt per breaker_open_seconds rather than
+        one per request.
+        """
         if self._initialized:
             return
 
@@ -34,20 +134,45 @@ class RetrievalService:
             self._initialized = True
             return
 
+        breaker = self._breaker
         try:
-            from qdrant_client import QdrantClient
-            from qdrant_client.models import Distance, VectorParams
+            breaker.acquire()
+        except CircuitOpenError:
+            return
 
-            self._client = QdrantClient(
-                url=settings.qdrant_url,
-                api_key=settings.qdrant_api_key
-            )
-            self._ensure_collection()
+        start = time.perf_counter()
+        try:
+            with startup_timeline.stage("qdrant_connect"):
+                self._client = self._connect()
+                self._ensure_collection()
             self._initialized = True
+            breaker.record(time.perf_counter() - start)
             logger.info("Qdrant client initialized successfully")
         except Exception as e:
+            self._client = None
+            breaker.record(time.perf_counter() - start, e)
             logger.error(f"Failed to initialize Qdrant: {e}")
-            self._initialized = True  # Mark as initialized to avoid retries
+
+    @staticmethod
+    def _connect():
+        from qdrant_client import QdrantClient
+
+        return QdrantClient(
+            url=settings.qdrant_url,
+            api_key=settings.qdrant_api_key
+        )
+
+    def _reconnect(self):
+        """Replace the client before a half-open probe (drops stale connections)"""
+        if not settings.is_qdrant_configured:
+            return
+        old_client, self._client = self._client, self._connect()
+        if old_client is not None:
+            try:
+                old_client.close()
+            except Exception:
+                pass
+        logger.info("Qdrant client reconnected")
 
     def _get_embedding_service(self):
         """Lazy get embedding service"""
@@ -57,25 +182,19 @@ class RetrievalService:
         return self._embedding_service
 
     def _ensure_collection(self):
-        """Create collection if it doesn't exist"""
+        """Create the collection if it doesn't exist, or migrate it to the configured schema"""
         if not self._client:
             return
 
-        from qdrant_client.models import Distance, VectorParams
+        from .qdrant_schema import ensure_collection
 
-        collections = self._client.get_collections().collections
-        collection_names = [c.name for c in collections]
-
-        if settings.qdrant_collection_name not in collection_names:
-            logger.info(f"Creating collection: {settings.qdrant_collection_name}")
-            self._client.create_collection(
-                collection_name=settings.qdrant_collection_name,
-                vectors_config=VectorParams(
-                    size=self._get_embedding_service().dimension,
-                    distance=Distance.COSINE
-                )
-            )
-            logger.info("Collection created successfully")
+        changes = ensure_collection(
+            self._client,
+            settings.qdrant_collection_name,
+            self._get_embedding_service().dimension
+        )
+        if changes:
+            logger.info(f"Collection schema applied: {changes}")
 
     @property
     def is_available(self) -> bool:
@@ -100,36 +219,23 @@ class RetrievalService:
             return []
 
         try:
-            from qdrant_client.models import Filter, FieldCondition, MatchValue
-
             query_vector = self._get_embedding_service().embed_text(query)
 
-            filter_condition = None
-            if chapter_filter:
-                filter_condition = Filter(
-                    must=[
-                        FieldCondition(key="chapter", match=MatchValue(value=chapter_filter))
-                    ]
-                )
+            if not settings.rerank_enabled:
+                return self._search(query_vector, top_k, chapter_filter, score_threshold)
 
-            results = self._client.query_points(
-                collection_name=settings.qdrant_collection_name,
-                query=query_vector,
-                limit=top_k,
-                query_filter=filter_condition,
-                score_threshold=score_threshold
+            # Over-fetch above the same relevance threshold, then rerank
+            from .rerank import get_rerank_service
+            candidates = self._search(
+                query_vector,
+                max(top_k, settings.rerank_candidates),
+                chapter_filter,
+                score_threshold
             )
-
-            retrieved_chunks = []
-            for result in results.points:
-                retrieved_chunks.append({
-                    "content": result.payload.get("content", ""),
-                    "chapter": result.payload.get("chapter", ""),
-                    "section": result.payload.get("section", ""),
-                    "score": result.score
-                })
-
-            return retrieved_chunks
+            return get_rerank_service().rerank(query, candidates, top_k)
+        except CircuitOpenError:
+            logger.warning("Qdrant circuit open - returning empty results")
+            return []
         except Exception as e:
             logger.error(f"Retrieval failed: {e}")
             return []
@@ -149,36 +255,176 @@ class RetrievalService:
 
         try:
             query_vector = self._get_embedding_service().embed_text(selected_text)
-
-            results = self._client.query_points(
-                collection_name=settings.qdrant_collection_name,
-                query=query_vector,
-                limit=1,
-                score_threshold=score_threshold
-            )
-
-            if results.points and results.points[0].score >= score_threshold:
-                result = results.points[0]
-                return {
-                    "content": result.payload.get("content", ""),
-                    "chapter": result.payload.get("chapter", ""),
-                    "section": result.payload.get("section", ""),
-                    "score": result.score
-                }
-
+            results = self._search(query_vector, 1, None, score_threshold)
+            return results[0] if results else None
+        except CircuitOpenError:
+            logger.warning("Qdrant circuit open - selection not matched")
             return None
         except Exception as e:
             logger.error(f"Selection retrieval failed: {e}")
             return None
 
+    def _search(
+        self,
+        query_vector: List[float],
+        limit: int,
+        chapter_filter: Optional[str],
+        score_threshold: float
+    ) -> List[Dict[str, Any]]:
+        """
+        Run a vector search through the result cache.
+
+        Searches are fetched at the widest cached limit and lowest cached
+        threshold, then narrowed locally to the requested limit/threshold.
+        Requests outside the cached bounds go straight to Qdrant.
+        """
+        fetch_limit = settings.retrieval_cache_fetch_limit
+        min_score = settings.retrieval_cache_min_score
+
+        if limit > fetch_limit or score_threshold < min_score:
+            return self._breaker.call(self._fetch, query_vector, limit, chapter_filter, score_threshold)
+
+        from .metadata import get_metadata_service
+        self._cache.sync_version(get_metadata_service().get_index_version())
+
+        key = self._cache.make_key(query_vector, chapter_filter)
+        chunks = self._cache.get(key)
+        if chunks is None:
+            chunks = self._breaker.call(self._fetch, query_vector, fetch_limit, chapter_filter, min_score)
+            self._cache.put(key, chunks)
+
+        return [chunk for chunk in chunks if chunk["score"] >= score_threshold][:limit]
+
+    def _fetch(
+        self,
+        query_vector: List[float],
+        limit: int,
+        chapter_filter: Optional[str],
+        score_threshold: float
+    ) -> List[Dict[str, Any]]:
+        """
+        Chunk search in the configured retrieval mode.
+
+        Hierarchical mode first picks candidate sections from the summary
+        collection, then searches only their chunks; indexes without
+        summaries are searched flat. In dedup "tag" mode the search over-fetches and
+        keeps the best chunk of each near-duplicate cluster.
+        """
+        if settings.dedup_mode == "tag":
+            chunks = self._fetch_chunks(query_vector, limit * max(1, settings.dedup_overfetch), chapter_filter, score_threshold)
+            return collapse_clusters(chunks, limit)
+        return self._fetch_chunks(query_vector, limit, chapter_filter, score_threshold)
+
+    def _fetch_chunks(
+        self,
+        query_vector: List[float],
+        limit: int,
+        chapter_filter: Optional[str],
+        score_threshold: float
+    ) -> List[Dict[str, Any]]:
+        """Flat or hierarchical chunk search (see _fetch)"""
+        if settings.retrieval_mode == "hierarchical":
+            try:
+                section_ids = hierarchical_candidates(
+                    self._query_points,
+                    query_vector,
+                    chapter_filter,
+                    settings.hierarchical_top_chapters,
+                    settings.hierarchical_top_sections
+                )
+            except Exception as e:
+                # No summary collection yet (built before summaries, or being re-indexed)
+                logger.warning(f"Summary search failed, searching flat: {e}")
+                section_ids = None
+            if section_ids:
+                return self._query_points(
+                    query_vector, limit, chapter_filter, score_threshold, section_ids=section_ids
+                )
+        return self._query_points(query_vector, limit, chapter_filter, score_threshold)
+
+    def _query_points(
+        self,
+        query_vector: List[float],
+        limit: int,
+        chapter_filter: Optional[str],
+        score_threshold: float,
+        level: str = LEVEL_CHUNK,
+        chapters: Optional[List[str]] = None,
+        section_ids: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Query Qdrant for points of one level and convert them to chunk dicts.
+
+        Chunks are searched in the live collection and summary levels in its
+        sibling summary collection, so chunk searches need no level filter.
+        """
+        from qdrant_client.models import Filter, FieldCondition, MatchAny, MatchValue
+        from .qdrant_schema import search_params
+
+        collection_name = settings.qdrant_collection_name
+        must = []
+        if level != LEVEL_CHUNK:
+            collection_name = summary_collection(collection_name)
+            must.append(FieldCondition(key="level", match=MatchValue(value=level)))
+        # Chunks merged by dedup also stand for their duplicates' chapters
+        if chapter_filter:
+            must.append(Filter(should=[
+                FieldCondition(key=key, match=MatchValue(value=chapter_filter))
+                for key in ("chapter", "duplicate_chapters")
+            ]))
+        if chapters:
+            must.append(Filter(should=[
+                FieldCondition(key=key, match=MatchAny(any=chapters))
+                for key in ("chapter", "duplicate_chapters")
+            ]))
+        if section_ids:
+            must.append(FieldCondition(key="section_id", match=MatchAny(any=section_ids)))
+        filter_condition = Filter(must=must) if must else None
+
+        results = self._client.query_points(
+            collection_name=collection_name,
+            query=query_vector,
+            limit=limit,
+            query_filter=filter_condition,
+            score_threshold=score_threshold,
+            search_params=search_params()
+        )
+
+        return [
+            {
+                "content": result.payload.get("content", ""),
+                "chapter": result.payload.get("chapter", ""),
+                "section": result.payload.get("section", ""),
+                "chunk_id": result.payload.get("chunk_id", ""),
+                "section_id": result.payload.get("section_id"),
+                "cluster_id": result.payload.get("cluster_id"),
+                "score": result.score
+            }
+            for result in results.points
+        ]
+
     def index_chunk(
         self,
         chunk_id: str,
         content: str,
         chapter: str,
-        section: str
+        section: str,
+        collection_name: Optional[str] = None,
+        anchor: Optional[str] = None,
+        vector: Optional[List[float]] = None,
+        cluster_id: Optional[str] = None,
+        duplicate_chunk_ids: Optional[List[str]] = None,
+        duplicate_chapters: Optional[List[str]] = None
     ) -> bool:
-        """Index a single content chunk"""
+        """
+        Index a single content chunk.
+
+        Writes to the live alias by default, or to `collection_name` when
+        building a new index version (which leaves the result cache intact).
+        Chunks with an `anchor` are tagged with their section id for
+        hierarchical search; a precomputed `vector` skips embedding.
+        `cluster_id` and the duplicate lists come from dedup.cluster_chunks.
+        """
         self._ensure_initialized()
 
         if not self._client:
@@ -188,26 +434,78 @@ class RetrievalService:
         try:
             from qdrant_client.models import PointStruct
 
-            vector = self._get_embedding_service().embed_text(content)
-            point = PointStruct(
-                id=hash(chunk_id) % (2**63),
-                vector=vector,
-                payload={
-                    "content": content,
-                    "chapter": chapter,
-                    "section": section,
-                    "chunk_id": chunk_id
-                }
-            )
+            if vector is None:
+                vector = self._get_embedding_service().embed_text(content)
+            payload = {
+                "content": content,
+                "chapter": chapter,
+                "section": section,
+                "chunk_id": chunk_id,
+                "level": LEVEL_CHUNK
+            }
+            if anchor is not None:
+                payload["section_id"] = section_id(chapter, anchor)
+            if cluster_id is not None:
+                payload["cluster_id"] = cluster_id
+            if duplicate_chunk_ids:
+                payload["duplicate_chunk_ids"] = duplicate_chunk_ids
+                payload["duplicate_chapters"] = duplicate_chapters or []
+            point = PointStruct(id=point_id(chunk_id), vector=vector, payload=payload)
             self._client.upsert(
-                collection_name=settings.qdrant_collection_name,
+                collection_name=collection_name or settings.qdrant_collection_name,
                 points=[point]
             )
+            if collection_name is None:
+                self._cache.clear()
             return True
         except Exception as e:
             logger.error(f"Failed to index chunk {chunk_id}: {e}")
             return False
 
+    def index_summaries(self, summaries: List[Dict[str, Any]], collection_name: Optional[str] = None) -> bool:
+        """
+        Upsert section/chapter summary points (see hierarchy.build_summaries).
+
+        Points go to the summary collection of `collection_name` (created on
+        first use); switch_alias serves it along with the chunks. Without a
+        collection_name the live version's summaries are written and served
+        right away.
+        """
+        self._ensure_initialized()
+
+        if not self._client:
+            logger.error("Cannot index - Qdrant not configured")
+            return False
+        if not summaries:
+            return True
+
+        try:
+            from qdrant_client.models import PointStruct
+            from .qdrant_schema import create_collection, resolve_alias
+            from .index_versions import switch_alias
+
+            alias = settings.qdrant_collection_name
+            live = resolve_alias(self._client, alias) if collection_name is None else None
+            target = summary_collection(collection_name or live or alias)
+            if not self._client.collection_exists(target):
+                create_collection(self._client, target, len(summaries[0]["vector"]))
+
+            self._client.upsert(
+                collection_name=target,
+                points=[
+                    PointStruct(id=point_id(summary["key"]), vector=summary["vector"], payload=summary["payload"])
+                    for summary in summaries
+                ]
+            )
+            if live is not None:
+                switch_alias(self._client, alias, live)
+            if collection_name is None:
+                self._cache.clear()
+            return True
+        except Exception as e:
+            logger.error(f"Failed to index summaries: {e}")
+            return False
+
     def get_collection_info(self) -> Dict[str, Any]:
         """Get collection statistics"""
         self._ensure_initialized()
@@ -220,6 +518,7 @@ class RetrievalService:
             return {
                 "name": settings.qdrant_collection_name,
                 "points_count": getattr(info, 'points_count', 0),
+                "cache": self._cache.stats(),
                 "status": "ready"
             }
         except Exception as e:
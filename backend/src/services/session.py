@@ -0,0 +1,341 @@
+"""
+Session Service
+Server-side conversation sessions with bounded, compact history
+"""
+
+from typing import List, Dict, Optional, Any
+from collections import OrderedDict
+import json
+import logging
+import re
+import secrets
+import string
+import threading
+import time
+
+from ..models.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Words that signal a follow-up referring back to an earlier turn
+_FOLLOWUP_PATTERN = re.compile(
+    r"\b(it|its|it's|they|them|their|this|that|these|those|he|she|his|her|"
+    r"what about|how about|and the|also)\b",
+    re.IGNORECASE
+)
+_STOPWORDS = frozenset(
+    "a an and are as at be by can do does for from how in is it its of on or "
+    "the their them they this that these those to was what when where which "
+    "who why with about also".split()
+)
+_WORD_PATTERN = re.compile(r"[a-z0-9][a-z0-9\-]+")
+
+_SESSION_ID_ALPHABET = string.ascii_lowercase + string.digits
+
+
+def generate_session_id() -> str:
+    """Generate a session ID in the ses_{timestamp}_{random_8_chars} format"""
+    suffix = "".join(secrets.choice(_SESSION_ID_ALPHABET) for _ in range(8))
+    return f"ses_{int(time.time())}_{suffix}"
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token)"""
+    return len(text) // 4 + 1
+
+
+def chunk_key(chunk: Dict[str, Any]) -> str:
+    """Stable identifier for a retrieved chunk"""
+    return chunk.get("chunk_id") or f"{chunk['chapter']}/{chunk['section']}"
+
+
+def content_terms(text: str) -> set:
+    """Lowercased content words of a text (stopwords removed)"""
+    return {w for w in _WORD_PATTERN.findall(text.lower()) if w not in _STOPWORDS}
+
+
+class Turn:
+    """A single question/answer exchange"""
+
+    __slots__ = ("query", "answer", "chunk_ids", "tokens", "created_at")
+
+    def __init__(self, query: str, answer: str, chunk_ids: List[str], created_at: Optional[float] = None):
+        self.query = query
+        self.answer = answer
+        self.chunk_ids = chunk_ids
+        self.tokens = estimate_tokens(query) + estimate_tokens(answer)
+        self.created_at = created_at or time.time()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "query": self.query,
+            "answer": self.answer,
+            "chunk_ids": self.chunk_ids,
+            "created_at": self.created_at
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Turn":
+        return cls(data["query"], data["answer"], data["chunk_ids"], data["created_at"])
+
+
+class Session:
+    """
+    Recent turns, a rolling summary of older turns, and the ids (with
+    chapters) of their retrieved chunks; chunk content lives in the shared
+    ChunkCache
+    """
+
+    __slots__ = ("session_id", "turns", "summary", "chunks", "updated_at")
+
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+        self.turns: List[Turn] = []
+        self.summary = ""
+        self.chunks: "OrderedDict[str, str]" = OrderedDict()  # chunk id -> chapter
+        self.updated_at = time.time()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "session_id": self.session_id,
+            "turns": [turn.to_dict() for turn in self.turns],
+            "summary": self.summary,
+            "chunk_ids": list(self.chunks.items()),
+            "updated_at": self.updated_at
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Session":
+        session = cls(data["session_id"])
+        session.turns = [Turn.from_dict(turn) for turn in data["turns"]]
+        session.summary = data["summary"]
+        if "chunk_ids" in data:
+            session.chunks = OrderedDict((key, chapter) for key, chapter in data["chunk_ids"])
+        else:
+            # Sessions saved before chunks were stored by id
+            session.chunks = OrderedDict((key, chunk["chapter"]) for key, chunk in data.get("chunks", []))
+        session.updated_at = data["updated_at"]
+        return session
+
+
+class ChunkCache:
+    """
+    Process-wide LRU of retrieved chunks, shared by all sessions.
+
+    Sessions keep only chunk ids; a follow-up resolves them here, falling
+    back to the anchor index (e.g. for a Redis session saved by another
+    worker). Chunks found in neither are skipped and the follow-up
+    re-searches.
+    """
+
+    def __init__(self, max_size: int):
+        self._chunks: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._max_size = max_size
+        self._lock = threading.Lock()
+
+    def put(self, chunk: Dict[str, Any]):
+        key = chunk_key(chunk)
+        with self._lock:
+            self._chunks[key] = chunk
+            self._chunks.move_to_end(key)
+            while len(self._chunks) > self._max_size:
+                self._chunks.popitem(last=False)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            chunk = self._chunks.get(key)
+            if chunk is not None:
+                self._chunks.move_to_end(key)
+                return chunk
+
+        from .anchors import get_anchor_service
+        chunk = get_anchor_service().get_chunk(key)
+        if chunk is not None:
+            self.put(chunk)
+        return chunk
+
+    def __len__(self) -> int:
+        return len(self._chunks)
+
+
+class MemorySessionStore:
+    """In-process session store with TTL and LRU eviction"""
+
+    def __init__(self, max_sessions: int, ttl_seconds: int):
+        self._sessions: "OrderedDict[str, Session]" = OrderedDict()
+        self._max_sessions = max_sessions
+        self._ttl = ttl_seconds
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str) -> Optional[Session]:
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return None
+            if time.time() - session.updated_at > self._ttl:
+                del self._sessions[session_id]
+                return None
+            self._sessions.move_to_end(session_id)
+            return session
+
+    def save(self, session: Session):
+        with self._lock:
+            self._sessions[session.session_id] = session
+            self._sessions.move_to_end(session.session_id)
+            while len(self._sessions) > self._max_sessions:
+                self._sessions.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+
+class RedisSessionStore:
+    """Redis-backed session store (TTL per key; eviction via Redis maxmemory policy)"""
+
+    def __init__(self, url: str, ttl_seconds: int):
+        import redis
+        self._client = redis.Redis.from_url(url, socket_timeout=1.0)
+        self._ttl = ttl_seconds
+
+    @staticmethod
+    def _key(session_id: str) -> str:
+        return f"session:{session_id}"
+
+    def get(self, session_id: str) -> Optional[Session]:
+        data = self._client.get(self._key(session_id))
+        return Session.from_dict(json.loads(data)) if data else None
+
+    def save(self, session: Session):
+        self._client.setex(self._key(session.session_id), self._ttl, json.dumps(session.to_dict()))
+
+
+class SessionService:
+    """Service for session-aware chat (lazy initialization)"""
+
+    _instance = None
+    _store = None
+    _chunk_cache = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._chunk_cache = ChunkCache(settings.session_chunk_cache_size)
+        return cls._instance
+
+    def _get_store(self):
+        """Lazy create the configured session store"""
+        if self._store is None:
+            if settings.session_backend == "redis":
+                try:
+                    self._store = RedisSessionStore(settings.redis_url, settings.session_ttl_seconds)
+                    logger.info("Session store: Redis")
+                except Exception as e:
+                    logger.error(f"Failed to initialize Redis session store: {e}")
+            if self._store is None:
+                self._store = MemorySessionStore(settings.session_max_sessions, settings.session_ttl_seconds)
+        return self._store
+
+    def get_or_create(self, session_id: Optional[str]) -> Session:
+        """Load a session, starting a new one if it is unknown or expired"""
+        if session_id:
+            try:
+                session = self._get_store().get(session_id)
+                if session is not None:
+                    return session
+            except Exception as e:
+                logger.error(f"Session lookup failed: {e}")
+        return Session(session_id or generate_session_id())
+
+    @staticmethod
+    def is_followup(session: Session, query: str) -> bool:
+        """Heuristic: short query that refers back to an earlier turn"""
+        return bool(session.turns) and len(query.split()) <= 12 and bool(_FOLLOWUP_PATTERN.search(query))
+
+    def followup_query(self, session: Session, query: str) -> str:
+        """Expand a follow-up with the last standalone question so retrieval has a subject"""
+        for turn in reversed(session.turns):
+            if len(turn.query.split()) > 12 or not _FOLLOWUP_PATTERN.search(turn.query):
+                return f"{turn.query} {query}"
+        return f"{session.turns[-1].query} {query}"
+
+    def cached_chunks_for(
+        self,
+        session: Session,
+        query: str,
+        chapter_filter: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Chunks from earlier turns that cover a follow-up's new terms.
+
+        Returns an empty list when the follow-up introduces terms none of the
+        cached chunks mention, in which case the caller should re-search.
+        """
+        candidates = [
+            chunk for chunk in (
+                self._chunk_cache.get(key) for key, chapter in session.chunks.items()
+                if not chapter_filter or chapter == chapter_filter
+            )
+            if chunk is not None
+        ]
+        previous_terms = content_terms(" ".join(turn.query for turn in session.turns))
+        new_terms = content_terms(query) - previous_terms
+        if new_terms:
+            candidates = [
+                chunk for chunk in candidates
+                if new_terms & content_terms(chunk["content"])
+            ]
+        return candidates[-settings.session_reuse_chunks:]
+
+    def history_prompt(self, session: Session) -> str:
+        """Compact conversation history for the prompt"""
+        lines = []
+        if session.summary:
+            lines.append(f"Earlier: {session.summary}")
+        for turn in session.turns:
+            lines.append(f"Q: {turn.query}\nA: {turn.answer}")
+        return "\n".join(lines)
+
+    def record_turn(
+        self,
+        session: Session,
+        query: str,
+        answer: str,
+        chunks: List[Dict[str, Any]]
+    ):
+        """Append a turn, summarize old turns past the token budget, and save"""
+        for chunk in chunks:
+            self._chunk_cache.put(chunk)
+            session.chunks[chunk_key(chunk)] = chunk["chapter"]
+            session.chunks.move_to_end(chunk_key(chunk))
+        while len(session.chunks) > settings.session_max_chunks:
+            session.chunks.popitem(last=False)
+
+        # Keep only the first sentence of answers; they are context, not a source
+        short_answer = re.split(r"(?<=[.!?])\s", answer.strip(), maxsplit=1)[0][:200]
+        session.turns.append(Turn(query, short_answer, [chunk_key(chunk) for chunk in chunks]))
+        self._compact(session)
+        session.updated_at = time.time()
+
+        try:
+            self._get_store().save(session)
+        except Exception as e:
+            logger.error(f"Session save failed: {e}")
+
+    @staticmethod
+    def _compact(session: Session):
+        """Fold the oldest turns into the summary once history exceeds the budget"""
+        budget = settings.session_history_token_budget
+        # The latest turn is always kept verbatim
+        while len(session.turns) > 1 and (
+            len(session.turns) > settings.session_max_turns
+            or sum(turn.tokens for turn in session.turns) + estimate_tokens(session.summary) > budget
+        ):
+            oldest = session.turns.pop(0)
+            summary = f"{session.summary}; {oldest.query}" if session.summary else oldest.query
+            # Keep the most recent questions within a third of the budget
+            session.summary = summary[-(budget // 3 * 4):]
+
+
+def get_session_service() -> SessionService:
+    """Get or create session service instance"""
+    return SessionService()
@@ -0,0 +1,312 @@
+"""
+Translation Service
+Splits content into segments on paragraph and list-item boundaries, masks code
+and technical terms, translates segments concurrently (cached per segment) and
+reassembles them in order
+"""
+
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from collections import OrderedDict
+import asyncio
+import hashlib
+import logging
+import re
+import threading
+
+from ..models.config import settings
+
+logger = logging.getLogger(__name__)
+
+PLACEHOLDER = "⟦{}⟧"
+_PLACEHOLDER = re.compile(r"⟦(\d+)⟧")
+
+# Fenced code blocks pass through untranslated
+_FENCE = re.compile(r"(```.*?(?:```|$))", re.DOTALL)
+# Blank lines, or a line break before a list item or heading
+_BOUNDARY = re.compile(r"(\n[ \t]*\n\s*|\n(?=[ \t]*(?:[-*+]|\d+[.)]|#{1,6})\s))")
+# Leading whitespace and heading/list markers stay outside the translated text
+_MARKER = re.compile(r"^(\s*(?:(?:#{1,6}|[-*+>]|\d+[.)])[ \t]+)?)")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+# Inline code, URLs, bold key terms, snake_case and camelCase identifiers, acronyms ("ROS 2");
+# identifiers come before acronyms so "IMU_data" is kept whole
+_PROTECTED = re.compile(
+    r"`[^`\n]+`"
+    r"|https?://[^\s<>()]*[^\s<>().,;:!?]"
+    r"|\*\*[^*\n]+\*\*"
+    r"|\b[A-Za-z]+_\w+\b"
+    r"|\b[a-z]+[A-Z]\w*\b"
+    r"|\b[A-Z][A-Z0-9]+(?:[-/][A-Z0-9]+)*(?: \d+(?:\.\d+)?\b)?"
+)
+
+
+class TranslationFailed(Exception):
+    """Raised when a segment cannot be translated"""
+
+
+def _keep_terms() -> List[str]:
+    """Configured glossary, longest first so multi-word terms win"""
+    return sorted(settings.translation_keep_terms, key=len, reverse=True)
+
+
+def mask_terms(text: str) -> Tuple[str, List[str]]:
+    """
+    Replace code and technical terms with numbered placeholders.
+
+    Numbering restarts for every segment, so a segment's masked text (the
+    cache key) does not depend on where it sits in the content.
+    """
+    kept: List[str] = []
+
+    def substitute(match) -> str:
+        kept.append(match.group(0))
+        return PLACEHOLDER.format(len(kept) - 1)
+
+    glossary = _keep_terms()
+    if glossary:
+        text = re.sub("|".join(re.escape(term) for term in glossary), substitute, text)
+    # Skip text already masked by the glossary
+    parts = _PLACEHOLDER.split(text)
+    for i in range(0, len(parts), 2):
+        parts[i] = _PROTECTED.sub(substitute, parts[i])
+    for i in range(1, len(parts), 2):
+        parts[i] = PLACEHOLDER.format(parts[i])
+    return "".join(parts), kept
+
+
+def unmask_terms(text: str, kept: List[str]) -> Optional[str]:
+    """Restore placeholders; None if the translation lost or invented any"""
+    found = [int(i) for i in _PLACEHOLDER.findall(text)]
+    if sorted(found) != list(range(len(kept))):
+        return None
+    return _PLACEHOLDER.sub(lambda m: kept[int(m.group(1))], text)
+
+
+def _units(block: str) -> List[Tuple[str, str]]:
+    """(text, separator) pairs of paragraphs, list items and heading lines"""
+    parts = _BOUNDARY.split(block)
+    units = []
+    for text, separator in zip(parts[::2], parts[1::2] + [""]):
+        marker = _MARKER.match(text).group(1)
+        if marker.strip().startswith("#") and "\n" in text:
+            heading, rest = text.split("\n", 1)
+            units.append((heading, "\n"))
+            text = rest
+        units.append((text, separator))
+    return units
+
+
+def split_segments(content: str, max_chars: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Split content into segments for independent translation.
+
+    Each segment is {"prefix", "text", "separator", "translate"}; joining
+    prefix + text + separator over all segments gives back the content.
+    Consecutive paragraphs, list items and headings are packed into one
+    segment up to `max_chars` (fewer LLM calls under the rate limit);
+    paragraphs longer than that are split between sentences. Code fences
+    are segments of their own and are never translated.
+    """
+    max_chars = max_chars or settings.translation_segment_max_chars
+    segments: List[Dict[str, Any]] = []
+    packable = False
+
+    for block_index, block in enumerate(_FENCE.split(content)):
+        if block_index % 2:
+            segments.append({"prefix": "", "text": block, "separator": "", "translate": False})
+            packable = False
+            continue
+
+        for text, separator in _units(block):
+            prefix = _MARKER.match(text).group(1)
+            body = text[len(prefix):]
+            stripped = body.rstrip()
+            if not stripped:
+                # Whitespace-only unit: keep it between segments, not inside one
+                if segments:
+                    segments[-1]["separator"] += text + separator
+                else:
+                    segments.append({"prefix": "", "text": text + separator, "separator": "", "translate": False})
+                continue
+            trailing = body[len(stripped):]
+
+            pieces = [stripped]
+            if len(stripped) > max_chars:
+                pieces = [""]
+                for sentence in _SENTENCE_END.split(stripped):
+                    if pieces[-1] and len(pieces[-1]) + len(sentence) + 1 > max_chars:
+                        pieces.append(sentence)
+                    else:
+                        pieces[-1] = f"{pieces[-1]} {sentence}" if pieces[-1] else sentence
+
+            for i, piece in enumerate(pieces):
+                segment = {
+                    "prefix": prefix if i == 0 else "",
+                    "text": piece,
+                    "separator": (trailing + separator) if i == len(pieces) - 1 else " ",
+                    "translate": bool(re.search(r"[^\W\d_]", _PROTECTED.sub("", piece)))
+                }
+                previous = segments[-1] if packable else None
+                if previous and len(previous["text"]) + len(previous["separator"]) + len(segment["prefix"]) + len(piece) <= max_chars:
+                    previous["text"] += previous["separator"] + segment["prefix"] + piece
+                    previous["separator"] = segment["separator"]
+                    previous["translate"] = previous["translate"] or segment["translate"]
+                else:
+                    segments.append(segment)
+                packable = True
+
+    return segments
+
+
+class TranslationService:
+    """Service for segmented, cached, concurrent translation (lazy initialization)"""
+
+    _instance = None
+    _cache = None
+    _cache_lock = None
+    _limiters: Dict[int, Any] = {}
+    _counters: Dict[str, int] = {}
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._cache = OrderedDict()
+            cls._instance._cache_lock = threading.Lock()
+            cls._instance._limiters = {}
+            cls._instance._counters = {"segments": 0, "cache_hits": 0, "translated": 0, "failed": 0}
+        return cls._instance
+
+    def _limiter(self):
+        """Process-wide LLM pacing for translations (one limiter per event loop)"""
+        from ..utils.rate_limit import AsyncRateLimiter
+
+        loop = asyncio.get_running_loop()
+        limiter = self._limiters.get(id(loop))
+        if limiter is None:
+            self._limiters = {id(loop): AsyncRateLimiter(
+                settings.groq_rate_limit_per_min, burst=settings.translation_concurrency
+            )}
+            limiter = self._limiters[id(loop)]
+        return limiter
+
+    @staticmethod
+    def _cache_key(masked: str, target_language: str) -> str:
+        return hashlib.blake2b(f"{target_language}\0{masked}".encode("utf-8"), digest_size=16).hexdigest()
+
+    def precheck(self, content: str, target_language: str) -> Optional[str]:
+        """Response to return instead of translating (refusal or demo notice), or None"""
+        from .llm import get_llm_service, REFUSAL_NO_TRANSLATION
+        from .usage import get_usage_tracker
+
+        if target_language.lower() not in ("pashto", "dari") or not content.strip():
+            return REFUSAL_NO_TRANSLATION
+        if not get_llm_service().is_available:
+            return f"[Demo Mode - Translation to {target_language} not available without Groq API key]"
+        plan = get_usage_tracker().plan()
+        if not plan.allows_llm:
+            logger.warning(f"Token budget at {plan.pressure:.0%} - translation not attempted")
+            return REFUSAL_NO_TRANSLATION
+        return None
+
+    async def _translate_segment(
+        self,
+        segment: Dict[str, Any],
+        target_language: str,
+        chapter: Optional[str],
+        semaphore: asyncio.Semaphore
+    ) -> Tuple[str, bool]:
+        """(translated segment text, served from cache); raises TranslationFailed"""
+        from .llm import get_llm_service, REFUSAL_NO_TRANSLATION
+
+        if not segment["translate"]:
+            return segment["text"], False
+
+        masked, kept = mask_terms(segment["text"])
+        key = self._cache_key(masked, target_language)
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+        if cached is not None:
+            restored = unmask_terms(cached, kept)
+            if restored is not None:
+                return restored, True
+
+        async with semaphore:
+            async with self._limiter():
+                translated = await asyncio.to_thread(
+                    get_llm_service().translate_content,
+                    content=masked,
+                    target_language=target_language,
+                    chapter=chapter
+                )
+
+        restored = None if translated == REFUSAL_NO_TRANSLATION else unmask_terms(translated.strip(), kept)
+        if restored is None:
+            raise TranslationFailed(f"segment not translated ({len(segment['text'])} chars)")
+
+        with self._cache_lock:
+            self._cache[key] = translated.strip()
+            while len(self._cache) > settings.translation_cache_size:
+                self._cache.popitem(last=False)
+        return restored, False
+
+    async def translate_stream(
+        self,
+        content: str,
+        target_language: str,
+        chapter: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Yield the translation piece by piece, in content order.
+
+        All segments start at once (bounded by settings.translation_concurrency
+        and the shared rate limiter); each is yielded as soon as it and every
+        segment before it are done. Raises TranslationFailed on the first
+        segment that fails, after cancelling the rest; call precheck() first.
+        """
+        segments = split_segments(content)
+        semaphore = asyncio.Semaphore(settings.translation_concurrency)
+        tasks = [
+            asyncio.ensure_future(self._translate_segment(segment, target_language.lower(), chapter, semaphore))
+            for segment in segments
+        ]
+        self._counters["segments"] += sum(segment["translate"] for segment in segments)
+
+        try:
+            for segment, task in zip(segments, tasks):
+                try:
+                    text, cached = await task
+                except TranslationFailed:
+                    self._counters["failed"] += 1
+                    raise
+                if segment["translate"]:
+                    self._counters["cache_hits" if cached else "translated"] += 1
+                yield segment["prefix"] + text + segment["separator"]
+        finally:
+            for task in tasks:
+                if task.done() and not task.cancelled():
+                    task.exception()  # Retrieved so later failures are not logged as unhandled
+                else:
+                    task.cancel()
+
+    async def translate(self, content: str, target_language: str, chapter: Optional[str] = None) -> str:
+        """Whole translation, or the refusal when any segment fails"""
+        from .llm import REFUSAL_NO_TRANSLATION
+
+        early = self.precheck(content, target_language)
+        if early is not None:
+            return early
+        try:
+            return "".join([piece async for piece in self.translate_stream(content, target_language, chapter)])
+        except TranslationFailed as e:
+            logger.error(f"Translation failed: {e}")
+            return REFUSAL_NO_TRANSLATION
+
+    def stats(self) -> Dict[str, Any]:
+        """Segment counters and per-segment cache occupancy"""
+        return {**self._counters, "cached_segments": len(self._cache)}
+
+
+def get_translation_service() -> TranslationService:
+    """Get or create translation service instance"""
+    return TranslationService()
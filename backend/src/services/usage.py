@@ -0,0 +1,185 @@
+"""
+Token Usage Service
+Per-request LLM token accounting with rolling budgets and degradation planning
+"""
+
+from typing import Any, Dict, Optional
+from collections import deque
+from contextvars import ContextVar
+import logging
+import threading
+import time
+
+from ..models.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Endpoint label for usage attribution, set by the routers (copied into worker threads)
+usage_endpoint_var: ContextVar[str] = ContextVar("usage_endpoint", default="offline")
+
+# Degradation modes, cheapest last
+MODE_FULL = "full"
+MODE_SHORT = "short"  # settings.degraded_max_tokens
+MODE_SMALL_MODEL = "small_model"  # settings.llm_small_model
+MODE_NO_LLM = "no_llm"  # precomputed/extractive answers only
+
+
+class BudgetPlan:
+    """How the next LLM call should run under the current token pressure"""
+
+    __slots__ = ("mode", "max_tokens", "model", "pressure")
+
+    def __init__(self, mode: str, max_tokens: int, model: Optional[str], pressure: float):
+        self.mode = mode
+        self.max_tokens = max_tokens
+        self.model = model
+        self.pressure = pressure
+
+    @property
+    def allows_llm(self) -> bool:
+        return self.mode != MODE_NO_LLM
+
+
+class TokenUsageTracker:
+    """
+    Rolling token totals for the last minute and the last 24 hours.
+
+    The minute window keeps individual calls; the day window keeps one
+    bucket per minute so memory stays bounded (<= 1440 buckets).
+    """
+
+    _instance = None
+    _lock = None
+    _minute = None
+    _day = None
+    _totals: Dict[str, Dict[str, Dict[str, int]]] = {}
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._lock = threading.Lock()
+            cls._instance._minute = deque()
+            cls._instance._day = deque()
+            cls._instance._totals = {"endpoint": {}, "chapter": {}, "model": {}}
+        return cls._instance
+
+    def _prune(self, now: float):
+        while self._minute and now - self._minute[0][0] >= 60:
+            self._minute.popleft()
+        current_bucket = int(now // 60)
+        while self._day and current_bucket - self._day[0][0] >= 1440:
+            self._day.popleft()
+
+    @staticmethod
+    def _chapter_label(chapter: Optional[str]) -> str:
+        """
+        Chapter totals key: an indexed chapter id, "none", or "other".
+
+        Chapters can come from client input (chapter filters, translation
+        sources), so unknown values share one label to keep the totals bounded.
+        """
+        if not chapter:
+            return "none"
+        from .anchors import get_anchor_service
+        return chapter if chapter in get_anchor_service().chapters() else "other"
+
+    def record(
+        self,
+        model: str,
+        prompt_tokens: int,
+        completion_tokens: int,
+        chapter: Optional[str] = None
+    ):
+        """Account one completion against the budgets and per-label totals"""
+        endpoint = usage_endpoint_var.get()
+        chapter = self._chapter_label(chapter)
+        tokens = prompt_tokens + completion_tokens
+        now = time.time()
+
+        with self._lock:
+            self._prune(now)
+            self._minute.append((now, tokens))
+            bucket = int(now // 60)
+            if self._day and self._day[-1][0] == bucket:
+                self._day[-1][1] += tokens
+            else:
+                self._day.append([bucket, tokens])
+
+            for kind, label in (("endpoint", endpoint), ("chapter", chapter), ("model", model)):
+                entry = self._totals[kind].setdefault(label, {"requests": 0, "prompt_tokens": 0, "completion_tokens": 0})
+                entry["requests"] += 1
+                entry["prompt_tokens"] += prompt_tokens
+                entry["completion_tokens"] += completion_tokens
+
+        logger.info(
+            "LLM usage",
+            extra={
+                "endpoint": endpoint,
+                "chapter": chapter,
+                "model": model,
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens
+            }
+        )
+
+    def window_tokens(self) -> Dict[str, int]:
+        """Tokens used in the last minute and the last 24 hours"""
+        with self._lock:
+            self._prune(time.time())
+            return {
+                "minute": sum(tokens for _, tokens in self._minute),
+                "day": sum(tokens for _, tokens in self._day)
+            }
+
+    def pressure(self) -> float:
+        """Highest used/limit ratio across the configured budgets (0 when unlimited)"""
+        used = self.window_tokens()
+        ratios = [0.0]
+        if settings.token_budget_per_minute:
+            ratios.append(used["minute"] / settings.token_budget_per_minute)
+        if settings.token_budget_per_day:
+            ratios.append(used["day"] / settings.token_budget_per_day)
+        return max(ratios)
+
+    def plan(self, max_tokens: Optional[int] = None) -> BudgetPlan:
+        """
+        Choose the cheapest acceptable mode for the next call.
+
+        Below token_budget_short_at everything runs as configured; then
+        max_tokens is capped, then the small model is used, and from
+        token_budget_no_llm_at on callers must answer without the LLM.
+        """
+        max_tokens = max_tokens or settings.groq_max_tokens
+        pressure = self.pressure()
+
+        if pressure >= settings.token_budget_no_llm_at:
+            return BudgetPlan(MODE_NO_LLM, 0, None, pressure)
+        if pressure >= settings.token_budget_small_model_at and settings.llm_small_model:
+            return BudgetPlan(
+                MODE_SMALL_MODEL,
+                min(max_tokens, settings.degraded_max_tokens),
+                settings.llm_small_model,
+                pressure
+            )
+        if pressure >= settings.token_budget_short_at:
+            return BudgetPlan(MODE_SHORT, min(max_tokens, settings.degraded_max_tokens), None, pressure)
+        return BudgetPlan(MODE_FULL, max_tokens, None, pressure)
+
+    def stats(self) -> Dict[str, Any]:
+        """Budget usage, current mode and per-endpoint/chapter/model totals"""
+        used = self.window_tokens()
+        with self._lock:
+            totals = {kind: {label: dict(entry) for label, entry in labels.items()} for kind, labels in self._totals.items()}
+        return {
+            "minute": {"used": used["minute"], "limit": settings.token_budget_per_minute},
+            "day": {"used": used["day"], "limit": settings.token_budget_per_day},
+            "mode": self.plan().mode,
+            "by_endpoint": totals["endpoint"],
+            "by_chapter": totals["chapter"],
+            "by_model": totals["model"]
+        }
+
+
+def get_usage_tracker() -> TokenUsageTracker:
+    """Get or create token usage tracker instance"""
+    return TokenUsageTracker()
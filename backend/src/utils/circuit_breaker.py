@@ -0,0 +1,177 @@
+"""
+Circuit Breaker Utility
+Per-dependency breakers that fail fast while a backend is erroring or slow
+"""
+
+from typing import Any, Callable, Dict, Optional
+from collections import deque
+import logging
+import threading
+import time
+
+from ..models.config import settings
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Call rejected without trying because the breaker is open"""
+
+    def __init__(self, name: str):
+        super().__init__(f"circuit '{name}' is open")
+        self.name = name
+
+
+class CircuitBreaker:
+    """
+    Rolling-window circuit breaker.
+
+    The last settings.breaker_window_size calls are scored; errors and calls
+    slower than `slow_call_seconds` count as failures. Once at least
+    settings.breaker_min_calls are recorded and the failure rate reaches
+    settings.breaker_failure_rate, the breaker opens and rejects calls for
+    settings.breaker_open_seconds. It then lets a single probe through
+    (half-open), calling `on_half_open` first so the owner can reconnect;
+    the probe's outcome closes or re-opens the breaker.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        slow_call_seconds: float,
+        on_half_open: Optional[Callable[[], None]] = None
+    ):
+        self.name = name
+        self.slow_call_seconds = slow_call_seconds
+        self.on_half_open = on_half_open
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._outcomes = deque(maxlen=settings.breaker_window_size)
+        self._latencies = deque(maxlen=1000)
+        self._counters = {"success": 0, "failure": 0, "slow": 0, "rejected": 0, "opened": 0}
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == OPEN and time.monotonic() - self._opened_at >= settings.breaker_open_seconds:
+                return HALF_OPEN
+            return self._state
+
+    def _open(self, reason: str):
+        self._state = OPEN
+        self._opened_at = time.monotonic()
+        self._probe_in_flight = False
+        self._counters["opened"] += 1
+        logger.warning(f"Circuit '{self.name}' opened ({reason})")
+
+    def acquire(self) -> bool:
+        """
+        Reserve permission for one call.
+
+        Returns True if the call is the half-open probe and raises
+        CircuitOpenError when the call must fail fast.
+        """
+        with self._lock:
+            if self._state == CLOSED:
+                return False
+
+            cooled_down = time.monotonic() - self._opened_at >= settings.breaker_open_seconds
+            if self._state == OPEN and cooled_down and not self._probe_in_flight:
+                self._state = HALF_OPEN
+                self._probe_in_flight = True
+                logger.info(f"Circuit '{self.name}' half-open - probing")
+                return True
+
+            self._counters["rejected"] += 1
+            raise CircuitOpenError(self.name)
+
+    def record(self, duration: float, error: Optional[BaseException] = None):
+        """Record the outcome of a permitted call"""
+        slow = duration >= self.slow_call_seconds
+        failed = error is not None or slow
+
+        with self._lock:
+            self._latencies.append(duration)
+            self._counters["failure" if error is not None else "success"] += 1
+            if slow:
+                self._counters["slow"] += 1
+
+            if self._state == HALF_OPEN:
+                if failed:
+                    self._open(f"probe {'slow' if error is None else 'failed'}")
+                else:
+                    self._state = CLOSED
+                    self._probe_in_flight = False
+                    self._outcomes.clear()
+                    logger.info(f"Circuit '{self.name}' closed")
+                return
+
+            self._outcomes.append(failed)
+            if self._state == CLOSED and len(self._outcomes) >= settings.breaker_min_calls:
+                rate = sum(self._outcomes) / len(self._outcomes)
+                if rate >= settings.breaker_failure_rate:
+                    self._open(f"failure rate {rate:.0%} over last {len(self._outcomes)} calls")
+
+    def call(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run func through the breaker (raises CircuitOpenError when open)"""
+        probe = self.acquire()
+        start = time.perf_counter()
+        try:
+            if probe and self.on_half_open:
+                self.on_half_open()
+            result = func(*args, **kwargs)
+        except Exception as e:
+            self.record(time.perf_counter() - start, e)
+            raise
+        self.record(time.perf_counter() - start)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """Breaker state, recent failure rate and latency"""
+        samples = sorted(self._latencies)
+        latency = {}
+        if samples:
+            for p in (50, 99):
+                latency[f"p{p}_ms"] = round(samples[min(len(samples) - 1, len(samples) * p // 100)] * 1000, 2)
+        outcomes = list(self._outcomes)
+        return {
+            "state": self.state,
+            "failure_rate": round(sum(outcomes) / len(outcomes), 3) if outcomes else 0.0,
+            "window": len(outcomes),
+            "slow_call_ms": round(self.slow_call_seconds * 1000),
+            "latency": latency,
+            **self._counters
+        }
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(
+    name: str,
+    slow_call_seconds: Optional[float] = None,
+    on_half_open: Optional[Callable[[], None]] = None
+) -> CircuitBreaker:
+    """Get or create the named breaker (arguments only apply on creation)"""
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                name,
+                slow_call_seconds if slow_call_seconds is not None else float("inf"),
+                on_half_open
+            )
+            _breakers[name] = breaker
+        return breaker
+
+
+def breaker_stats() -> Dict[str, Dict[str, Any]]:
+    """Stats for every breaker created so far"""
+    return {name: breaker.stats() for name, breaker in _breakers.items()}
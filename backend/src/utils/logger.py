@@ -1,41 +1,208 @@
 """
 Structured Logger Utility
-JSON-formatted logging with request_id support
+JSON-formatted, queue-backed logging with request_id support
 """
 
 import logging
+import logging.handlers
+import atexit
 import json
+import queue
+import random
 import sys
-from datetime import datetime
-from typing import Any, Dict
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
 import uuid
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+# Request ID for the current request; set by the API middleware and copied
+# into worker threads by asyncio.to_thread
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+# Attributes every LogRecord has; anything else was passed via `extra=`
+_RESERVED_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {
+    "message", "asctime", "request_id", "extra_fields", "color_message"
+}
+
+
+def _dumps(data: Dict[str, Any]) -> str:
+    """Serialize to JSON, using orjson when installed"""
+    if orjson is not None:
+        return orjson.dumps(data, default=str).decode("utf-8")
+    return json.dumps(data, default=str)
+
 
 class JSONFormatter(logging.Formatter):
     """Custom JSON formatter for structured logging"""
 
+    def __init__(self):
+        super().__init__()
+        self._cached_second = -1
+        self._cached_prefix = ""
+
+    def _timestamp(self, created: float) -> str:
+        """UTC ISO-8601 timestamp, reusing the formatted second across records"""
+        second = int(created)
+        if second != self._cached_second:
+            self._cached_second = second
+            self._cached_prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+        return f"{self._cached_prefix}.{int((created - second) * 1_000_000):06d}"
+
     def format(self, record: logging.LogRecord) -> str:
         """Format log record as JSON"""
         log_data: Dict[str, Any] = {
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": self._timestamp(record.created),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
         }
 
         # Add request_id if available
-        if hasattr(record, "request_id"):
-            log_data["request_id"] = record.request_id
+        request_id = getattr(record, "request_id", None)
+        if request_id:
+            log_data["request_id"] = request_id
 
         # Add exception info if present
-        if record.exc_info:
+        if record.exc_text:
+            log_data["exception"] = record.exc_text
+        elif record.exc_info:
             log_data["exception"] = self.formatException(record.exc_info)
 
         # Add extra fields
         if hasattr(record, "extra_fields"):
             log_data.update(record.extra_fields)
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRS:
+                log_data[key] = value
+
+        return _dumps(log_data)
+
+
+class RequestContextFilter(logging.Filter):
+    """Attach the current request_id (from contextvars) to each record"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, "request_id"):
+            record.request_id = request_id_var.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep only a fraction of records below WARNING for selected loggers.
+
+    `rates` maps logger name prefixes to keep-probabilities, e.g.
+    {"src.services.retrieval": 0.1}. The longest matching prefix wins.
+    Warnings and errors are never sampled.
+    """
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self._rates = sorted(rates.items(), key=lambda item: len(item[0]), reverse=True)
+        self._resolved: Dict[str, float] = {}
+
+    def _rate_for(self, name: str) -> float:
+        rate = self._resolved.get(name)
+        if rate is None:
+            rate = 1.0
+            for prefix, prefix_rate in self._rates:
+                if name == prefix or name.startswith(prefix + "."):
+                    rate = prefix_rate
+                    break
+            self._resolved[name] = rate
+        return rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self._rate_for(record.name)
+        return rate >= 1.0 or random.random() < rate
+
+
+class FastQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that defers formatting to the listener thread.
+
+    Only the message interpolation (and traceback, if any) happens on the
+    calling thread; JSON encoding and I/O happen in the QueueListener.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def parse_sample_rates(value: str) -> Dict[str, float]:
+    """Parse 'logger=rate,logger=rate' into a dict"""
+    rates = {}
+    for item in value.split(","):
+        if "=" in item:
+            name, rate = item.split("=", 1)
+            rates[name.strip()] = float(rate)
+    return rates
+
+
+def configure_logging(
+    level: str = "INFO",
+    sample_rates: Optional[Dict[str, float]] = None,
+    stream=None
+) -> logging.handlers.QueueListener:
+    """
+    Route all logging through a queue to a background JSON writer.
+
+    Args:
+        level: Root log level
+        sample_rates: Per-logger keep-probabilities for records below WARNING
+        stream: Output stream (defaults to stdout)
+
+    Returns:
+        The running QueueListener (stopped automatically at exit)
+    """
+    global _listener
+    shutdown_logging()
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(JSONFormatter())
+
+    queue_handler = FastQueueHandler(log_queue)
+    queue_handler.addFilter(RequestContextFilter())
+    if sample_rates:
+        queue_handler.addFilter(SamplingFilter(sample_rates))
+
+    root = logging.getLogger()
+    root.handlers = [queue_handler]
+    root.setLevel(getattr(logging, level.upper()))
+
+    _listener = logging.handlers.QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def shutdown_logging():
+    """Flush and stop the background log writer"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
 
-        return json.dumps(log_data)
+atexit.register(shutdown_logging)
 
 
 def setup_logger(name: str, level: str = "INFO") -> logging.Logger:
@@ -58,6 +225,7 @@ def setup_logger(name: str, level: str = "INFO") -> logging.Logger:
     # Create console handler with JSON formatter
     handler = logging.StreamHandler(sys.stdout)
     handler.setFormatter(JSONFormatter())
+    handler.addFilter(RequestContextFilter())
     logger.addHandler(handler)
 
     return logger
@@ -68,5 +236,5 @@ def generate_request_id() -> str:
     return str(uuid.uuid4())
 
 
-# Default application logger
-app_logger = setup_logger("textbook_api", "INFO")
+# Default application logger (routed through the root queue handler)
+app_logger = logging.getLogger("textbook_api")
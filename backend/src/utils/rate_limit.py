@@ -0,0 +1,42 @@
+"""
+Rate Limiting Utility
+Async token bucket for staying under provider requests-per-minute limits
+"""
+
+import asyncio
+import time
+
+
+class AsyncRateLimiter:
+    """
+    Token bucket limiter for asyncio tasks.
+
+    Allows `rate_per_minute` acquisitions per minute on average with bursts
+    of up to `burst` (defaults to 1, i.e. evenly spaced calls).
+    """
+
+    def __init__(self, rate_per_minute: float, burst: int = 1):
+        self._interval = 60.0 / rate_per_minute
+        self._capacity = float(burst)
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Wait until a call is allowed"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self._capacity, self._tokens + (now - self._updated) / self._interval)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) * self._interval)
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
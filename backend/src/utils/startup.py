@@ -0,0 +1,66 @@
+"""
+Startup Timeline
+Records when the API process reached each cold-start milestone
+"""
+
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class StartupTimeline:
+    """
+    Offsets (ms since this module was imported) of startup milestones and
+    durations of lazy initialization stages. Only the first occurrence of
+    each name is kept, so it is safe to call from hot paths.
+    """
+
+    def __init__(self):
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self._marks: Dict[str, float] = {}
+        self._stages: Dict[str, Dict[str, Any]] = {}
+
+    def _offset_ms(self, at: Optional[float] = None) -> float:
+        return round(((at or time.perf_counter()) - self._origin) * 1000, 1)
+
+    def mark(self, name: str):
+        """Record that a milestone was reached"""
+        with self._lock:
+            if name not in self._marks:
+                self._marks[name] = self._offset_ms()
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time an initialization stage (first run only)"""
+        if name in self._stages:
+            yield
+            return
+
+        start = time.perf_counter()
+        error = None
+        try:
+            yield
+        except Exception as e:
+            error = str(e)[:200]
+            raise
+        finally:
+            with self._lock:
+                if name not in self._stages:
+                    self._stages[name] = {
+                        "started_ms": self._offset_ms(start),
+                        "duration_ms": round((time.perf_counter() - start) * 1000, 1),
+                        **({"error": error} if error else {})
+                    }
+
+    def report(self) -> Dict[str, Any]:
+        """Milestones and stages recorded so far"""
+        with self._lock:
+            return {"marks": dict(self._marks), "stages": dict(self._stages)}
+
+
+startup_timeline = StartupTimeline()
@@ -0,0 +1,22 @@
+"""
+Shared test setup: import path and small breaker settings
+"""
+
+from pathlib import Path
+import sys
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.models.config import settings  # noqa: E402
+
+
+@pytest.fixture
+def breaker_settings(monkeypatch):
+    """Small window and short open period so breakers trip and recover quickly"""
+    monkeypatch.setattr(settings, "breaker_window_size", 10)
+    monkeypatch.setattr(settings, "breaker_min_calls", 5)
+    monkeypatch.setattr(settings, "breaker_failure_rate", 0.5)
+    monkeypatch.setattr(settings, "breaker_open_seconds", 0.05)
+    return settings
@@ -0,0 +1,145 @@
+"""
+Circuit breaker tests driven by the benchmark FaultInjector
+"""
+
+import time
+
+import pytest
+
+from benchmarks.stubs import FaultInjector
+from src.utils.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+
+
+class Backend:
+    """Stand-in dependency that counts the calls reaching it"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def query(self):
+        self.calls += 1
+        return "ok"
+
+
+def call_many(breaker: CircuitBreaker, func, times: int):
+    """Call through the breaker, swallowing injected and fail-fast errors"""
+    for _ in range(times):
+        try:
+            breaker.call(func)
+        except (ConnectionError, CircuitOpenError):
+            pass
+
+
+@pytest.fixture
+def backend():
+    return Backend()
+
+
+@pytest.fixture
+def faulty(backend):
+    return FaultInjector(backend, {"query"})
+
+
+def test_opens_on_error_rate(breaker_settings, faulty):
+    breaker = CircuitBreaker("test", slow_call_seconds=1.0)
+    faulty.error_rate = 1.0
+
+    call_many(breaker, faulty.query, breaker_settings.breaker_min_calls)
+
+    assert breaker.state == OPEN
+    assert breaker.stats()["failure"] == breaker_settings.breaker_min_calls
+
+
+def test_stays_closed_below_min_calls(breaker_settings, faulty):
+    breaker = CircuitBreaker("test", slow_call_seconds=1.0)
+    faulty.error_rate = 1.0
+
+    call_many(breaker, faulty.query, breaker_settings.breaker_min_calls - 1)
+
+    assert breaker.state == CLOSED
+
+
+def test_opens_on_slow_calls(breaker_settings, faulty):
+    breaker = CircuitBreaker("test", slow_call_seconds=0.005)
+    faulty.latency_ms = 10.0
+
+    call_many(breaker, faulty.query, breaker_settings.breaker_min_calls)
+
+    stats = breaker.stats()
+    assert breaker.state == OPEN
+    assert stats["failure"] == 0
+    assert stats["slow"] == breaker_settings.breaker_min_calls
+
+
+def test_fails_fast_while_open(breaker_settings, backend, faulty):
+    breaker = CircuitBreaker("test", slow_call_seconds=1.0)
+    faulty.error_rate, faulty.latency_ms = 1.0, 20.0
+    call_many(breaker, faulty.query, breaker_settings.breaker_min_calls)
+    assert breaker.state == OPEN
+
+    start = time.perf_counter()
+    with pytest.raises(CircuitOpenError):
+        breaker.call(faulty.query)
+
+    assert time.perf_counter() - start < faulty.latency_ms / 1000
+    assert breaker.stats()["rejected"] == 1
+
+
+def test_half_open_probe_closes_on_success(breaker_settings, backend, faulty):
+    breaker = CircuitBreaker("test", slow_call_seconds=1.0)
+    faulty.error_rate = 1.0
+    call_many(breaker, faulty.query, breaker_settings.breaker_min_calls)
+
+    faulty.error_rate = 0.0
+    time.sleep(breaker_settings.breaker_open_seconds)
+    assert breaker.state == HALF_OPEN
+
+    calls = backend.calls
+    assert breaker.call(faulty.query) == "ok"
+    assert backend.calls == calls + 1
+    assert breaker.state == CLOSED
+
+
+def test_half_open_allows_a_single_probe(breaker_settings, faulty):
+    breaker = CircuitBreaker("test", slow_call_seconds=1.0)
+    faulty.error_rate = 1.0
+    call_many(breaker, faulty.query, breaker_settings.breaker_min_calls)
+    time.sleep(breaker_settings.breaker_open_seconds)
+
+    assert breaker.acquire() is True
+    with pytest.raises(CircuitOpenError):
+        breaker.acquire()
+
+
+def test_half_open_probe_reopens_on_failure(breaker_settings, faulty):
+    breaker = CircuitBreaker("test", slow_call_seconds=1.0)
+    faulty.error_rate = 1.0
+    call_many(breaker, faulty.query, breaker_settings.breaker_min_calls)
+    time.sleep(breaker_settings.breaker_open_seconds)
+
+    with pytest.raises(ConnectionError):
+        breaker.call(faulty.query)
+
+    stats = breaker.stats()
+    assert breaker.state == OPEN
+    assert stats["opened"] == 2
+    with pytest.raises(CircuitOpenError):
+        breaker.call(faulty.query)
+
+
+def test_on_half_open_reconnects_before_the_probe(breaker_settings, backend):
+    connections = [FaultInjector(backend, {"query"}, error_rate=1.0)]
+
+    def reconnect():
+        connections.append(FaultInjector(backend, {"query"}))
+
+    breaker = CircuitBreaker("test", slow_call_seconds=1.0, on_half_open=reconnect)
+    call_many(breaker, lambda: connections[-1].query(), breaker_settings.breaker_min_calls)
+    assert breaker.state == OPEN
+    assert len(connections) == 1
+
+    time.sleep(breaker_settings.breaker_open_seconds)
+    assert breaker.call(lambda: connections[-1].query()) == "ok"
+
+    assert len(connections) == 2
+    assert breaker.state == CLOSED
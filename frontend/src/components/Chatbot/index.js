@@ -16,6 +16,33 @@ const LANGUAGES = [
   { code: 'dari', label: 'Dari' }
 ];
 
+// Locate a selection by chapter (doc id), nearest heading anchor above it and
+// character offsets in that section's whitespace-collapsed text, so the
+// backend can resolve its chunk without a vector search
+function locateSelection(selection, docContent) {
+  const chapter = window.location.pathname.match(/chapter-\d+/)?.[0];
+  if (!chapter || !selection.rangeCount) return null;
+
+  const range = selection.getRangeAt(0);
+  let heading = null;
+  for (const h of docContent.querySelectorAll('h2[id], h3[id]')) {
+    if (range.comparePoint(h, 0) >= 0) break;
+    heading = h;
+  }
+
+  const before = document.createRange();
+  if (heading) {
+    before.setStartAfter(heading);
+  } else {
+    before.setStart(docContent, 0);
+  }
+  before.setEnd(range.startContainer, range.startOffset);
+
+  const start = before.toString().replace(/\s+/g, ' ').trimStart().length;
+  const length = selection.toString().replace(/\s+/g, ' ').trim().length;
+  return { chapter, anchor: heading ? heading.id : '', start, end: start + length };
+}
+
 export default function Chatbot() {
   const [isOpen, setIsOpen] = useState(false);
   const [messages, setMessages] = useState([
@@ -28,7 +55,9 @@ export default function Chatbot() {
   const [input, setInput] = useState('');
   const [isLoading, setIsLoading] = useState(false);
   const [selectedText, setSelectedText] = useState('');
+  const [selectionAnchor, setSelectionAnchor] = useState(null);
   const [targetLanguage, setTargetLanguage] = useState('en');
+  const [sessionId, setSessionId] = useState(null);
   const messagesEndRef = useRef(null);
   const inputRef = useRef(null);
 
@@ -59,6 +88,7 @@ export default function Chatbot() {
 
         if (isInDocContent) {
           setSelectedText(text);
+          setSelectionAnchor(locateSelection(selection, isInDocContent));
         }
       }
     };
@@ -73,9 +103,11 @@ export default function Chatbot() {
 
     const userMessage = input.trim();
     const currentSelectedText = selectedText;
+    const currentSelectionAnchor = selectionAnchor;
 
     setInput('');
     setSelectedText(''); // Clear selection after use
+    setSelectionAnchor(null);
 
     // Add user message with context indicator
     setMessages(prev => [...prev, {
@@ -92,13 +124,16 @@ export default function Chatbot() {
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify({
           query: userMessage,
-          selected_text: currentSelectedText || undefined
+          selected_text: currentSelectedText || undefined,
+          selection_anchor: (currentSelectedText && currentSelectionAnchor) || undefined,
+          session_id: sessionId || undefined
         }),
       });
 
       if (!response.ok) throw new Error('Failed to get response');
 
       const data = await response.json();
+      if (data.session_id) setSessionId(data.session_id);
 
       setMessages(prev => [...prev, {
         role: 'assistant',
@@ -128,7 +163,7 @@ export default function Chatbot() {
     setIsLoading(true);
 
     try {
-      const response = await fetch(`${API_URL}/translate`, {
+      const response = await fetch(`${API_URL}/translate/stream`, {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify({
@@ -137,26 +172,49 @@ export default function Chatbot() {
         }),
       });
 
-      if (!response.ok) throw new Error('Translation failed');
-
-      const data = await response.json();
-
-      if (data.translated === REFUSAL_NO_TRANSLATION) {
-        // Translation refused per policy
-        return;
+      if (!response.ok || !response.body) throw new Error('Translation failed');
+
+      const setContent = (content, isTranslated) => {
+        setMessages(prev => prev.map((msg, idx) =>
+          idx === messageIndex
+            ? {
+                ...msg,
+                content,
+                isTranslated,
+                translatedLanguage: isTranslated ? targetLanguage : msg.translatedLanguage
+              }
+            : msg
+        ));
+      };
+
+      // NDJSON events: segments arrive in order, then "done" or "refused"
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = '';
+      let translated = '';
+
+      while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+
+        const lines = buffer.split('\n');
+        buffer = lines.pop();
+        for (const line of lines) {
+          if (!line.trim()) continue;
+          const event = JSON.parse(line);
+
+          if (event.type === 'refused' || event.translated === REFUSAL_NO_TRANSLATION) {
+            // Translation refused per policy - keep the original
+            setContent(message.originalContent, false);
+            return;
+          }
+          if (event.type === 'segment') {
+            translated += event.text;
+            setContent(translated, true);
+          }
+        }
       }
-
-      // Update the message with translation
-      setMessages(prev => prev.map((msg, idx) =>
-        idx === messageIndex
-          ? {
-              ...msg,
-              content: data.translated,
-              isTranslated: true,
-              translatedLanguage: targetLanguage
-            }
-          : msg
-      ));
     } catch (error) {
       console.error('Translation error:', error);
     } finally {
@@ -185,6 +243,7 @@ export default function Chatbot() {
 
   const clearSelection = () => {
     setSelectedText('');
+    setSelectionAnchor(null);
     window.getSelection()?.removeAllRanges();
   };
 